@@ -46,6 +46,61 @@ def get_bnum(opts, minions, quiet):
                       'form of %10, 10% or 3'.format(opts['batch']))
 
 
+class AdaptiveBatchSize(object):
+    '''
+    Adjust the number of minions running a batch job while it runs, based on
+    how long the minions take to complete the job and whether they succeed.
+
+    The batch size is increased by one for each batch of minions which
+    complete the job successfully without slowing down, and halved when a
+    minion fails or times out, or when the minions take ``latency_factor``
+    times longer to complete the job than the fastest minions did. The batch
+    size is halved at most once per batch of completed minions, so that the
+    minions which were already running when the batch size was halved don't
+    halve it again.
+    '''
+    def __init__(self, size, maximum, minimum=1, latency_factor=2.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = float(min(max(size, self.minimum), self.maximum))
+        self.latency_factor = latency_factor
+        # The moving average of the job durations, and the lowest it has been
+        self.latency = None
+        self.baseline = None
+        self._completed = self.size
+
+    @property
+    def batch_size(self):
+        '''
+        The number of minions which should currently be running the job
+        '''
+        return int(self.size)
+
+    def update(self, duration, success):
+        '''
+        Update the batch size when a minion completes the job, and return the
+        new batch size
+        '''
+        if self.latency is None:
+            self.latency = self.baseline = duration
+        else:
+            self.latency = 0.8 * self.latency + 0.2 * duration
+            self.baseline = min(self.baseline, self.latency)
+        slow = self.latency > self.latency_factor * self.baseline
+        self._completed += 1
+        if not success or slow:
+            if self._completed >= self.size:
+                self.size = max(self.minimum, self.size / 2)
+                self._completed = 0
+                log.debug(
+                    'Decreased the batch size to %s (success: %s, latency: '
+                    '%.2fs)', self.batch_size, success, self.latency
+                )
+        else:
+            self.size = min(self.maximum, self.size + 1.0 / self.size)
+        return self.batch_size
+
+
 def batch_get_opts(
         tgt,
         fun,
@@ -78,6 +133,10 @@ def batch_get_opts(
         opts['gather_job_timeout'] = kwargs['gather_job_timeout']
     if 'batch_wait' in kwargs:
         opts['batch_wait'] = int(kwargs['batch_wait'])
+    if 'batch_adaptive' in kwargs:
+        opts['batch_adaptive'] = kwargs['batch_adaptive']
+    if 'batch_max' in kwargs:
+        opts['batch_max'] = int(kwargs['batch_max'])
 
     for key, val in six.iteritems(parent_opts):
         if key not in opts:
@@ -111,6 +170,8 @@ class Batch(object):
         self.local = salt.client.get_local_client(opts['conf_file'])
         self.minions, self.ping_gen, self.down_minions = self.__gather_minions()
         self.options = parser
+        # Metrics of the waves of minions started together during the run
+        self.waves = []
 
     def __gather_minions(self):
         '''
@@ -163,6 +224,26 @@ class Batch(object):
         if i:
             del wait[:i]
 
+    def __wave_done(self, wave, bnum, verbose):
+        '''
+        Record the metrics of a wave of minions which have all completed the
+        job
+        '''
+        durations = wave['durations']
+        metrics = {'wave': wave['wave'],
+                   'minions': len(durations),
+                   'failed': wave['failed'],
+                   'batch_size': bnum,
+                   'duration_mean': sum(durations) / len(durations),
+                   'duration_max': max(durations)}
+        self.waves.append(metrics)
+        msg = ('Wave {wave} done: {minions} minions, {failed} failed, '
+               '{duration_mean:.2f}s mean, {duration_max:.2f}s max, batch '
+               'size {batch_size}').format(**metrics)
+        log.info(msg)
+        if verbose and not self.quiet:
+            salt.utils.stringutils.print_cli(msg)
+
     def run(self):
         '''
         Execute the batch run
@@ -177,6 +258,10 @@ class Batch(object):
         # No targets to run
         if not self.minions:
             return
+        adaptive = None
+        if bnum and self.opts.get('batch_adaptive'):
+            adaptive = AdaptiveBatchSize(
+                bnum, self.opts.get('batch_max') or len(self.minions))
         to_run = copy.deepcopy(self.minions)
         active = []
         ret = {}
@@ -199,6 +284,10 @@ class Batch(object):
         # - unresponsive minions are removed from active[] to make
         #   sure that the main while loop finishes even with unresp minions
         minion_tracker = {}
+        # the wave each running minion was started in
+        minion_wave = {}
+        # the minions which did not return before the job timed out
+        timed_out = set()
 
         if not self.quiet:
             # We already know some minions didn't respond to the ping, so inform
@@ -209,6 +298,8 @@ class Batch(object):
         # Iterate while we still have things to execute
         while len(ret) < len(self.minions):
             next_ = []
+            if adaptive is not None:
+                bnum = adaptive.batch_size
             if bwait and wait:
                 self.__update_wait(wait)
             if len(to_run) <= bnum - len(wait) and not active:
@@ -245,6 +336,13 @@ class Batch(object):
                 # every iterator added is 'active' and has its set of minions
                 minion_tracker[new_iter]['minions'] = next_
                 minion_tracker[new_iter]['active'] = True
+                wave = {'wave': len(minion_tracker),
+                        'start': time.time(),
+                        'pending': set(next_),
+                        'durations': [],
+                        'failed': 0}
+                for minion in next_:
+                    minion_wave[minion] = wave
 
             else:
                 time.sleep(0.02)
@@ -299,6 +397,7 @@ class Batch(object):
                             if minion not in parts:
                                 parts[minion] = {}
                                 parts[minion]['ret'] = {}
+                                timed_out.add(minion)
 
             for minion, data in six.iteritems(parts):
                 if minion in active:
@@ -312,6 +411,20 @@ class Batch(object):
                     if self.opts.get('failhard') and data['ret']['retcode'] > 0:
                         failhard = True
 
+                wave = minion_wave.pop(minion, None)
+                if wave is not None:
+                    duration = time.time() - wave['start']
+                    retcode = data.get('retcode', data.get('data', {}).get('retcode', 0))
+                    success = minion not in timed_out and not retcode
+                    wave['durations'].append(duration)
+                    wave['pending'].discard(minion)
+                    if not success:
+                        wave['failed'] += 1
+                    if adaptive is not None:
+                        bnum = adaptive.update(duration, success)
+                    if not wave['pending']:
+                        self.__wave_done(wave, bnum, show_verbose)
+
                 if self.opts.get('raw'):
                     ret[minion] = data
                     yield data
@@ -5,6 +5,7 @@ Execute a job on the targeted minions by using a moving window of fixed size `ba
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import time
 import tornado
 
 # Import salt libs
@@ -16,7 +17,7 @@ import fnmatch
 
 log = logging.getLogger(__name__)
 
-from salt.cli.batch import get_bnum, batch_get_opts, batch_get_eauth
+from salt.cli.batch import get_bnum, batch_get_opts, batch_get_eauth, AdaptiveBatchSize
 
 
 class BatchAsync(object):
@@ -28,6 +29,9 @@ class BatchAsync(object):
 
     The control parameters are:
         - batch: number/percentage of concurrent running minions
+        - batch_adaptive: adjust the batch size based on how long the minions
+          take to complete the job and whether they succeed
+        - batch_max: maximum batch size when batch_adaptive is set
         - batch_delay: minimum wait time between batches
         - batch_presence_ping_timeout: time to wait for presence pings before starting the batch
         - gather_job_timeout: `find_job` timeout
@@ -58,6 +62,11 @@ class BatchAsync(object):
             clear_load['gather_job_timeout'] = self.local.opts['gather_job_timeout']
         self.batch_presence_ping_timeout = clear_load['kwargs'].get('batch_presence_ping_timeout', None)
         self.batch_delay = clear_load['kwargs'].get('batch_delay', 1)
+        self.batch_adaptive = clear_load['kwargs'].get('batch_adaptive', False)
+        self.batch_max = clear_load['kwargs'].get('batch_max', 0)
+        self.adaptive = None
+        # The time each running minion was started
+        self.started = {}
         self.opts = batch_get_opts(
             clear_load.pop('tgt'),
             clear_load.pop('fun'),
@@ -117,12 +126,18 @@ class BatchAsync(object):
                     if minion in self.active:
                         self.active.remove(minion)
                         self.done_minions.add(minion)
+                        self._update_batch_size(minion, not data.get('retcode'))
                         # call later so that we maybe gather more returns
                         self.event.io_loop.call_later(self.batch_delay, self.schedule_next)
 
         if self.initialized and self.done_minions == self.minions.difference(self.timedout_minions):
             self.end_batch()
 
+    def _update_batch_size(self, minion, success):
+        started = self.started.pop(minion, None)
+        if self.adaptive is not None and started is not None:
+            self.batch_size = self.adaptive.update(time.time() - started, success)
+
     def _get_next(self):
         to_run = self.minions.difference(
             self.done_minions).difference(
@@ -130,7 +145,7 @@ class BatchAsync(object):
             self.timedout_minions)
         next_batch_size = min(
             len(to_run),                   # partial batch (all left)
-            self.batch_size - len(self.active)  # full batch or available slots
+            max(0, self.batch_size - len(self.active))  # full batch or available slots
         )
         return set(list(to_run)[:next_batch_size])
 
@@ -144,6 +159,7 @@ class BatchAsync(object):
                 if minion in self.active:
                     self.active.remove(minion)
                 self.timedout_minions.add(minion)
+                self._update_batch_size(minion, False)
         running = minions.difference(did_not_return).difference(self.done_minions).difference(self.timedout_minions)
         if running:
             self.event.io_loop.add_callback(self.find_job, running)
@@ -189,6 +205,10 @@ class BatchAsync(object):
     def start_batch(self):
         if not self.initialized:
             self.batch_size = get_bnum(self.opts, self.minions, True)
+            if self.batch_adaptive:
+                self.adaptive = AdaptiveBatchSize(
+                    self.batch_size, self.batch_max or len(self.minions))
+                self.batch_size = self.adaptive.batch_size
             self.initialized = True
             data = {
                 "available_minions": self.minions,
@@ -213,6 +233,9 @@ class BatchAsync(object):
     def schedule_next(self):
         next_batch = self._get_next()
         if next_batch:
+            started = time.time()
+            for minion in next_batch:
+                self.started[minion] = started
             yield self.local.run_job_async(
                 next_batch,
                 self.opts['fun'],
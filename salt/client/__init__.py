@@ -552,6 +552,10 @@ class LocalClient(object):
             opts['gather_job_timeout'] = kwargs['gather_job_timeout']
         if 'batch_wait' in kwargs:
             opts['batch_wait'] = int(kwargs['batch_wait'])
+        if 'batch_adaptive' in kwargs:
+            opts['batch_adaptive'] = kwargs['batch_adaptive']
+        if 'batch_max' in kwargs:
+            opts['batch_max'] = int(kwargs['batch_max'])
 
         eauth = {}
         if 'eauth' in kwargs:
@@ -1116,6 +1120,16 @@ class LocalClient(object):
         open_jids = set()
         timeout_at = time.time() + timeout
         gather_syndic_wait = time.time() + self.opts['syndic_wait']
+        # whether the minions expected from the syndics are already known
+        syndic_minions_known = False
+        if self.opts['order_masters'] and self.opts.get('syndic_summary_interval'):
+            syndic_minions = salt.utils.minions.CkMinions(self.opts).check_syndic_minions(tgt, tgt_type)
+            if syndic_minions is not None:
+                # The syndics have sent the IDs of their minions, so there is
+                # no need to wait for them to send the expected minions
+                minions.update(syndic_minions)
+                syndic_minions_known = True
+                gather_syndic_wait = 0
         # are there still minions running the job out there
         # start as True so that we ping at least once
         minions_running = True
@@ -1159,7 +1173,8 @@ class LocalClient(object):
                 log.debug('jid %s found all minions %s', jid, found)
                 break
             elif len(found.intersection(minions)) >= len(minions) and self.opts['order_masters']:
-                if len(found) >= len(minions) and len(minions) > 0 and time.time() > gather_syndic_wait:
+                if len(found) >= len(minions) and (len(minions) > 0 or syndic_minions_known) \
+                        and time.time() > gather_syndic_wait:
                     # There were some minions to find and we found them
                     # However, this does not imply that *all* masters have yet responded with expected minion lists.
                     # Therefore, continue to wait up to the syndic_wait period (calculated in gather_syndic_wait) to see
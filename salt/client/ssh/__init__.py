@@ -53,6 +53,11 @@ import salt.roster
 from salt.template import compile_template
 
 # Import 3rd-party libs
+import concurrent.futures
+import tornado.gen
+import tornado.ioloop
+import tornado.process
+import tornado.queues
 from salt.ext import six
 from salt.ext.six.moves import input  # pylint: disable=import-error,redefined-builtin
 try:
@@ -325,6 +330,10 @@ class SSH(object):
                                              python2_bin=self.opts['python2_bin'],
                                              python3_bin=self.opts['python3_bin'],
                                              extended_cfg=self.opts.get('ssh_ext_alternatives'))
+        if self.opts.get('ssh_thin_layers'):
+            self.thin_layers = salt.utils.thin.thin_layers(self.thin)
+        else:
+            self.thin_layers = None
         self.mods = mod_data(self.fsclient)
 
     def _get_roster(self):
@@ -477,6 +486,7 @@ class SSH(object):
                 mods=self.mods,
                 fsclient=self.fsclient,
                 thin=self.thin,
+                thin_layers=self.thin_layers,
                 **target)
         if salt.utils.path.which('ssh-copy-id'):
             # we have ssh-copy-id, use it!
@@ -492,6 +502,7 @@ class SSH(object):
                     mods=self.mods,
                     fsclient=self.fsclient,
                     thin=self.thin,
+                    thin_layers=self.thin_layers,
                     **target)
             stdout, stderr, retcode = single.cmd_block()
             try:
@@ -517,11 +528,18 @@ class SSH(object):
                 mods=self.mods,
                 fsclient=self.fsclient,
                 thin=self.thin,
+                thin_layers=self.thin_layers,
                 mine=mine,
                 **target)
-        ret = {'id': single.id}
         stdout, stderr, retcode = single.run()
         # This job is done, yield
+        que.put(self._format_ret(single.id, stdout, stderr, retcode))
+
+    def _format_ret(self, id_, stdout, stderr, retcode):
+        '''
+        Return the dict put on the queue for a finished routine
+        '''
+        ret = {'id': id_}
         try:
             data = salt.utils.json.find_json(stdout)
             if len(data) < 2 and 'local' in data:
@@ -538,13 +556,130 @@ class SSH(object):
                 'stderr': stderr,
                 'retcode': retcode,
             }
-        que.put(ret)
+        return ret
+
+    def _prepare_target(self, host):
+        '''
+        Apply the defaults to the target data for a host. Returns the return
+        for the host if it cannot be contacted, otherwise None.
+        '''
+        for default in self.defaults:
+            if default not in self.targets[host]:
+                self.targets[host][default] = self.defaults[default]
+        if 'host' not in self.targets[host]:
+            self.targets[host]['host'] = host
+        if self.targets[host].get('winrm') and not HAS_WINSHELL:
+            log_msg = 'Please contact sales@saltstack.com for access to the enterprise saltwinshell module.'
+            log.debug(log_msg)
+            return {'fun_args': [],
+                    'jid': None,
+                    'return': log_msg,
+                    'retcode': 1,
+                    'fun': '',
+                    'id': host}
+        return None
+
+    @tornado.gen.coroutine
+    def handle_routine_async(self, executor, host, target, mine=False):
+        '''
+        Run the routine on the current IOLoop, falling back to running it in
+        the passed process pool if it cannot be run asynchronously. Returns
+        the same dict handle_routine puts on the queue.
+        '''
+        try:
+            opts = copy.deepcopy(self.opts)
+            single = Single(
+                    opts,
+                    opts['argv'],
+                    host,
+                    mods=self.mods,
+                    fsclient=self.fsclient,
+                    thin=self.thin,
+                    thin_layers=self.thin_layers,
+                    mine=mine,
+                    **target)
+            if single.can_run_async():
+                stdout, stderr, retcode = yield single.run_async()
+            else:
+                stdout, stderr, retcode = yield executor.submit(
+                    _run_single,
+                    opts,
+                    host,
+                    target,
+                    self.mods,
+                    self.thin,
+                    self.thin_layers,
+                    mine)
+        except Exception as exc:
+            error = ('Target \'{0}\' did not return any data, '
+                     'probably due to an error.').format(host)
+            log.error(error, exc_info_on_loglevel=logging.DEBUG)
+            raise tornado.gen.Return({'id': host, 'ret': error})
+        raise tornado.gen.Return(
+            self._format_ret(single.id, stdout, stderr, retcode)
+        )
+
+    def handle_ssh_async(self, mine=False):
+        '''
+        Execute the routines for all targets from this process, multiplexing
+        up to ``ssh_max_sessions`` ssh sessions on an IOLoop rather than
+        starting a process for each target. Routines which cannot be run
+        asynchronously, such as wrapper functions compiling states, are run in
+        a pool of ``ssh_max_procs`` processes.
+        '''
+        if not self.targets:
+            log.error('No matching targets found in roster.')
+            return
+        io_loop = tornado.ioloop.IOLoop(make_current=False)
+        que = tornado.queues.Queue()
+        executor = concurrent.futures.ProcessPoolExecutor(
+            self.opts.get('ssh_max_procs', 25)
+        )
+        target_iter = iter(list(self.targets))
+        sessions = max(1, min(self.opts.get('ssh_max_sessions', 250),
+                              len(self.targets)))
+
+        @tornado.gen.coroutine
+        def _session():
+            # The sessions share the target iterator, so that a new routine is
+            # started as soon as one finishes
+            try:
+                for host in target_iter:
+                    no_ret = self._prepare_target(host)
+                    if no_ret is not None:
+                        yield que.put({'id': host, 'ret': no_ret})
+                        continue
+                    ret = yield self.handle_routine_async(
+                        executor, host, self.targets[host], mine)
+                    yield que.put(ret)
+            finally:
+                yield que.put(None)
+
+        for _ in range(sessions):
+            io_loop.add_callback(_session)
+        try:
+            running = sessions
+            while running:
+                ret = io_loop.run_sync(que.get)
+                if ret is None:
+                    running -= 1
+                    continue
+                yield {ret['id']: ret['ret']}
+        finally:
+            executor.shutdown(wait=False)
+            # Remove the SIGCHLD handler installed for the ssh processes
+            tornado.process.Subprocess.uninitialize()
+            io_loop.close(all_fds=True)
 
     def handle_ssh(self, mine=False):
         '''
         Spin up the needed threads or processes and execute the subsequent
         routines
         '''
+        if self.opts.get('ssh_async', False):
+            for ret in self.handle_ssh_async(mine=mine):
+                yield ret
+            return
         que = multiprocessing.Queue()
         running = {}
         target_iter = self.targets.__iter__()
@@ -561,22 +696,10 @@ class SSH(object):
                 except StopIteration:
                     init = True
                     continue
-                for default in self.defaults:
-                    if default not in self.targets[host]:
-                        self.targets[host][default] = self.defaults[default]
-                if 'host' not in self.targets[host]:
-                    self.targets[host]['host'] = host
-                if self.targets[host].get('winrm') and not HAS_WINSHELL:
+                no_ret = self._prepare_target(host)
+                if no_ret is not None:
                     returned.add(host)
                     rets.add(host)
-                    log_msg = 'Please contact sales@saltstack.com for access to the enterprise saltwinshell module.'
-                    log.debug(log_msg)
-                    no_ret = {'fun_args': [],
-                              'jid': None,
-                              'return': log_msg,
-                              'retcode': 1,
-                              'fun': '',
-                              'id': host}
                     yield {host: no_ret}
                     continue
                 args = (
@@ -812,6 +935,31 @@ class SSH(object):
             sys.exit(salt.defaults.exitcodes.EX_AGGREGATE)
 
 
+# The file client of a process of the pool used by SSH.handle_ssh_async
+_POOL_FSCLIENT = None
+
+
+def _run_single(opts, host, target, mods, thin, thin_layers, mine):
+    '''
+    Run the routine for a target in a process of the pool used by
+    SSH.handle_ssh_async. Returns tuple of (stdout, stderr, retcode)
+    '''
+    global _POOL_FSCLIENT  # pylint: disable=global-statement
+    if _POOL_FSCLIENT is None:
+        _POOL_FSCLIENT = salt.fileclient.FSClient(opts)
+    single = Single(
+            opts,
+            opts['argv'],
+            host,
+            mods=mods,
+            fsclient=_POOL_FSCLIENT,
+            thin=thin,
+            thin_layers=thin_layers,
+            mine=mine,
+            **target)
+    return single.run()
+
+
 class Single(object):
     '''
     Hold onto a single ssh execution
@@ -844,6 +992,7 @@ class Single(object):
             remote_port_forwards=None,
             winrm=False,
             ssh_options=None,
+            thin_layers=None,
             **kwargs):
         # Get mine setting and mine_functions if defined in kwargs (from roster)
         self.mine = mine
@@ -928,6 +1077,9 @@ class Single(object):
             arch, _, _ = self.shell.exec_cmd('powershell $ENV:PROCESSOR_ARCHITECTURE')
             self.arch = arch.strip()
         self.thin = thin if thin else salt.utils.thin.thin_path(opts['cachedir'])
+        # The (digest, path) tuples of the layers of salt-thin, if the thin is
+        # deployed in layers
+        self.thin_layers = thin_layers or []
 
     def __arg_comps(self):
         '''
@@ -976,6 +1128,87 @@ class Single(object):
             )
         return True
 
+    def _layer_paths(self, digests):
+        '''
+        Return the paths to the thin layers with the passed digests
+        '''
+        paths = dict(self.thin_layers)
+        return [paths[digest] for digest in digests if digest in paths]
+
+    def deploy_layers(self, digests):
+        '''
+        Deploy the layers of salt-thin with the passed digests, which are the
+        layers the target does not have yet
+        '''
+        paths = self._layer_paths(digests)
+        if paths:
+            self.shell.send(' '.join(paths), self.thin_dir + '/')
+        return True
+
+    @tornado.gen.coroutine
+    def deploy_async(self):
+        '''
+        Deploy salt-thin on the current IOLoop
+        '''
+        yield self.shell.send_async(
+            self.thin,
+            os.path.join(self.thin_dir, 'salt-thin.tgz'),
+        )
+        yield self.deploy_ext_async()
+        raise tornado.gen.Return(True)
+
+    @tornado.gen.coroutine
+    def deploy_ext_async(self):
+        '''
+        Deploy the ext_mods tarball on the current IOLoop
+        '''
+        if self.mods.get('file'):
+            yield self.shell.send_async(
+                self.mods['file'],
+                os.path.join(self.thin_dir, 'salt-ext_mods.tgz'),
+            )
+        raise tornado.gen.Return(True)
+
+    @tornado.gen.coroutine
+    def deploy_layers_async(self, digests):
+        '''
+        Deploy the passed layers of salt-thin on the current IOLoop
+        '''
+        paths = self._layer_paths(digests)
+        if paths:
+            yield self.shell.send_async(' '.join(paths), self.thin_dir + '/')
+        raise tornado.gen.Return(True)
+
+    def can_run_async(self):
+        '''
+        Return True if this routine can be executed by run_async. Wrapper
+        functions, and targets using winrm, a tty or password authentication
+        need to be run with run.
+        '''
+        if self.winrm or self.tty:
+            return False
+        if self.target.get('passwd') or self.target.get('priv_passwd'):
+            return False
+        if self.opts.get('raw_shell', False):
+            return True
+        return not (self.fun in self.wfuncs or self.mine)
+
+    @tornado.gen.coroutine
+    def run_async(self):
+        '''
+        Execute a raw shell command or a remote Salt command on the current
+        IOLoop. The ssh sessions are run through non-blocking pipes, so many
+        routines can be run concurrently from a single process.
+
+        Returns tuple of (stdout, stderr, retcode)
+        '''
+        if self.opts.get('raw_shell', False):
+            cmd_str = ' '.join([self._escape_arg(arg) for arg in self.argv])
+            ret = yield self.shell.exec_cmd_async(cmd_str)
+        else:
+            ret = yield self.cmd_block_async()
+        raise tornado.gen.Return(ret)
+
     def run(self, deploy_attempted=False):
         '''
         Execute the routine, the routine can be either:
@@ -1225,6 +1458,7 @@ OPTIONS.wipe = {wipe}
 OPTIONS.tty = {tty}
 OPTIONS.cmd_umask = {cmd_umask}
 OPTIONS.code_checksum = {code_checksum}
+OPTIONS.layers = {layers}
 ARGS = {arguments}\n'''.format(config=self.minion_config,
                                delimeter=RSTR,
                                saltdir=self.thin_dir,
@@ -1236,6 +1470,8 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
                                tty=self.tty,
                                cmd_umask=self.cmd_umask,
                                code_checksum=thin_code_digest,
+                               layers=salt.utils.json.dumps(
+                                   [digest for digest, _ in self.thin_layers]),
                                arguments=self.argv)
         py_code = SSH_PY_SHIM.replace('#%%OPTS', arg_str)
         if six.PY2:
@@ -1314,13 +1550,67 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
         5. split SHIM results from command results
         6. return command results
         '''
+        steps = self._cmd_block_steps()
+        result = None
+        while True:
+            step, arg = steps.send(result)
+            if step == 'return':
+                return arg
+            elif step == 'retry':
+                return self.cmd_block()
+            elif step == 'shim':
+                result = self.shim_cmd(arg)
+            elif step == 'deploy':
+                result = self.deploy()
+            elif step == 'deploy_ext':
+                result = self.deploy_ext()
+            elif step == 'deploy_layers':
+                result = self.deploy_layers(arg)
+            elif step == 'deploy_python':
+                result = saltwinshell.deploy_python(self)
+
+    @tornado.gen.coroutine
+    def cmd_block_async(self):
+        '''
+        Execute the same routine as cmd_block on the current IOLoop
+        '''
+        steps = self._cmd_block_steps()
+        result = None
+        while True:
+            step, arg = steps.send(result)
+            if step == 'return':
+                raise tornado.gen.Return(arg)
+            elif step == 'retry':
+                steps = self._cmd_block_steps()
+                result = None
+            elif step == 'shim':
+                result = yield self.shell.exec_cmd_async(arg)
+            elif step == 'deploy':
+                result = yield self.deploy_async()
+            elif step == 'deploy_ext':
+                result = yield self.deploy_ext_async()
+            elif step == 'deploy_layers':
+                result = yield self.deploy_layers_async(arg)
+            else:
+                raise salt.exceptions.SaltClientError(
+                    'Unable to run {0} asynchronously'.format(step))
+
+    def _cmd_block_steps(self):
+        '''
+        The routine run by cmd_block, as a generator which yields the
+        operations needed as (operation, argument) tuples and is sent the
+        result of each one, so that it can be driven either synchronously or
+        from an IOLoop. The operations are ``shim``, ``deploy``,
+        ``deploy_ext``, ``deploy_layers``, ``deploy_python``, ``retry``, and
+        finally ``return`` with the (stdout, stderr, retcode) tuple.
+        '''
         self.argv = _convert_args(self.argv)
         log.debug(
             'Performing shimmed, blocking command as follows:\n%s',
             ' '.join([six.text_type(arg) for arg in self.argv])
         )
         cmd_str = self._cmd_str()
-        stdout, stderr, retcode = self.shim_cmd(cmd_str)
+        stdout, stderr, retcode = yield 'shim', cmd_str
 
         log.trace('STDOUT %s\n%s', self.target['host'], stdout)
         log.trace('STDERR %s\n%s', self.target['host'], stderr)
@@ -1329,25 +1619,27 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
         error = self.categorize_shim_errors(stdout, stderr, retcode)
         if error:
             if error == 'Python environment not found on Windows system':
-                saltwinshell.deploy_python(self)
-                stdout, stderr, retcode = self.shim_cmd(cmd_str)
+                yield 'deploy_python', None
+                stdout, stderr, retcode = yield 'shim', cmd_str
                 while re.search(RSTR_RE, stdout):
                     stdout = re.split(RSTR_RE, stdout, 1)[1].strip()
                 while re.search(RSTR_RE, stderr):
                     stderr = re.split(RSTR_RE, stderr, 1)[1].strip()
             elif error == 'Undefined SHIM state':
-                self.deploy()
-                stdout, stderr, retcode = self.shim_cmd(cmd_str)
+                yield 'deploy', None
+                stdout, stderr, retcode = yield 'shim', cmd_str
                 if not re.search(RSTR_RE, stdout) or not re.search(RSTR_RE, stderr):
                     # If RSTR is not seen in both stdout and stderr then there
                     # was a thin deployment problem.
-                    return 'ERROR: Failure deploying thin, undefined state: {0}'.format(stdout), stderr, retcode
+                    yield 'return', ('ERROR: Failure deploying thin, undefined state: {0}'.format(stdout), stderr, retcode)
+                    return
                 while re.search(RSTR_RE, stdout):
                     stdout = re.split(RSTR_RE, stdout, 1)[1].strip()
                 while re.search(RSTR_RE, stderr):
                     stderr = re.split(RSTR_RE, stderr, 1)[1].strip()
             else:
-                return 'ERROR: {0}'.format(error), stderr, retcode
+                yield 'return', ('ERROR: {0}'.format(error), stderr, retcode)
+                return
 
         # FIXME: this discards output from ssh_shim if the shim succeeds.  It should
         # always save the shim output regardless of shim success or failure.
@@ -1366,8 +1658,8 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
             shim_command = re.split(r'\r?\n', stdout, 1)[0].strip()
             log.debug('SHIM retcode(%s) and command: %s', retcode, shim_command)
             if 'deploy' == shim_command and retcode == salt.defaults.exitcodes.EX_THIN_DEPLOY:
-                self.deploy()
-                stdout, stderr, retcode = self.shim_cmd(cmd_str)
+                yield 'deploy', None
+                stdout, stderr, retcode = yield 'shim', cmd_str
                 if not re.search(RSTR_RE, stdout) or not re.search(RSTR_RE, stderr):
                     if not self.tty:
                         # If RSTR is not seen in both stdout and stderr then there
@@ -1377,7 +1669,8 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
                             'STDOUT:\n%s\nSTDERR:\n%s\nRETCODE: %s',
                             stdout, stderr, retcode
                         )
-                        return self.cmd_block()
+                        yield 'retry', None
+                        return
                     elif not re.search(RSTR_RE, stdout):
                         # If RSTR is not seen in stdout with tty, then there
                         # was a thin deployment problem.
@@ -1393,19 +1686,36 @@ ARGS = {arguments}\n'''.format(config=self.minion_config,
                 else:
                     while re.search(RSTR_RE, stderr):
                         stderr = re.split(RSTR_RE, stderr, 1)[1].strip()
+            elif shim_command.startswith('layers') and retcode == salt.defaults.exitcodes.EX_THIN_DEPLOY:
+                yield 'deploy_layers', shim_command.split()[1:]
+                stdout, stderr, retcode = yield 'shim', cmd_str
+                if not re.search(RSTR_RE, stdout) or \
+                        (not self.tty and not re.search(RSTR_RE, stderr)):
+                    # If RSTR is not seen in both stdout and stderr then there
+                    # was a thin deployment problem.
+                    yield 'return', ('ERROR: Failure deploying thin layers: {0}'.format(stdout), stderr, retcode)
+                    return
+                while re.search(RSTR_RE, stdout):
+                    stdout = re.split(RSTR_RE, stdout, 1)[1].strip()
+                if self.tty:
+                    stderr = ''
+                else:
+                    while re.search(RSTR_RE, stderr):
+                        stderr = re.split(RSTR_RE, stderr, 1)[1].strip()
             elif 'ext_mods' == shim_command:
-                self.deploy_ext()
-                stdout, stderr, retcode = self.shim_cmd(cmd_str)
+                yield 'deploy_ext', None
+                stdout, stderr, retcode = yield 'shim', cmd_str
                 if not re.search(RSTR_RE, stdout) or not re.search(RSTR_RE, stderr):
                     # If RSTR is not seen in both stdout and stderr then there
                     # was a thin deployment problem.
-                    return 'ERROR: Failure deploying ext_mods: {0}'.format(stdout), stderr, retcode
+                    yield 'return', ('ERROR: Failure deploying ext_mods: {0}'.format(stdout), stderr, retcode)
+                    return
                 while re.search(RSTR_RE, stdout):
                     stdout = re.split(RSTR_RE, stdout, 1)[1].strip()
                 while re.search(RSTR_RE, stderr):
                     stderr = re.split(RSTR_RE, stderr, 1)[1].strip()
 
-        return stdout, stderr, retcode
+        yield 'return', (stdout, stderr, retcode)
 
     def categorize_shim_errors(self, stdout_bytes, stderr_bytes, retcode):
         stdout = salt.utils.stringutils.to_unicode(stdout_bytes)
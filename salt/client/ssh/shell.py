@@ -5,6 +5,8 @@ Manage transport commands via ssh
 from __future__ import absolute_import, print_function, unicode_literals
 
 # Import python libs
+import errno
+import hashlib
 import re
 import os
 import sys
@@ -14,12 +16,18 @@ import subprocess
 
 # Import salt libs
 import salt.defaults.exitcodes
+import salt.utils.files
 import salt.utils.json
 import salt.utils.nb_popen
+import salt.utils.stringutils
 import salt.utils.vt
 
 from salt.ext import six
 
+# Import 3rd-party libs
+import tornado.gen
+import tornado.process
+
 log = logging.getLogger(__name__)
 
 SSH_PASSWORD_PROMPT_RE = re.compile(r'(?:.*)[Pp]assword(?: for .*)?:', re.M)
@@ -157,9 +165,9 @@ class Shell(object):
         '''
         Return options to pass to ssh
         '''
-        # TODO ControlMaster does not work without ControlPath
-        # user could take advantage of it if they set ControlPath in their
-        # ssh config.  Also, ControlPersist not widely available.
+        # ControlMaster does not work without ControlPath, which is set by
+        # _control_opts if ssh_control_persist is configured, or can be set in
+        # the user's ssh config.
         options = ['ControlMaster=auto',
                    'StrictHostKeyChecking=no',
                    ]
@@ -193,6 +201,39 @@ class Shell(object):
             ret.append('-o {0} '.format(option))
         return ''.join(ret)
 
+    def _control_opts(self):
+        '''
+        Return the options to share a persistent master connection to the
+        target between ssh executions, including those of later salt-ssh runs,
+        if ssh_control_persist is set
+        '''
+        persist = self.opts.get('ssh_control_persist')
+        if not persist:
+            return ''
+        control_dir = os.path.join(self.opts['cachedir'], 'ssh_control')
+        if not os.path.isdir(control_dir):
+            try:
+                os.makedirs(control_dir, 0o700)
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    log.error(
+                        'Unable to create the ssh control directory %s: %s',
+                        control_dir, exc
+                    )
+                    return ''
+        # The length of a socket path is limited, so name the socket after a
+        # digest of the connection details
+        name = hashlib.sha1(
+            salt.utils.stringutils.to_bytes(
+                '{0}@{1}:{2}'.format(self.user, self.host, self.port)
+            )
+        ).hexdigest()
+        options = ['ControlMaster=auto',
+                   'ControlPath={0}'.format(os.path.join(control_dir, name)),
+                   'ControlPersist={0}'.format(persist),
+                   ]
+        return ' '.join(['-o {0}'.format(opt) for opt in options])
+
     def _ssh_opts(self):
         return ' '.join(['-o {0}'.format(opt)
                           for opt in self.ssh_options])
@@ -241,9 +282,10 @@ class Shell(object):
             stdout, stderr, retcode = self._run_cmd(self._copy_id_str_new())
         return stdout, stderr, retcode
 
-    def _cmd_str(self, cmd, ssh='ssh'):
+    def _cmd_str(self, cmd, ssh='ssh', batch=False):
         '''
-        Return the cmd string to execute
+        Return the cmd string to execute. If batch is True, ssh will fail
+        rather than prompt for input.
         '''
 
         # TODO: if tty, then our SSH_SHIM cannot be supplied from STDIN Will
@@ -261,6 +303,11 @@ class Shell(object):
                                       for item in self.remote_port_forwards.split(',')]))
         if self.ssh_options:
             command.append(self._ssh_opts())
+        control_opts = self._control_opts()
+        if control_opts:
+            command.append(control_opts)
+        if batch:
+            command.append('-o BatchMode=yes')
 
         command.append(cmd)
 
@@ -347,6 +394,43 @@ class Shell(object):
         ret = self._run_cmd(cmd)
         return ret
 
+    @tornado.gen.coroutine
+    def exec_cmd_async(self, cmd):
+        '''
+        Execute a remote command on the current IOLoop, see _run_cmd_async
+        '''
+        cmd = self._cmd_str(cmd, batch=True)
+
+        logmsg = 'Executing command: {0}'.format(cmd)
+        if 'decode("base64")' in logmsg or 'base64.b64decode(' in logmsg:
+            log.debug('Executed SHIM command. Command logged to TRACE')
+            log.trace(logmsg)
+        else:
+            log.debug(logmsg)
+
+        ret = yield self._run_cmd_async(cmd)
+        raise tornado.gen.Return(ret)
+
+    @tornado.gen.coroutine
+    def send_async(self, local, remote, makedirs=False):
+        '''
+        scp a file or files to a remote system on the current IOLoop
+        '''
+        if makedirs:
+            yield self.exec_cmd_async('mkdir -p {0}'.format(os.path.dirname(remote)))
+
+        # scp needs [<ipv6}
+        host = self.host
+        if ':' in host:
+            host = '[{0}]'.format(host)
+
+        cmd = '{0} {1}:{2}'.format(local, host, remote)
+        cmd = self._cmd_str(cmd, ssh='scp', batch=True)
+        log.debug('Executing command: %s', cmd)
+
+        ret = yield self._run_cmd_async(cmd)
+        raise tornado.gen.Return(ret)
+
     def send(self, local, remote, makedirs=False):
         '''
         scp a file or files to a remote system
@@ -439,3 +523,40 @@ class Shell(object):
             return ret_stdout, ret_stderr, term.exitstatus
         finally:
             term.close(terminate=True, kill=True)
+
+    @tornado.gen.coroutine
+    def _run_cmd_async(self, cmd):
+        '''
+        Execute a shell command using non-blocking pipes which are read by the
+        current IOLoop, so that many commands can run from a single process.
+
+        No terminal is allocated, so prompts for passwords, key passphrases or
+        host key acceptance cannot be answered. The command must be generated
+        with batch mode enabled, which makes ssh fail instead of prompting.
+        '''
+        if not cmd:
+            raise tornado.gen.Return(('', 'No command or passphrase', 245))
+
+        with salt.utils.files.fopen(os.devnull, 'rb') as devnull:
+            try:
+                proc = tornado.process.Subprocess(
+                    cmd,
+                    shell=True,
+                    stdin=devnull,
+                    stdout=tornado.process.Subprocess.STREAM,
+                    stderr=tornado.process.Subprocess.STREAM,
+                )
+            except (IOError, OSError) as exc:
+                log.error('Failed to execute command: %s', exc)
+                raise tornado.gen.Return(('local', 'Unknown Error', None))
+
+        stdout, stderr, retcode = yield [
+            proc.stdout.read_until_close(),
+            proc.stderr.read_until_close(),
+            proc.wait_for_exit(raise_error=False),
+        ]
+        stdout = salt.utils.stringutils.to_unicode(stdout)
+        stderr = salt.utils.stringutils.to_unicode(stderr)
+        log.trace('STDOUT %s\n%s', self.host, stdout)
+        log.trace('STDERR %s\n%s', self.host, stderr)
+        raise tornado.gen.Return((stdout, stderr, retcode))
@@ -10,6 +10,7 @@ separate file, for convenience of development.
 from __future__ import absolute_import, print_function
 
 import hashlib
+import re
 import tarfile
 import shutil
 import sys
@@ -20,6 +21,7 @@ import time
 
 THIN_ARCHIVE = 'salt-thin.tgz'
 EXT_ARCHIVE = 'salt-ext_mods.tgz'
+LAYER_ARCHIVE = '{0}.tgz'
 
 # Keep these in sync with salt/defaults/exitcodes.py
 EX_THIN_PYTHON_INVALID = 10
@@ -135,10 +137,20 @@ def need_deployment():
                 sys.exit(1)
 
     # Delimiter emitted on stdout *only* to indicate shim message to master.
+    if OPTIONS.layers:
+        need_layers(OPTIONS.layers)
     sys.stdout.write("{0}\ndeploy\n".format(OPTIONS.delimiter))
     sys.exit(EX_THIN_DEPLOY)
 
 
+def need_layers(missing):
+    '''
+    Signal that the passed layers of salt thin need to be deployed.
+    '''
+    sys.stdout.write("{0}\nlayers {1}\n".format(OPTIONS.delimiter, ' '.join(missing)))
+    sys.exit(EX_THIN_DEPLOY)
+
+
 # Adapted from salt.utils.hashutils.get_hash()
 def get_hash(path, form='sha1', chunk_size=4096):
     '''
@@ -172,6 +184,88 @@ def unpack_thin(thin_path):
     reset_time(OPTIONS.saltdir)
 
 
+def layer_paths(names):
+    '''
+    Return the paths, relative to the salt thin directory, which are owned by
+    a layer containing the passed file names. This is the package (or single
+    file module) of the layer, or each of the files of the root layer.
+    Adapted from salt.utils.thin._thin_layer_name()
+    '''
+    site_pkg_re = re.compile(r'^py(?:all|\d+)$')
+    paths = set()
+    for name in names:
+        parts = name.split('/')
+        if len(parts) > 1 and site_pkg_re.match(parts[0]):
+            parts = parts[:2]
+        elif len(parts) > 2 and site_pkg_re.match(parts[1]):
+            # A package of an alternative Salt version namespace
+            parts = parts[:3]
+        else:
+            parts = parts[:1]
+        paths.add('/'.join(parts))
+    return paths
+
+
+def remove_layer_paths(paths):
+    '''
+    Remove the passed paths owned by a layer from the salt thin directory, so
+    that files which are not part of a replacement layer are not left behind.
+    '''
+    for path in paths:
+        if not path or os.path.isabs(path) or '..' in path.split('/'):
+            continue
+        path = os.path.join(OPTIONS.saltdir, path)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+            continue
+        compiled = [path + 'c', path + 'o'] if path.endswith('.py') else []
+        for fname in [path] + compiled:
+            if os.path.lexists(fname):
+                os.unlink(fname)
+
+
+def unpack_layers():
+    '''
+    Unpack the salt thin layers which have been deployed, and signal which
+    layers are missing. The layers which are unpacked are recorded, so that
+    only new or changed layers are deployed. The files of layers which are no
+    longer part of salt thin are removed, and each layer replaces the files of
+    its package, rather than being unpacked over them.
+    '''
+    layer_dir = os.path.join(OPTIONS.saltdir, '.layers')
+    if not os.path.isdir(layer_dir):
+        os.makedirs(layer_dir)
+    # Prune the layers which have been replaced or removed first, before the
+    # current layers are unpacked
+    for digest in os.listdir(layer_dir):
+        if digest in OPTIONS.layers:
+            continue
+        marker = os.path.join(layer_dir, digest)
+        with open(marker) as fp_:
+            remove_layer_paths([line.strip() for line in fp_ if line.strip()])
+        os.unlink(marker)
+    missing = []
+    for digest in OPTIONS.layers:
+        marker = os.path.join(layer_dir, digest)
+        if os.path.isfile(marker):
+            continue
+        layer_path = os.path.join(OPTIONS.saltdir, LAYER_ARCHIVE.format(digest))
+        if os.path.isfile(layer_path) and get_hash(layer_path, OPTIONS.hashfunc) == digest:
+            tfile = tarfile.TarFile.gzopen(layer_path)
+            try:
+                paths = layer_paths(tfile.getnames())
+            finally:
+                tfile.close()
+            remove_layer_paths(paths)
+            unpack_thin(layer_path)
+            with open(marker, 'w') as fp_:
+                fp_.write('\n'.join(sorted(paths)))
+        else:
+            missing.append(digest)
+    if missing:
+        need_layers(missing)
+
+
 def need_ext():
     '''
     Signal that external modules need to be deployed.
@@ -270,6 +364,9 @@ def main(argv):  # pylint: disable=W0613
         if not os.path.exists(OPTIONS.saltdir):
             need_deployment()
 
+        if OPTIONS.layers:
+            unpack_layers()
+
         code_checksum_path = os.path.normpath(os.path.join(OPTIONS.saltdir, 'code-checksum'))
         if not os.path.exists(code_checksum_path) or not os.path.isfile(code_checksum_path):
             sys.stderr.write('WARNING: Unable to locate current code checksum: {0}.\n'.format(code_checksum_path))
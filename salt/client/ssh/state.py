@@ -4,17 +4,21 @@ Create ssh executor system
 '''
 from __future__ import absolute_import, print_function
 # Import python libs
+import hashlib
 import logging
 import os
 import tarfile
 import tempfile
+import time
 import shutil
 from contextlib import closing
 
 # Import salt libs
 import salt.client.ssh.shell
 import salt.client.ssh
+import salt.utils.atomicfile
 import salt.utils.files
+import salt.utils.hashutils
 import salt.utils.json
 import salt.utils.path
 import salt.utils.stringutils
@@ -257,3 +261,204 @@ def prep_trans_tar(file_client, chunks, file_refs, pillar=None, id_=None, roster
         os.chdir(cwd)
     shutil.rmtree(gendir)
     return trans_tar
+
+
+# The options which influence the compilation of states, and are part of the
+# key of the compiled state cache
+STATE_CACHE_OPTS = (
+    'saltenv',
+    'pillarenv',
+    'state_top',
+    'state_top_saltenv',
+    'top_file_merging_strategy',
+    'env_order',
+    'default_top',
+    'renderer',
+    'failhard',
+    'state_aggregate',
+    'state_auto_order',
+    'hash_type',
+)
+
+
+def state_cache_enabled(opts):
+    '''
+    Return True if compiled states are cached
+    '''
+    return bool(opts.get('ssh_state_cache_ttl'))
+
+
+def state_cache_key(opts, pillar, *extra):
+    '''
+    Return the key under which the state compiled for a target is cached, or
+    None if the cache is disabled. The key is a digest of the target's pillar
+    and grains, the options which influence the compilation, and any
+    additional arguments which influence the compiled state (such as the
+    function being run and its arguments, or the top file matches).
+
+    If ``ssh_state_cache_grains`` is set, only the listed grains are part of
+    the key, so that targets which only differ by other grains share the
+    compiled state.
+    '''
+    if not state_cache_enabled(opts):
+        return None
+    grains = opts.get('grains', {})
+    cache_grains = opts.get('ssh_state_cache_grains')
+    if cache_grains is not None:
+        grains = dict(
+            (name, grains[name]) for name in cache_grains if name in grains
+        )
+    data = [
+        grains,
+        pillar,
+        dict((name, opts.get(name)) for name in STATE_CACHE_OPTS),
+        extra,
+    ]
+    try:
+        return hashlib.sha1(
+            salt.utils.stringutils.to_bytes(
+                salt.utils.json.dumps(data, sort_keys=True, default=repr)
+            )
+        ).hexdigest()
+    except (TypeError, ValueError) as exc:
+        log.debug('Unable to generate compiled state cache key: %s', exc)
+        return None
+
+
+def send_roster_grains(shell, roster_grains, dest):
+    '''
+    Send the grains of a target to the passed path on the target, for use with
+    a cached trans tar which is shared by several targets and so does not
+    contain them
+    '''
+    grains_file = salt.utils.files.mkstemp()
+    try:
+        with salt.utils.files.fopen(grains_file, 'w+') as fp_:
+            salt.utils.json.dump(roster_grains, fp_)
+        shell.send(grains_file, dest)
+    finally:
+        try:
+            os.remove(grains_file)
+        except (OSError, IOError):
+            pass
+
+
+def _state_cache_dir(opts):
+    cachedir = os.path.join(opts['cachedir'], 'ssh_state')
+    if not os.path.isdir(cachedir):
+        try:
+            os.makedirs(cachedir, 0o700)
+        except OSError:
+            if not os.path.isdir(cachedir):
+                raise
+    return cachedir
+
+
+def _file_sums(file_client, chunks, file_refs):
+    '''
+    Return the hashes of the SLS files the chunks were compiled from, and of
+    the files they reference, by saltenv
+    '''
+    sums = {}
+
+    def _add(url, saltenv):
+        hash_ = file_client.hash_file(url, saltenv)
+        if hash_ and hash_.get('hsum'):
+            sums.setdefault(saltenv, {})[url] = hash_['hsum']
+            return True
+        return False
+
+    for chunk in chunks:
+        sls = chunk.get('__sls__')
+        saltenv = chunk.get('__env__')
+        if not sls or not saltenv:
+            continue
+        sls = sls.replace('.', '/')
+        for url in (salt.utils.url.create(sls + '.sls'),
+                    salt.utils.url.create(sls + '/init.sls')):
+            if url in sums.get(saltenv, {}) or _add(url, saltenv):
+                break
+    for saltenv in file_refs:
+        for ref in file_refs[saltenv]:
+            for name in ref:
+                # Directories are not hashed, their changes are only picked up
+                # when the cached state expires
+                _add(name, saltenv)
+    return sums
+
+
+def state_cache_get(opts, key, file_client):
+    '''
+    Return the (path, checksum) of the cached trans tar for the passed key, or
+    None if it is not cached, has expired, or one of the files it was
+    compiled from has changed.
+    '''
+    if key is None:
+        return None
+    entry_path = os.path.join(_state_cache_dir(opts), '{0}.json'.format(key))
+    try:
+        with salt.utils.files.fopen(entry_path, 'r') as fp_:
+            entry = salt.utils.json.load(fp_)
+    except (IOError, OSError, ValueError):
+        return None
+    if time.time() - entry.get('time', 0) > opts['ssh_state_cache_ttl']:
+        return None
+    trans_tar = os.path.join(_state_cache_dir(opts), entry['tar'])
+    if not os.path.isfile(trans_tar):
+        return None
+    for saltenv, sums in six.iteritems(entry.get('sums', {})):
+        for url, hsum in six.iteritems(sums):
+            hash_ = file_client.hash_file(url, saltenv)
+            if not hash_ or hash_.get('hsum') != hsum:
+                log.debug('%s has changed, compiling the state again', url)
+                return None
+    log.debug('Using the cached compiled state %s', key)
+    return trans_tar, entry['sum']
+
+
+def state_cache_store(opts, key, file_client, chunks, file_refs, trans_tar):
+    '''
+    Store the trans tar generated for the passed key and return its new
+    (path, checksum). If the cache is disabled, the trans tar is left where it
+    is, and must be removed once it has been sent.
+    '''
+    trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts['hash_type'])
+    if key is None:
+        return trans_tar, trans_tar_sum
+    cachedir = _state_cache_dir(opts)
+    # The tar is named after its checksum, so that a tar being sent to a
+    # target is never replaced by one with a different checksum
+    tar_name = '{0}.tgz'.format(trans_tar_sum)
+    cached_tar = os.path.join(cachedir, tar_name)
+    if os.path.isfile(cached_tar):
+        os.remove(trans_tar)
+        # Keep the shared tar from being pruned
+        os.utime(cached_tar, None)
+    else:
+        fd_, tmp_tar = tempfile.mkstemp(dir=cachedir, suffix='.tmp')
+        os.close(fd_)
+        shutil.move(trans_tar, tmp_tar)
+        os.rename(tmp_tar, cached_tar)
+    entry = {'time': time.time(),
+             'tar': tar_name,
+             'sum': trans_tar_sum,
+             'sums': _file_sums(file_client, chunks, file_refs)}
+    entry_path = os.path.join(cachedir, '{0}.json'.format(key))
+    with salt.utils.atomicfile.atomic_open(entry_path, 'w') as fp_:
+        salt.utils.json.dump(entry, fp_)
+    _state_cache_prune(opts, cachedir)
+    return cached_tar, trans_tar_sum
+
+
+def _state_cache_prune(opts, cachedir):
+    '''
+    Remove the cached states which have long expired
+    '''
+    expired = time.time() - 2 * opts['ssh_state_cache_ttl']
+    for fname in os.listdir(cachedir):
+        path = os.path.join(cachedir, fname)
+        try:
+            if os.path.getmtime(path) < expired:
+                os.remove(path)
+        except OSError:
+            pass
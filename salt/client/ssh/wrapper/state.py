@@ -177,21 +177,13 @@ def _parse_mods(mods):
     return mods
 
 
-def sls(mods, saltenv='base', test=None, exclude=None, **kwargs):
+def _compile_sls(st_, opts, cache_key, saltenv, mods, exclude, st_kwargs, roster_grains, **kwargs):
     '''
-    Create the seed file for a state.sls run
+    Compile the passed SLS files and create the tar containing the state pkg
+    and the files it needs, which is stored under the passed key of the
+    compiled state cache. Returns the (path, checksum) of the tar, or a list
+    of errors.
     '''
-    st_kwargs = __salt__.kwargs
-    __opts__['grains'] = __grains__
-    __pillar__.update(kwargs.get('pillar', {}))
-    opts = salt.utils.state.get_sls_opts(__opts__, **kwargs)
-    st_ = salt.client.ssh.state.SSHHighState(
-            opts,
-            __pillar__,
-            __salt__,
-            __context__['fileclient'])
-    st_.push_active()
-    mods = _parse_mods(mods)
     high_data, errors = st_.render_highstate({saltenv: mods})
     if exclude:
         if isinstance(exclude, six.string_types):
@@ -221,10 +213,8 @@ def sls(mods, saltenv='base', test=None, exclude=None, **kwargs):
                 )
             )
 
-    roster = salt.roster.Roster(opts, opts.get('roster', 'flat'))
-    roster_grains = roster.opts['grains']
-
-    # Create the tar containing the state pkg and relevant files.
+    # Create the tar containing the state pkg and relevant files. A cached
+    # tar may be shared by several targets, so their grains are sent apart.
     _cleanup_slsmod_low_data(chunks)
     trans_tar = salt.client.ssh.state.prep_trans_tar(
             __context__['fileclient'],
@@ -232,29 +222,89 @@ def sls(mods, saltenv='base', test=None, exclude=None, **kwargs):
             file_refs,
             __pillar__,
             st_kwargs['id_'],
-            roster_grains)
-    trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts['hash_type'])
-    cmd = 'state.pkg {0}/salt_state.tgz test={1} pkg_sum={2} hash_type={3}'.format(
-            opts['thin_dir'],
-            test,
-            trans_tar_sum,
-            opts['hash_type'])
+            roster_grains if cache_key is None else None)
+    return salt.client.ssh.state.state_cache_store(
+            opts,
+            cache_key,
+            __context__['fileclient'],
+            chunks,
+            file_refs,
+            trans_tar)
+
+
+def _send_state_pkg(opts, cmd, st_kwargs, cache_key, trans_tar, roster_grains):
+    '''
+    Send the tar containing the state pkg to the target, along with the
+    target's grains when the tar is cached and so does not contain them, and
+    return the Single which runs the passed state.pkg command
+    '''
+    grains_path = '{0}/salt_state_grains.json'.format(opts['thin_dir'])
+    if cache_key is not None:
+        cmd += ' roster_grains_path={0}'.format(grains_path)
     single = salt.client.ssh.Single(
             opts,
             cmd,
             fsclient=__context__['fileclient'],
             minion_opts=__salt__.minion_opts,
             **st_kwargs)
+    if cache_key is not None:
+        salt.client.ssh.state.send_roster_grains(
+                single.shell, roster_grains, grains_path)
     single.shell.send(
             trans_tar,
             '{0}/salt_state.tgz'.format(opts['thin_dir']))
+    return single
+
+
+def sls(mods, saltenv='base', test=None, exclude=None, **kwargs):
+    '''
+    Create the seed file for a state.sls run
+    '''
+    st_kwargs = __salt__.kwargs
+    __opts__['grains'] = __grains__
+    __pillar__.update(kwargs.get('pillar', {}))
+    opts = salt.utils.state.get_sls_opts(__opts__, **kwargs)
+    st_ = salt.client.ssh.state.SSHHighState(
+            opts,
+            __pillar__,
+            __salt__,
+            __context__['fileclient'])
+    st_.push_active()
+    mods = _parse_mods(mods)
+    cache_key = salt.client.ssh.state.state_cache_key(
+            opts,
+            __pillar__,
+            'sls',
+            saltenv,
+            mods,
+            exclude,
+            kwargs.get('extra_filerefs', ''))
+    roster = salt.roster.Roster(opts, opts.get('roster', 'flat'))
+    roster_grains = roster.opts['grains']
+    cached = salt.client.ssh.state.state_cache_get(
+            opts, cache_key, __context__['fileclient'])
+    if cached is None:
+        cached = _compile_sls(
+                st_, opts, cache_key, saltenv, mods, exclude, st_kwargs,
+                roster_grains, **kwargs)
+        if isinstance(cached, list):
+            # Errors were found
+            return cached
+    trans_tar, trans_tar_sum = cached
+    cmd = 'state.pkg {0}/salt_state.tgz test={1} pkg_sum={2} hash_type={3}'.format(
+            opts['thin_dir'],
+            test,
+            trans_tar_sum,
+            opts['hash_type'])
+    single = _send_state_pkg(opts, cmd, st_kwargs, cache_key, trans_tar, roster_grains)
     stdout, stderr, _ = single.cmd_block()
 
-    # Clean up our tar
-    try:
-        os.remove(trans_tar)
-    except (OSError, IOError):
-        pass
+    # Clean up our tar, unless it is cached to be sent to other targets
+    if cache_key is None:
+        try:
+            os.remove(trans_tar)
+        except (OSError, IOError):
+            pass
 
     # Read in the JSON data and return the data structure
     try:
@@ -686,54 +736,66 @@ def highstate(test=None, **kwargs):
             __salt__,
             __context__['fileclient'])
     st_.push_active()
-    chunks = st_.compile_low_chunks()
-    file_refs = salt.client.ssh.state.lowstate_file_refs(
-            chunks,
-            _merge_extra_filerefs(
+    cache_key = None
+    if salt.client.ssh.state.state_cache_enabled(opts):
+        cache_key = salt.client.ssh.state.state_cache_key(
+                opts,
+                __pillar__,
+                'highstate',
                 kwargs.get('extra_filerefs', ''),
-                opts.get('extra_filerefs', '')
-                )
-            )
-    # Check for errors
-    for chunk in chunks:
-        if not isinstance(chunk, dict):
-            __context__['retcode'] = 1
-            return chunks
-
+                st_.top_matches(st_.get_top()))
     roster = salt.roster.Roster(opts, opts.get('roster', 'flat'))
     roster_grains = roster.opts['grains']
-
-    # Create the tar containing the state pkg and relevant files.
-    _cleanup_slsmod_low_data(chunks)
-    trans_tar = salt.client.ssh.state.prep_trans_tar(
-            __context__['fileclient'],
-            chunks,
-            file_refs,
-            __pillar__,
-            st_kwargs['id_'],
-            roster_grains)
-    trans_tar_sum = salt.utils.hashutils.get_hash(trans_tar, opts['hash_type'])
+    cached = salt.client.ssh.state.state_cache_get(
+            opts, cache_key, __context__['fileclient'])
+    if cached is None:
+        chunks = st_.compile_low_chunks()
+        file_refs = salt.client.ssh.state.lowstate_file_refs(
+                chunks,
+                _merge_extra_filerefs(
+                    kwargs.get('extra_filerefs', ''),
+                    opts.get('extra_filerefs', '')
+                    )
+                )
+        # Check for errors
+        for chunk in chunks:
+            if not isinstance(chunk, dict):
+                __context__['retcode'] = 1
+                return chunks
+
+        # Create the tar containing the state pkg and relevant files. A
+        # cached tar may be shared by several targets, so their grains are
+        # sent apart.
+        _cleanup_slsmod_low_data(chunks)
+        trans_tar = salt.client.ssh.state.prep_trans_tar(
+                __context__['fileclient'],
+                chunks,
+                file_refs,
+                __pillar__,
+                st_kwargs['id_'],
+                roster_grains if cache_key is None else None)
+        cached = salt.client.ssh.state.state_cache_store(
+                opts,
+                cache_key,
+                __context__['fileclient'],
+                chunks,
+                file_refs,
+                trans_tar)
+    trans_tar, trans_tar_sum = cached
     cmd = 'state.pkg {0}/salt_state.tgz test={1} pkg_sum={2} hash_type={3}'.format(
             opts['thin_dir'],
             test,
             trans_tar_sum,
             opts['hash_type'])
-    single = salt.client.ssh.Single(
-            opts,
-            cmd,
-            fsclient=__context__['fileclient'],
-            minion_opts=__salt__.minion_opts,
-            **st_kwargs)
-    single.shell.send(
-            trans_tar,
-            '{0}/salt_state.tgz'.format(opts['thin_dir']))
+    single = _send_state_pkg(opts, cmd, st_kwargs, cache_key, trans_tar, roster_grains)
     stdout, stderr, _ = single.cmd_block()
 
-    # Clean up our tar
-    try:
-        os.remove(trans_tar)
-    except (OSError, IOError):
-        pass
+    # Clean up our tar, unless it is cached to be sent to other targets
+    if cache_key is None:
+        try:
+            os.remove(trans_tar)
+        except (OSError, IOError):
+            pass
 
     # Read in the JSON data and return the data structure
     try:
@@ -9,9 +9,10 @@ from __future__ import absolute_import, print_function, generators, unicode_lite
 import os
 import copy
 import glob
+import hashlib
 import time
-import signal
 import logging
+import threading
 import traceback
 import multiprocessing
 import sys
@@ -36,6 +37,8 @@ import salt.utils.crypt
 import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.files
+import salt.utils.json
+import salt.utils.stringutils
 import salt.utils.verify
 import salt.utils.yaml
 import salt.utils.user
@@ -43,6 +46,7 @@ import salt.syspaths
 from salt.template import compile_template
 
 # Import third party libs
+import concurrent.futures
 try:
     import Cryptodome.Random
 except ImportError:
@@ -56,6 +60,16 @@ from salt.ext.six.moves import input  # pylint: disable=import-error,redefined-b
 # Get logging started
 log = logging.getLogger(__name__)
 
+# The provider queries are I/O bound, so they are run in a pool of threads
+# which is kept for the lifetime of the process. Query results are cached for
+# ``cloud_query_cache_ttl`` seconds, and identical queries which are started
+# while one is already in progress wait for its result instead of querying the
+# provider again.
+_QUERY_LOCK = threading.Lock()
+_QUERY_POOL = None
+_QUERY_CACHE = {}
+_QUERY_INFLIGHT = {}
+
 
 def communicator(func):
     '''Warning, this is a picklable decorator !'''
@@ -182,6 +196,49 @@ def enter_mainloop(target,
     return ret
 
 
+def _query_pool(opts):
+    '''
+    Return the thread pool used to query the cloud providers
+    '''
+    global _QUERY_POOL
+    with _QUERY_LOCK:
+        if _QUERY_POOL is None:
+            _QUERY_POOL = concurrent.futures.ThreadPoolExecutor(
+                max(1, opts.get('cloud_query_workers') or 10)
+            )
+        return _QUERY_POOL
+
+
+def _query_key(opts, alias, driver, fun):
+    '''
+    Return the key identifying a query of a provider. The provider
+    configuration is part of the key, so that differently configured providers
+    using the same alias never share results.
+    '''
+    details = opts['providers'].get(alias, {}).get(driver, {})
+    digest = hashlib.sha1(
+        salt.utils.stringutils.to_bytes(
+            salt.utils.json.dumps(details, sort_keys=True, default=repr)
+        )
+    ).hexdigest()
+    return alias, driver, fun, digest
+
+
+def forget_provider_queries(alias=None, driver=None):
+    '''
+    Drop the cached query results of the passed provider, or of all providers
+    if none is passed. This is called when VMs are created or destroyed, since
+    the cached results no longer reflect what is running.
+    '''
+    with _QUERY_LOCK:
+        for key in list(_QUERY_CACHE):
+            if alias is not None and key[0] != alias:
+                continue
+            if driver is not None and key[1] != driver:
+                continue
+            del _QUERY_CACHE[key]
+
+
 class CloudClient(object):
     '''
     The client class to wrap cloud interactions
@@ -528,6 +585,10 @@ class Cloud(object):
         self.clouds = salt.loader.clouds(self.opts)
         self.__filter_non_working_providers()
         self.__cached_provider_queries = {}
+        # Drivers inject the provider name into their module globals while
+        # running, so each driver may only run one query at a time
+        self.__driver_locks = {}
+        self.__driver_locks_lock = threading.Lock()
 
     def get_configured_providers(self):
         '''
@@ -661,13 +722,14 @@ class Cloud(object):
         Return a mapping of what named VMs are running on what VM providers
         based on what providers are defined in the configuration and VMs
 
-        Same as map_providers but query in parallel.
+        Same as map_providers but query in parallel, using a pool of threads
+        which is shared by all the queries made by this process.
         '''
         if cached is True and query in self.__cached_provider_queries:
             return self.__cached_provider_queries[query]
 
         opts = self.opts.copy()
-        multiprocessing_data = []
+        queries = []
 
         # Optimize Providers
         opts['providers'] = self._optimize_providers(opts['providers'])
@@ -686,24 +748,17 @@ class Cloud(object):
                     log.error('Public cloud provider %s is not available', driver)
                     continue
 
-                multiprocessing_data.append({
-                    'fun': fun,
-                    'opts': opts,
-                    'query': this_query,
-                    'alias': alias,
-                    'driver': driver
-                })
+                queries.append((alias, driver, fun))
         output = {}
-        if not multiprocessing_data:
+        if not queries:
             return output
 
-        data_count = len(multiprocessing_data)
-        pool = multiprocessing.Pool(data_count < 10 and data_count or 10,
-                                    init_pool_worker)
-        parallel_pmap = enter_mainloop(_run_parallel_map_providers_query,
-                                       multiprocessing_data,
-                                       pool=pool)
-        for alias, driver, details in parallel_pmap:
+        futures = [
+            (alias, driver, self._query_provider(opts, alias, driver, fun))
+            for alias, driver, fun in queries
+        ]
+        for alias, driver, future in futures:
+            details = copy.deepcopy(future.result())
             if not details:
                 # There's no providers details?! Skip it!
                 continue
@@ -714,6 +769,68 @@ class Cloud(object):
         self.__cached_provider_queries[query] = output
         return output
 
+    def _query_provider(self, opts, alias, driver, fun):
+        '''
+        Start querying a provider in the query pool, returning a future for the
+        result. Cached results are returned when ``cloud_query_cache_ttl`` is
+        set, and a query which is already in progress is waited for instead of
+        being started again.
+        '''
+        key = _query_key(opts, alias, driver, fun)
+        ttl = opts.get('cloud_query_cache_ttl', 0)
+        pool = _query_pool(opts)
+        # Load the driver before handing it to the pool
+        func = self.clouds[fun]
+
+        def _run():
+            try:
+                ret = self._run_provider_query(func, fun, alias, driver)
+                if ttl and ret:
+                    with _QUERY_LOCK:
+                        _QUERY_CACHE[key] = (time.time(), ret)
+                return ret
+            finally:
+                with _QUERY_LOCK:
+                    _QUERY_INFLIGHT.pop(key, None)
+
+        with _QUERY_LOCK:
+            if key in _QUERY_INFLIGHT:
+                log.debug('Waiting for the running %s query of %s', fun, alias)
+                return _QUERY_INFLIGHT[key]
+            if ttl and key in _QUERY_CACHE:
+                stamp, ret = _QUERY_CACHE[key]
+                if time.time() - stamp < ttl:
+                    log.debug('Using the cached %s query of %s', fun, alias)
+                    future = concurrent.futures.Future()
+                    future.set_result(ret)
+                    return future
+                del _QUERY_CACHE[key]
+            future = pool.submit(_run)
+            _QUERY_INFLIGHT[key] = future
+        return future
+
+    def _run_provider_query(self, func, fun, alias, driver):
+        '''
+        Run a query against a provider, from one of the query pool threads
+        '''
+        with self.__driver_locks_lock:
+            lock = self.__driver_locks.setdefault(driver, threading.Lock())
+        with lock:
+            try:
+                with salt.utils.context.func_globals_inject(
+                    func,
+                    __active_provider_name__=':'.join([alias, driver])
+                ):
+                    return salt.utils.data.simple_types_filter(func())
+            except Exception as err:
+                log.debug(
+                    'Failed to execute \'%s()\' while querying for running '
+                    'nodes: %s', fun, err, exc_info_on_loglevel=logging.DEBUG
+                )
+                # Failed to communicate with the provider, don't list any
+                # nodes
+                return ()
+
     def get_running_by_names(self, names, query='list_nodes', cached=False,
                              profile=None):
         if isinstance(names, six.string_types):
@@ -968,6 +1085,7 @@ class Cloud(object):
             for driver, vms in six.iteritems(drivers):
                 for name in vms:
                     if name in names:
+                        forget_provider_queries(alias, driver)
                         vms_to_destroy.add((alias, driver, name))
                         if self.opts['parallel']:
                             parallel_data.append({
@@ -1029,6 +1147,11 @@ class Cloud(object):
                 if name in names:
                     names.remove(name)
 
+        # Queries started while the VMs were being destroyed may have cached
+        # them as still running
+        for alias, driver in set((alias, driver) for alias, driver, _ in vms_to_destroy):
+            forget_provider_queries(alias, driver)
+
         # now the processed data structure contains the output from either
         # the parallel or non-parallel destroy and we should finish up
         # with removing minion keys if necessary
@@ -1254,11 +1377,17 @@ class Cloud(object):
         try:
             alias, driver = vm_['provider'].split(':')
             func = '{0}.create'.format(driver)
-            with salt.utils.context.func_globals_inject(
-                self.clouds[fun],
-                __active_provider_name__=':'.join([alias, driver])
-            ):
-                output = self.clouds[func](vm_)
+            # Drop the provider's cached queries both before and after the VM
+            # is created, so that no query started meanwhile is kept either
+            forget_provider_queries(alias, driver)
+            try:
+                with salt.utils.context.func_globals_inject(
+                    self.clouds[fun],
+                    __active_provider_name__=':'.join([alias, driver])
+                ):
+                    output = self.clouds[func](vm_)
+            finally:
+                forget_provider_queries(alias, driver)
             if output is not False and 'sync_after_install' in self.opts:
                 if self.opts['sync_after_install'] not in (
                         'all', 'modules', 'states', 'grains'):
@@ -2262,8 +2391,15 @@ class Map(Cloud):
             else:
                 pool_size = len(parallel_data)
             log.info('Cloud pool size: %s', pool_size)
+            # Limit the number of VMs in each stage of their creation across
+            # all of the pool's processes
+            pool = multiprocessing.Pool(
+                pool_size,
+                salt.utils.cloud.init_create_stages,
+                (salt.utils.cloud.create_stage_limits(self.opts),)
+            )
             output_multip = enter_mainloop(
-                _create_multiprocessing, parallel_data, pool_size=pool_size)
+                _create_multiprocessing, parallel_data, pool=pool)
             # We have deployed in parallel, now do start action in
             # correct order based on dependencies.
             if self.opts['start_action']:
@@ -2290,17 +2426,11 @@ class Map(Cloud):
                 for obj in output_multip:
                     output.update(obj)
 
+        # VMs may have been created or destroyed by other processes
+        forget_provider_queries()
         return output
 
 
-def init_pool_worker():
-    '''
-    Make every worker ignore KeyboarInterrup's since it will be handled by the
-    parent process.
-    '''
-    signal.signal(signal.SIGINT, signal.SIG_IGN)
-
-
 def create_multiprocessing(parallel_data, queue=None):
     '''
     This function will be called from another process when running a map in
@@ -2396,10 +2526,6 @@ def run_parallel_map_providers_query(data, queue=None):
 
 
 # for pickle and multiprocessing, we can't use directly decorators
-def _run_parallel_map_providers_query(*args, **kw):
-    return communicator(run_parallel_map_providers_query)(*args[0], **kw)
-
-
 def _destroy_multiprocessing(*args, **kw):
     return communicator(destroy_multiprocessing)(*args[0], **kw)
 
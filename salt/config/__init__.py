@@ -400,6 +400,14 @@ VALID_OPTS = immutabletypes.freeze({
     # The TCP port for mworkers to connect to on the master
     'tcp_master_workers': int,
 
+    # Resolve grain and pillar targets using the minion data cache, so that the
+    # TCP transport only publishes jobs to the targeted minions
+    'tcp_pub_cache_targeting': bool,
+
+    # The maximum number of bytes of publications waiting to be sent to a minion
+    # connected to the TCP transport before it is disconnected
+    'tcp_pub_queue_max_bytes': int,
+
     # The file to send logging data to
     'log_file': six.string_types,
 
@@ -554,6 +562,18 @@ VALID_OPTS = immutabletypes.freeze({
     # returner specified by 'event_return'
     'event_return_queue': int,
 
+    # The maximum number of seconds an event can be queued before the queue is
+    # pushed to the event returner, regardless of event_return_queue
+    'event_return_queue_max_seconds': int,
+
+    # Spool events which could not be stored by an event returner to disk, and
+    # replay them once the returner is working again
+    'event_return_spool': bool,
+
+    # The maximum number of batches of events to keep in the spool of each event
+    # returner
+    'event_return_spool_max_batches': int,
+
     # Only forward events to an event returner if it matches one of the tags in this list
     'event_return_whitelist': list,
 
@@ -691,6 +711,8 @@ VALID_OPTS = immutabletypes.freeze({
     'git_pillar_refspecs': list,
     'git_pillar_includes': bool,
     'git_pillar_verify_config': bool,
+    # Number of git_pillar remotes to fetch at the same time
+    'git_pillar_fetch_concurrency': int,
     # NOTE: gitfs_base, gitfs_mountpoint, and gitfs_root omitted here because
     # their values could conceivably be loaded as non-string types, which is OK
     # because gitfs will normalize them to strings. But rather than include all
@@ -710,6 +732,11 @@ VALID_OPTS = immutabletypes.freeze({
     'gitfs_ref_types': list,
     'gitfs_refspecs': list,
     'gitfs_disable_saltenv_mapping': bool,
+    # Serve gitfs files straight from the git object database using an
+    # in-memory index of each environment's tree
+    'gitfs_memory_index': bool,
+    # Number of gitfs remotes to fetch at the same time
+    'gitfs_fetch_concurrency': int,
     'hgfs_remotes': list,
     'hgfs_mountpoint': six.string_types,
     'hgfs_root': six.string_types,
@@ -772,6 +799,10 @@ VALID_OPTS = immutabletypes.freeze({
     # is set to 'same'
     'env_order': list,
 
+    # The number of top file match results to cache in memory. 0 disables the
+    # cache.
+    'top_match_cache_size': int,
+
     # The salt environment which provides the default top file when
     # top_file_merging_strategy is set to 'same'; defaults to 'base'
     'default_top': six.string_types,
@@ -868,12 +899,23 @@ VALID_OPTS = immutabletypes.freeze({
     # The TTL for the cache of the reactor configuration
     'reactor_refresh_interval': int,
 
-    # The number of workers for the runner/wheel in the reactor
-    'reactor_worker_threads': int,
+    # The number of workers for the runner/wheel in the reactor, either for
+    # each of them or as a dict of counts by reaction type
+    'reactor_worker_threads': (int, dict),
 
     # The queue size for workers in the reactor
     'reactor_worker_hwm': int,
 
+    # The number of compiled reactor templates kept in memory
+    'reactor_template_cache_size': int,
+
+    # The maximum rate of the reactions to events matching each tag
+    'reactor_rate_limit': dict,
+
+    # Identical events received within this many seconds are only reacted to
+    # once
+    'reactor_dedup_window': int,
+
     # Defines engines. See https://docs.saltstack.com/en/latest/topics/engines/
     'engines': list,
 
@@ -939,6 +981,16 @@ VALID_OPTS = immutabletypes.freeze({
     # The number of minutes between the minion refreshing its cache of grains
     'grains_refresh_every': int,
 
+    # Run the grain functions which do not depend on other grains in parallel
+    'grains_parallel': bool,
+
+    # The number of seconds to wait for grain functions run in parallel
+    'grains_parallel_timeout': int,
+
+    # Only rerun the grain functions whose results have expired when the grains
+    # are refreshed
+    'grains_refresh_incremental': bool,
+
     # Use lspci to gather system data for grains on a minion
     'enable_lspci': bool,
 
@@ -1010,6 +1062,17 @@ VALID_OPTS = immutabletypes.freeze({
     # The length that the syndic event queue must hit before events are popped off and forwarded
     'syndic_jid_forward_cache_hwm': int,
 
+    # The number of job returns after which a syndic forwards the returns to its
+    # master without waiting for syndic_event_forward_timeout
+    'syndic_forward_batch_size': int,
+
+    # Compress the job returns forwarded by a syndic using this method (zlib or lz4)
+    'syndic_forward_compression': (type(None), six.string_types),
+
+    # The interval in seconds at which a syndic sends the IDs of its minions to
+    # its master, which are used to resolve the minions expected to return
+    'syndic_summary_interval': int,
+
     # Salt SSH configuration
     'ssh_passwd': six.string_types,
     'ssh_port': six.string_types,
@@ -1019,10 +1082,18 @@ VALID_OPTS = immutabletypes.freeze({
     'ssh_user': six.string_types,
     'ssh_scan_ports': six.string_types,
     'ssh_scan_timeout': float,
+    'ssh_scan_concurrency': int,
     'ssh_identities_only': bool,
     'ssh_log_file': six.string_types,
     'ssh_config_file': six.string_types,
     'ssh_merge_pillar': bool,
+    'ssh_async': bool,
+    'ssh_max_sessions': int,
+    'ssh_control_persist': (six.string_types, int),
+    'ssh_thin_layers': bool,
+    'ssh_state_cache_ttl': int,
+    'ssh_state_cache_grains': list,
+    'roster_cache_ttl': int,
 
     'cluster_mode': bool,
     'sqlite_queue_dir': six.string_types,
@@ -1039,6 +1110,17 @@ VALID_OPTS = immutabletypes.freeze({
     # implications in large setups.
     'max_minions': int,
 
+    # The maximum number of minion authentication requests per second the master
+    # will handle. Minions are asked to retry later when it is exceeded.
+    'auth_rate_limit': float,
+
+    # The number of authentication requests which can be handled in a burst
+    'auth_rate_burst': int,
+
+    # The number of parsed minion public keys, and of AES keys encrypted for the
+    # minions, to cache in each worker
+    'auth_key_cache_size': int,
+
 
     'username': (type(None), six.string_types),
     'password': (type(None), six.string_types),
@@ -1076,6 +1158,17 @@ VALID_OPTS = immutabletypes.freeze({
     # Delay in seconds before executing bootstrap (Salt Cloud)
     'bootstrap_delay': int,
 
+    # The number of threads used to query the cloud providers (Salt Cloud)
+    'cloud_query_workers': int,
+
+    # The number of seconds the results of cloud provider queries are cached
+    # for, 0 disables the cache (Salt Cloud)
+    'cloud_query_cache_ttl': int,
+
+    # The maximum number of VMs which may be in each stage of their creation
+    # at the same time when running a map in parallel (Salt Cloud)
+    'cloud_stage_limits': dict,
+
     # If a proxymodule has a function called 'grains', then call it during
     # regular grains loading and merge the results with the proxy's grains
     # dictionary.  Otherwise it is assumed that the module calls the grains
@@ -1293,6 +1386,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
                  salt.syspaths.SPM_FORMULA_PATH]
     },
     'top_file_merging_strategy': 'merge',
+    'top_match_cache_size': 0,
     'env_order': [],
     'default_top': 'base',
     'fileserver_limit_traversal': False,
@@ -1336,6 +1430,7 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'git_pillar_passphrase': '',
     'git_pillar_refspecs': _DFLT_REFSPECS,
     'git_pillar_includes': True,
+    'git_pillar_fetch_concurrency': 1,
     'gitfs_remotes': [],
     'gitfs_mountpoint': '',
     'gitfs_root': '',
@@ -1356,6 +1451,8 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'gitfs_ref_types': ['branch', 'tag', 'sha'],
     'gitfs_refspecs': _DFLT_REFSPECS,
     'gitfs_disable_saltenv_mapping': False,
+    'gitfs_memory_index': False,
+    'gitfs_fetch_concurrency': 1,
     'unique_jid': False,
     'hash_type': 'sha256',
     'optimization_order': [0, 1, 2],
@@ -1459,6 +1556,9 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'reactor_refresh_interval': 60,
     'reactor_worker_threads': 10,
     'reactor_worker_hwm': 10000,
+    'reactor_template_cache_size': 100,
+    'reactor_rate_limit': {},
+    'reactor_dedup_window': 0,
     'engines': [],
     'tcp_keepalive': True,
     'tcp_keepalive_idle': 300,
@@ -1466,6 +1566,9 @@ DEFAULT_MINION_OPTS = immutabletypes.freeze({
     'tcp_keepalive_intvl': -1,
     'modules_max_memory': -1,
     'grains_refresh_every': 0,
+    'grains_parallel': False,
+    'grains_parallel_timeout': 30,
+    'grains_refresh_incremental': False,
     'minion_id_caching': True,
     'minion_id_lowercase': False,
     'minion_id_remove_domain': False,
@@ -1561,6 +1664,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
         'base': [salt.syspaths.BASE_THORIUM_ROOTS_DIR],
         },
     'top_file_merging_strategy': 'merge',
+    'top_match_cache_size': 0,
     'env_order': [],
     'saltenv': None,
     'lock_saltenv': False,
@@ -1592,6 +1696,7 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'git_pillar_passphrase': '',
     'git_pillar_refspecs': _DFLT_REFSPECS,
     'git_pillar_includes': True,
+    'git_pillar_fetch_concurrency': 1,
     'git_pillar_verify_config': True,
     'gitfs_remotes': [],
     'gitfs_mountpoint': '',
@@ -1613,6 +1718,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'gitfs_ref_types': ['branch', 'tag', 'sha'],
     'gitfs_refspecs': _DFLT_REFSPECS,
     'gitfs_disable_saltenv_mapping': False,
+    'gitfs_memory_index': False,
+    'gitfs_fetch_concurrency': 1,
     'hgfs_remotes': [],
     'hgfs_mountpoint': '',
     'hgfs_root': '',
@@ -1717,6 +1824,8 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'tcp_master_pull_port': 4513,
     'tcp_master_publish_pull': 4514,
     'tcp_master_workers': 4515,
+    'tcp_pub_cache_targeting': False,
+    'tcp_pub_queue_max_bytes': 0,
     'log_file': os.path.join(salt.syspaths.LOGS_DIR, 'master'),
     'log_level': 'warning',
     'log_level_logfile': None,
@@ -1735,9 +1844,15 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'reactor_refresh_interval': 60,
     'reactor_worker_threads': 10,
     'reactor_worker_hwm': 10000,
+    'reactor_template_cache_size': 100,
+    'reactor_rate_limit': {},
+    'reactor_dedup_window': 0,
     'engines': [],
     'event_return': '',
     'event_return_queue': 0,
+    'event_return_queue_max_seconds': 0,
+    'event_return_spool': False,
+    'event_return_spool_max_batches': 1000,
     'event_return_whitelist': [],
     'event_return_blacklist': [],
     'event_match_type': 'startswith',
@@ -1793,6 +1908,9 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'gather_job_timeout': 10,
     'syndic_event_forward_timeout': 0.5,
     'syndic_jid_forward_cache_hwm': 100,
+    'syndic_forward_batch_size': 0,
+    'syndic_forward_compression': None,
+    'syndic_summary_interval': 0,
     'regen_thin': False,
     'ssh_passwd': '',
     'ssh_priv_passwd': '',
@@ -1803,14 +1921,25 @@ DEFAULT_MASTER_OPTS = immutabletypes.freeze({
     'ssh_user': 'root',
     'ssh_scan_ports': '22',
     'ssh_scan_timeout': 0.01,
+    'ssh_scan_concurrency': 100,
     'ssh_identities_only': False,
     'ssh_log_file': os.path.join(salt.syspaths.LOGS_DIR, 'ssh'),
     'ssh_config_file': os.path.join(salt.syspaths.HOME_DIR, '.ssh', 'config'),
+    'ssh_async': False,
+    'ssh_max_sessions': 250,
+    'ssh_control_persist': '',
+    'ssh_thin_layers': False,
+    'ssh_state_cache_ttl': 0,
+    'ssh_state_cache_grains': None,
+    'roster_cache_ttl': 0,
     'cluster_mode': False,
     'sqlite_queue_dir': os.path.join(salt.syspaths.CACHE_DIR, 'master', 'queues'),
     'queue_dirs': [],
     'cli_summary': False,
     'max_minions': 0,
+    'auth_rate_limit': 0,
+    'auth_rate_burst': 0,
+    'auth_key_cache_size': 1024,
     'master_sign_key_name': 'master_sign',
     'master_sign_pubkey': False,
     'master_pubkey_signature': 'master_pubkey_signature',
@@ -1910,6 +2039,9 @@ DEFAULT_CLOUD_OPTS = immutabletypes.freeze({
     'log_rotate_backup_count': 0,
     'bootstrap_delay': None,
     'cache': 'localfs',
+    'cloud_query_workers': 10,
+    'cloud_query_cache_ttl': 0,
+    'cloud_stage_limits': {},
 })
 
 DEFAULT_API_OPTS = immutabletypes.freeze({
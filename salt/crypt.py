@@ -62,6 +62,7 @@ import salt.defaults.exitcodes
 import salt.payload
 import salt.transport.client
 import salt.transport.frame
+import salt.utils.cache
 import salt.utils.crypt
 import salt.utils.decorators
 import salt.utils.event
@@ -201,10 +202,28 @@ def get_rsa_key(path, passphrase):
     return _get_key_with_evict(path, six.text_type(os.path.getmtime(path)), passphrase)
 
 
+# Parsed public keys, keyed on the path, inode, modification and change times
+# and size of the key file, so that a key is read again if the file is changed
+# or replaced, even when the new file has the same size and modification time
+PUB_KEY_CACHE = salt.utils.cache.LRUCache(1024)
+
+
 def get_rsa_pub_key(path):
     '''
-    Read a public key off the disk.
+    Read a public key off the disk. The parsed keys are cached, and a key is
+    only read from disk again when its file is modified.
     '''
+    try:
+        key_stat = os.stat(path)
+        cache_key = (path, key_stat.st_ino, key_stat.st_mtime,
+                     key_stat.st_ctime, key_stat.st_size)
+    except OSError:
+        # Let the read below raise the error
+        cache_key = None
+    else:
+        key = PUB_KEY_CACHE.get(cache_key)
+        if key is not None:
+            return key
     log.debug('salt.crypt.get_rsa_pub_key: Loading public key')
     if HAS_M2:
         with salt.utils.files.fopen(path, 'rb') as f:
@@ -214,6 +233,8 @@ def get_rsa_pub_key(path):
     else:
         with salt.utils.files.fopen(path) as f:
             key = RSA.importKey(f.read())
+    if cache_key is not None:
+        PUB_KEY_CACHE.set(cache_key, key)
     return key
 
 
@@ -500,6 +521,8 @@ class AsyncAuth(object):
         self.serial = salt.payload.Serial(self.opts)
         self.pub_path = os.path.join(self.opts['pki_dir'], 'minion.pub')
         self.rsa_path = os.path.join(self.opts['pki_dir'], 'minion.pem')
+        # The number of seconds the master asked us to wait before retrying
+        self._retry_after = None
         if self.opts['__role'] == 'syndic':
             self.mpub = 'syndic_master.pub'
         else:
@@ -610,6 +633,14 @@ class AsyncAuth(object):
                     if self.opts.get('detect_mode') is True:
                         error = SaltClientError('Detect mode is on')
                         break
+                    if self._retry_after:
+                        log.info(
+                            'Waiting %s seconds before retry, as requested by '
+                            'the master.', self._retry_after
+                        )
+                        yield tornado.gen.sleep(self._retry_after)
+                        self._retry_after = None
+                        continue
                     if self.opts.get('caller'):
                         # We have a list of masters, so we should break
                         # and try the next one in the list.
@@ -749,6 +780,15 @@ class AsyncAuth(object):
                 # has the master returned that its maxed out with minions?
                 elif payload['load']['ret'] == 'full':
                     raise tornado.gen.Return('full')
+                # is the master too busy to authenticate us right now?
+                elif payload['load']['ret'] == 'retry':
+                    self._retry_after = payload['load'].get('retry_after')
+                    log.info(
+                        'The Salt Master is busy authenticating other minions, '
+                        'this salt minion will wait for %s seconds before '
+                        'attempting to re-authenticate', self._retry_after
+                    )
+                    raise tornado.gen.Return('retry')
                 else:
                     log.error(
                         'The Salt Master has cached the public key for this '
@@ -1190,6 +1230,8 @@ class SAuth(AsyncAuth):
         self.serial = salt.payload.Serial(self.opts)
         self.pub_path = os.path.join(self.opts['pki_dir'], 'minion.pub')
         self.rsa_path = os.path.join(self.opts['pki_dir'], 'minion.pem')
+        # The number of seconds the master asked us to wait before retrying
+        self._retry_after = None
         if 'syndic_master' in self.opts:
             self.mpub = 'syndic_master.pub'
         elif 'alert_master' in self.opts:
@@ -1230,6 +1272,14 @@ class SAuth(AsyncAuth):
             while True:
                 creds = self.sign_in(channel=channel)
                 if creds == 'retry':
+                    if self._retry_after:
+                        log.info(
+                            'Waiting %s seconds before retry, as requested by '
+                            'the master.', self._retry_after
+                        )
+                        time.sleep(self._retry_after)
+                        self._retry_after = None
+                        continue
                     if self.opts.get('caller'):
                         # We have a list of masters, so we should break
                         # and try the next one in the list.
@@ -1331,6 +1381,15 @@ class SAuth(AsyncAuth):
                 # has the master returned that its maxed out with minions?
                 elif payload['load']['ret'] == 'full':
                     return 'full'
+                # is the master too busy to authenticate us right now?
+                elif payload['load']['ret'] == 'retry':
+                    self._retry_after = payload['load'].get('retry_after')
+                    log.info(
+                        'The Salt Master is busy authenticating other minions, '
+                        'this salt minion will wait for %s seconds before '
+                        'attempting to re-authenticate', self._retry_after
+                    )
+                    return 'retry'
                 else:
                     log.error(
                         'The Salt Master has cached the public key for this '
@@ -33,6 +33,25 @@ except ImportError:
     _DATEUTIL_TZ = False
 
 __proxyenabled__ = ['*']
+# Grain functions which may be run in parallel when grains_parallel is enabled
+__independent_grains__ = [
+    'os_data', 'hostname', 'fqdns', 'ip_fqdn', 'dns', 'default_gateway',
+    'locale_info', 'kernelparams',
+]
+# Refresh policies for the grain functions, used when grains_refresh_incremental
+# is enabled
+__grains_ttl__ = {
+    'os_data': 'event',
+    'kernelparams': 'boot',
+    'get_machine_id': 'boot',
+    'pythonversion': 'static',
+    'pythonpath': 'static',
+    'pythonexecutable': 'static',
+    'saltpath': 'static',
+    'saltversion': 'static',
+    'saltversioninfo': 'static',
+    'zmqversion': 'static',
+}
 __FQDN__ = None
 
 # Extend the default list of supported distros. This will be used for the
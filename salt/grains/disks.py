@@ -18,6 +18,7 @@ import salt.utils.platform
 # of the modules are loaded and are generally available for any usage.
 import salt.modules.cmdmod
 
+__independent_grains__ = True
 __salt__ = {
     'cmd.run': salt.modules.cmdmod._run_quiet,
     'cmd.run_all': salt.modules.cmdmod._run_all_quiet
@@ -26,6 +26,7 @@ import salt.modules.cmdmod
 import salt.utils.zfs
 
 __virtualname__ = 'zfs'
+__independent_grains__ = True
 __salt__ = {
     'cmd.run': salt.modules.cmdmod.run,
 }
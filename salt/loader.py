@@ -10,6 +10,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 import os
 import re
 import sys
+import copy
 import time
 import logging
 import inspect
@@ -666,6 +667,14 @@ def render(opts, functions, states=None, proxy=None, context=None):
     return rend
 
 
+# The time taken by each grain function the last time the grains were loaded
+GRAINS_PROFILE = {}
+
+# The results of the grain functions which declare a refresh policy, used when
+# grains_refresh_incremental is enabled
+GRAINS_TTL_CACHE = {}
+
+
 def grain_funcs(opts, proxy=None):
     '''
     Returns the grain functions
@@ -729,7 +738,150 @@ def _load_cached_grains(opts, cfn):
         return None
 
 
-def grains(opts, force_refresh=False, proxy=None):
+def _call_grain_func(key, func, **kwargs):
+    '''
+    Run a grain function, recording how long it took in GRAINS_PROFILE
+    '''
+    start = time.time()
+    try:
+        return func(**kwargs)
+    finally:
+        GRAINS_PROFILE[key] = time.time() - start
+
+
+def _is_independent_grain(key, func):
+    '''
+    Grain modules can mark functions which do not depend on the grains
+    returned by other grain functions, and which are therefore safe to run
+    alongside them, by setting ``__independent_grains__`` to either ``True``
+    (for all of the functions in the module) or a list of function names.
+    '''
+    independent = getattr(func, '__globals__', {}).get(
+        '__independent_grains__', False)
+    if independent is True:
+        return True
+    if isinstance(independent, (list, tuple)):
+        return key.split('.', 1)[-1] in independent
+    return False
+
+
+def _start_independent_grains(funcs, proxy=None, skip=()):
+    '''
+    Start each of the independent grain functions in its own thread. Returns a
+    dict mapping the function names to (thread, result) tuples, where result
+    is a dict which will contain either the return data (in the ``ret`` key) or
+    the exception info (in the ``exc_info`` key) once the thread finishes.
+    Functions whose names are in skip are not started.
+    '''
+    grain_threads = {}
+    for key in funcs:
+        if key == '_errors' or key in skip \
+                or not _is_independent_grain(key, funcs[key]):
+            continue
+        parameters = salt.utils.args.get_function_argspec(funcs[key]).args
+        if 'grains' in parameters:
+            # Depends on the grains returned by the other grain functions
+            continue
+        kwargs = {}
+        if 'proxy' in parameters:
+            kwargs['proxy'] = proxy
+        result = {}
+
+        def _target(key=key, func=funcs[key], kwargs=kwargs, result=result):
+            try:
+                result['ret'] = _call_grain_func(key, func, **kwargs)
+            except Exception:
+                result['exc_info'] = sys.exc_info()
+
+        thread = threading.Thread(target=_target, name='grains-' + key)
+        # A grain function which hangs must not prevent the process from
+        # exiting
+        thread.daemon = True
+        thread.start()
+        grain_threads[key] = (thread, result)
+    log.debug('Running %d grain functions in parallel', len(grain_threads))
+    return grain_threads
+
+
+def _join_grain_thread(key, grain_thread, deadline):
+    '''
+    Wait until the deadline for a grain function started by
+    _start_independent_grains to finish, and return its result. Exceptions
+    raised by the grain function are re-raised. If the grain function has not
+    finished by the deadline, None is returned and its grains are skipped.
+    '''
+    thread, result = grain_thread
+    thread.join(max(deadline - time.time(), 0))
+    if thread.is_alive():
+        log.warning(
+            'Grain function %s did not finish within grains_parallel_timeout, '
+            'its grains will not be available', key
+        )
+        return None
+    if 'exc_info' in result:
+        six.reraise(*result['exc_info'])
+    return result.get('ret')
+
+
+def _grain_func_ttl(key, func):
+    '''
+    Grain modules can declare how long the results of their functions remain
+    valid by setting ``__grains_ttl__``, either to a single policy for all of
+    the functions in the module or to a dict mapping function names (or ``*``)
+    to policies. A policy is one of:
+
+    - a number of seconds, after which the function is run again
+    - ``static`` or ``boot``, for results which do not change while the minion
+      is running
+    - ``event``, for results which only need to be refreshed when the grains
+      are explicitly reloaded, and not by an incremental refresh
+
+    Returns the policy for the passed function, or None if it has none.
+    '''
+    ttl = getattr(func, '__globals__', {}).get('__grains_ttl__')
+    if isinstance(ttl, dict):
+        ttl = ttl.get(key.split('.', 1)[-1], ttl.get('*'))
+    return ttl
+
+
+def _load_ttl_cached_grains(opts, funcs, incremental=False):
+    '''
+    Return a dict mapping the names of the grain functions whose cached
+    results are still valid, according to the policy set in their modules, to
+    a copy of their results.
+    '''
+    now = time.time()
+    ret = {}
+    for key in funcs:
+        if key == '_errors':
+            continue
+        cached = GRAINS_TTL_CACHE.get((opts.get('id'), key))
+        if cached is None:
+            continue
+        ttl = _grain_func_ttl(key, funcs[key])
+        if ttl in ('static', 'boot') \
+                or (ttl == 'event' and incremental) \
+                or (isinstance(ttl, (six.integer_types, float))
+                    and now - cached['time'] < ttl):
+            # Copy the results, they may be modified when merged
+            ret[key] = copy.deepcopy(cached['ret'])
+    log.debug('Reusing the cached results of %d grain functions', len(ret))
+    return ret
+
+
+def _cache_grain_func(opts, key, func, ret):
+    '''
+    Cache the result of a grain function, if its module has declared a refresh
+    policy for it
+    '''
+    if isinstance(ret, dict) and _grain_func_ttl(key, func) is not None:
+        GRAINS_TTL_CACHE[(opts.get('id'), key)] = {
+            'ret': copy.deepcopy(ret),
+            'time': time.time(),
+        }
+
+
+def grains(opts, force_refresh=False, proxy=None, incremental=False):
     '''
     Return the functions for the dynamic grains and the values for the static
     grains.
@@ -747,6 +899,13 @@ def grains(opts, force_refresh=False, proxy=None):
         __opts__ = salt.config.minion_config('/etc/salt/minion')
         __grains__ = salt.loader.grains(__opts__)
         print __grains__['id']
+
+    When ``grains_refresh_incremental`` is enabled, the grain functions whose
+    modules declare a refresh policy (see ``_grain_func_ttl``) are only run
+    again once their cached results have expired. Passing ``incremental=True``
+    also reuses the results of the functions with the ``event`` policy, and
+    skips the grains cache file. Passing ``force_refresh=True`` runs all of the
+    grain functions, whatever their policy.
     '''
     # Need to re-import salt.config, somehow it got lost when a minion is starting
     import salt.config
@@ -755,7 +914,7 @@ def grains(opts, force_refresh=False, proxy=None):
         opts['cachedir'],
         'grains.cache.p'
     )
-    if not force_refresh and opts.get('grains_cache', False):
+    if not force_refresh and not incremental and opts.get('grains_cache', False):
         cached_grains = _load_cached_grains(opts, cfn)
         if cached_grains:
             return cached_grains
@@ -793,12 +952,31 @@ def grains(opts, force_refresh=False, proxy=None):
     funcs = grain_funcs(opts, proxy=proxy)
     if force_refresh:  # if we refresh, lets reload grain modules
         funcs.clear()
+    GRAINS_PROFILE.clear()
+    if opts.get('grains_refresh_incremental', False) and not force_refresh:
+        # A forced refresh runs all of the grain functions again, since their
+        # modules may have been updated
+        cached = _load_ttl_cached_grains(opts, funcs, incremental)
+    else:
+        cached = {}
+    if opts.get('grains_parallel', False):
+        grain_threads = _start_independent_grains(funcs, proxy, skip=cached)
+    else:
+        grain_threads = {}
+    grains_deadline = time.time() + opts.get('grains_parallel_timeout', 30)
     # Run core grains
     for key in funcs:
         if not key.startswith('core.'):
             continue
         log.trace('Loading %s grain', key)
-        ret = funcs[key]()
+        if key in cached:
+            ret = cached[key]
+        else:
+            if key in grain_threads:
+                ret = _join_grain_thread(key, grain_threads[key], grains_deadline)
+            else:
+                ret = _call_grain_func(key, funcs[key])
+            _cache_grain_func(opts, key, funcs[key], ret)
         if not isinstance(ret, dict):
             continue
         if blist:
@@ -826,13 +1004,20 @@ def grains(opts, force_refresh=False, proxy=None):
             # proxymodule for retrieving information from the connected
             # device.
             log.trace('Loading %s grain', key)
-            parameters = salt.utils.args.get_function_argspec(funcs[key]).args
-            kwargs = {}
-            if 'proxy' in parameters:
-                kwargs['proxy'] = proxy
-            if 'grains' in parameters:
-                kwargs['grains'] = grains_data
-            ret = funcs[key](**kwargs)
+            if key in cached:
+                ret = cached[key]
+            else:
+                if key in grain_threads:
+                    ret = _join_grain_thread(key, grain_threads[key], grains_deadline)
+                else:
+                    parameters = salt.utils.args.get_function_argspec(funcs[key]).args
+                    kwargs = {}
+                    if 'proxy' in parameters:
+                        kwargs['proxy'] = proxy
+                    if 'grains' in parameters:
+                        kwargs['grains'] = grains_data
+                    ret = _call_grain_func(key, funcs[key], **kwargs)
+                _cache_grain_func(opts, key, funcs[key], ret)
         except Exception:
             if salt.utils.platform.is_proxy():
                 log.info('The following CRITICAL message may not be an error; the proxy may not be completely established yet.')
@@ -51,6 +51,7 @@ import salt.transport.server
 import salt.log.setup
 import salt.utils.args
 import salt.utils.atomicfile
+import salt.utils.compression
 import salt.utils.crypt
 import salt.utils.event
 import salt.utils.files
@@ -1641,7 +1642,18 @@ class AESFuncs(object):
 
         :param dict load: The minion payload
         '''
-        loads = load.get('load')
+        if 'compression' in load:
+            try:
+                loads = self.serial.loads(
+                    salt.utils.compression.decompress(
+                        load['load_compressed'], load['compression']
+                    )
+                )
+            except Exception as exc:
+                log.error('Unable to decompress syndic returns: %s', exc)
+                return
+        else:
+            loads = load.get('load')
         if not isinstance(loads, list):
             loads = [load]  # support old syndics not aggregating returns
         for load in loads:
@@ -1679,6 +1691,37 @@ class AESFuncs(object):
                     ret['sig'] = load['sig']
                 self._return(ret)
 
+    def _syndic_summary(self, load):
+        '''
+        Receive the IDs of the minions below a syndic, which are used to
+        resolve the minions expected to return from a job
+
+        :param dict load: The syndic payload
+        '''
+        load = self.__verify_load(load, ('id', 'tok'))
+        if load is False:
+            return False
+        if 'compression' in load:
+            try:
+                minions = self.serial.loads(
+                    salt.utils.compression.decompress(
+                        load['minions_compressed'], load['compression']
+                    )
+                )
+            except Exception as exc:
+                log.error('Unable to decompress syndic summary: %s', exc)
+                return False
+        else:
+            minions = load.get('minions')
+        if not isinstance(minions, list):
+            return False
+        syndic_cache_path = os.path.join(self.opts['syndic_dir'], load['id'])
+        if not os.path.isdir(self.opts['syndic_dir']):
+            os.makedirs(self.opts['syndic_dir'])
+        with salt.utils.atomicfile.atomic_open(syndic_cache_path, mode='wb') as wfh:
+            self.serial.dump({'minions': minions, 'time': time.time()}, wfh)
+        return True
+
     def minion_runner(self, clear_load):
         '''
         Execute a runner from a minion, return the runner's function data
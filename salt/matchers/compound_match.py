@@ -18,6 +18,10 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The matchers loader for the most recently used opts. This avoids creating a
+# new loader every time a compound target is evaluated.
+_MATCHERS = {}
+
 
 def match(tgt, opts=None):
     '''
@@ -26,7 +30,10 @@ def match(tgt, opts=None):
     if not opts:
         opts = __opts__
     nodegroups = opts.get('nodegroups', {})
-    matchers = salt.loader.matchers(opts)
+    cached_opts, matchers = _MATCHERS.get('last', (None, None))
+    if cached_opts is not opts:
+        matchers = salt.loader.matchers(opts)
+        _MATCHERS['last'] = (opts, matchers)
 
     if not isinstance(tgt, six.string_types) and not isinstance(tgt, (list, tuple)):
         log.error('Compound target received that is neither string, list nor tuple')
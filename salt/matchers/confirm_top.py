@@ -11,6 +11,10 @@ import salt.loader
 
 log = logging.getLogger(__file__)
 
+# The matchers loader for the most recently used opts. This avoids creating a
+# new loader for every target in the top file.
+_MATCHERS = {}
+
 
 def confirm_top(match, data, nodegroups=None):
     '''
@@ -27,7 +31,10 @@ def confirm_top(match, data, nodegroups=None):
             if 'match' in item:
                 matcher = item['match']
 
-    matchers = salt.loader.matchers(__opts__)
+    cached_opts, matchers = _MATCHERS.get('last', (None, None))
+    if cached_opts is not __opts__:
+        matchers = salt.loader.matchers(__opts__)
+        _MATCHERS['last'] = (__opts__, matchers)
     funcname = matcher + '_match.match'
     if matcher == 'nodegroup':
         return matchers[funcname](match, nodegroups)
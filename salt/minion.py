@@ -74,6 +74,7 @@ import salt.payload
 import salt.pillar
 import salt.syspaths
 import salt.utils.args
+import salt.utils.compression
 import salt.utils.context
 import salt.utils.data
 import salt.utils.error
@@ -2118,6 +2119,15 @@ class Minion(MinionBase):
 
         load = {'cmd': ret_cmd,
                 'load': list(six.itervalues(jids))}
+        if ret_cmd == '_syndic_return' and self.opts.get('syndic_forward_compression'):
+            # The returns for large jobs are highly redundant, compress them
+            method, compressed = salt.utils.compression.compress(
+                salt.payload.Serial(self.opts).dumps(load['load']),
+                self.opts['syndic_forward_compression']
+            )
+            load = {'cmd': ret_cmd,
+                    'compression': method,
+                    'load_compressed': compressed}
 
         def timeout_handler(*_):
             log.warning(
@@ -2439,6 +2449,21 @@ class Minion(MinionBase):
         '''
         Handle a grains_refresh event
         '''
+        if (self.opts.get('grains_refresh_incremental', False) and
+                not data.get('force_refresh', False)):
+            # Only the grains which have expired are recomputed here, the full
+            # refresh below is only done if any of the grains have changed
+            self.opts['grains'] = salt.loader.grains(
+                self.opts,
+                proxy=getattr(self, 'proxy', None),
+                incremental=True
+            )
+            changed = [
+                key for key in set(self.grains_cache) | set(self.opts['grains'])
+                if self.grains_cache.get(key) != self.opts['grains'].get(key)
+            ]
+            if changed:
+                log.debug('Grains changed: %s', ', '.join(sorted(changed)))
         if (data.get('force_refresh', False) or
                 self.grains_cache != self.opts['grains']):
             self.pillar_refresh(force_refresh=True)
@@ -2965,6 +2990,17 @@ class Syndic(Minion):
         self.jids = {}
         self.raw_events = []
         self.pub_future = None
+        self._ckminions = None
+
+    @property
+    def ckminions(self):
+        '''
+        The CkMinions of the master running next to this syndic. The syndic's
+        own pki_dir is the one of its minion side, which holds no minion keys.
+        '''
+        if self._ckminions is None:
+            self._ckminions = salt.utils.minions.CkMinions(self.local.opts)
+        return self._ckminions
 
     def _handle_decoded_payload(self, data):
         '''
@@ -2993,6 +3029,21 @@ class Syndic(Minion):
             if field in data:
                 kwargs[field] = data[field]
 
+        if self.opts.get('syndic_summary_interval') and \
+                data['tgt_type'] in ('glob', 'pcre', 'list'):
+            # Don't publish jobs which none of our minions can match
+            minions = self.ckminions.check_minions(data['tgt'], data['tgt_type'])['minions']
+            if not minions and self.local.opts.get('order_masters'):
+                # The minions below the syndics of our master, None if they
+                # are not known
+                minions = self.ckminions.check_syndic_minions(data['tgt'], data['tgt_type'])
+            if minions is not None and not minions:
+                log.debug(
+                    'No minions match target %s for job %s, not forwarding '
+                    'the publish', data['tgt'], data['jid']
+                )
+                return
+
         def timeout_handler(*args):
             log.warning('Unable to forward pub data: %s', args[1])
             return True
@@ -3009,6 +3060,29 @@ class Syndic(Minion):
                                  callback=lambda _: None,
                                  **kwargs)
 
+    def send_summary(self, minions, timeout=60):
+        '''
+        Send the IDs of the minions below this syndic to the master
+        '''
+        load = {'id': self.opts['id'],
+                'cmd': '_syndic_summary',
+                'tok': self.tok}
+        if self.opts.get('syndic_forward_compression'):
+            load['compression'], load['minions_compressed'] = \
+                salt.utils.compression.compress(
+                    salt.payload.Serial(self.opts).dumps(minions),
+                    self.opts['syndic_forward_compression']
+                )
+        else:
+            load['minions'] = minions
+
+        def timeout_handler(*_):
+            log.info('Unable to send the syndic summary to %s', self.opts['master'])
+            return True
+
+        with tornado.stack_context.ExceptionStackContext(timeout_handler):
+            self._send_req_async(load, timeout, callback=lambda f: None)  # pylint: disable=unexpected-keyword-arg
+
     def fire_master_syndic_start(self):
         # Send an event to the master that the minion is live
         if self.opts['enable_legacy_startup_events']:
@@ -3138,6 +3212,8 @@ class SyndicManager(MinionBase):
         self.delayed = []
         # Active pub futures: {master_id: (future, [job_ret, ...]), ...}
         self.pub_futures = {}
+        # The number of job returns received since the last forward
+        self._pending_rets = 0
 
     def _spawn_syndics(self):
         '''
@@ -3187,6 +3263,9 @@ class SyndicManager(MinionBase):
                 # Send an event to the master that the minion is live
                 syndic.fire_master_syndic_start()
 
+                if opts.get('syndic_summary_interval'):
+                    syndic.send_summary(syndic.ckminions.summary_minions())
+
                 log.info(
                     'Syndic successfully connected to %s',
                     opts['master']
@@ -3346,6 +3425,14 @@ class SyndicManager(MinionBase):
                                                               )
         self.forward_events.start()
 
+        # send the IDs of our minions every syndic_summary_interval
+        if self.opts.get('syndic_summary_interval'):
+            self.send_summaries = tornado.ioloop.PeriodicCallback(
+                self._send_summary,
+                self.opts['syndic_summary_interval'] * 1000,
+            )
+            self.send_summaries.start()
+
         # Make sure to gracefully handle SIGUSR1
         enable_sigusr1_handler()
 
@@ -3394,6 +3481,12 @@ class SyndicManager(MinionBase):
                 if key in data:
                     ret[key] = data[key]
             jdict[data['id']] = ret
+            self._pending_rets += 1
+            batch_size = self.opts.get('syndic_forward_batch_size', 0)
+            if batch_size and self._pending_rets >= batch_size:
+                # Forward the returns now rather than waiting for the next
+                # syndic_event_forward_timeout
+                self._forward_events()
         else:
             # TODO: config to forward these? If so we'll have to keep track of who
             # has seen them
@@ -3403,8 +3496,20 @@ class SyndicManager(MinionBase):
                 if 'retcode' not in data:
                     self.raw_events.append({'data': data, 'tag': mtag})
 
+    def _send_summary(self):
+        '''
+        Send the IDs of the minions accepted by the local master to the
+        masters of this syndic
+        '''
+        minions = salt.utils.minions.CkMinions(self.local.opts).summary_minions()
+        self._call_syndic('send_summary',
+                          args=(minions,),
+                          kwargs={'timeout': self._return_retry_timer()},
+                          )
+
     def _forward_events(self):
         log.trace('Forwarding events')  # pylint: disable=no-member
+        self._pending_rets = 0
         if self.raw_events:
             events = self.raw_events
             self.raw_events = []
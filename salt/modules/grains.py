@@ -22,10 +22,12 @@ from functools import reduce  # pylint: disable=redefined-builtin
 
 # Import Salt libs
 from salt.ext import six
+import salt.loader
 import salt.utils.compat
 import salt.utils.data
 import salt.utils.files
 import salt.utils.json
+import salt.utils.odict
 import salt.utils.platform
 import salt.utils.yaml
 from salt.defaults import DEFAULT_TARGET_DELIM
@@ -805,5 +807,36 @@ def equals(key, value):
     return six.text_type(value) == six.text_type(get(key))
 
 
+def profile(refresh=False):
+    '''
+    .. versionadded:: Neon
+
+    Return the time (in seconds) taken by each grain function the last time
+    the grains were loaded, ordered from the slowest function to the fastest.
+
+    refresh : False
+        Load the grains again to collect fresh timings. This does not change
+        the grains of the running minion.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt '*' grains.profile
+        salt '*' grains.profile refresh=True
+    '''
+    if salt.utils.data.is_true(refresh) or not salt.loader.GRAINS_PROFILE:
+        # Pass a copy of the opts, since loading the grains replaces the
+        # grains in the opts with the ones from the minion config file.
+        salt.loader.grains(dict(__opts__), force_refresh=True)
+    return salt.utils.odict.OrderedDict(
+        (key, round(elapsed, 4)) for key, elapsed in sorted(
+            six.iteritems(salt.loader.GRAINS_PROFILE),
+            key=operator.itemgetter(1),
+            reverse=True
+        )
+    )
+
+
 # Provide a jinja function call compatible get aliased as fetch
 fetch = get
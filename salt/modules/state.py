@@ -2128,12 +2128,20 @@ def pkg(pkg_path,
         pkg_sum,
         hash_type,
         test=None,
+        roster_grains_path=None,
         **kwargs):
     '''
     Execute a packaged state run, the packaged state run will exist in a
     tarball available locally. This packaged state
     can be generated using salt-ssh.
 
+    roster_grains_path
+        The path to a JSON file containing the grains to run the state with,
+        used when the tarball does not contain them because it is shared by
+        several targets.
+
+        .. versionadded:: Neon
+
     CLI Example:
 
     .. code-block:: bash
@@ -2172,6 +2180,8 @@ def pkg(pkg_path,
         pillar_override = None
 
     roster_grains_json = os.path.join(root, 'roster_grains.json')
+    if not os.path.isfile(roster_grains_json) and roster_grains_path:
+        roster_grains_json = roster_grains_path
     if os.path.isfile(roster_grains_json):
         with salt.utils.files.fopen(roster_grains_json, 'r') as fp_:
             roster_grains = salt.utils.json.load(fp_)
@@ -32,6 +32,8 @@ add the following to the Salt master config file.
         disable_ssl: False
         webhook_disable_auth: False
         cors_origin: null
+        # number of job returns buffered for each client of /stream
+        stream_queue_size: 1000
 
 .. _rest_tornado-auth:
 
@@ -189,8 +191,11 @@ a return like::
 from __future__ import absolute_import, print_function, unicode_literals
 import time
 import fnmatch
+import heapq
+import itertools
 import logging
 from copy import copy
+from datetime import timedelta
 from collections import defaultdict
 
 # pylint: disable=import-error
@@ -200,6 +205,8 @@ import tornado.httpserver
 import tornado.ioloop
 import tornado.web
 import tornado.gen
+import tornado.iostream
+import tornado.queues
 from tornado.concurrent import Future
 # pylint: enable=import-error
 
@@ -210,6 +217,7 @@ import salt.utils.args
 import salt.utils.event
 import salt.utils.json
 import salt.utils.minions
+import salt.utils.stringutils
 import salt.utils.yaml
 import salt.utils.zeromq
 from salt.utils.event import tagify
@@ -269,6 +277,94 @@ class Any(Future):
             self.set_result(future)
 
 
+class EventQueue(tornado.queues.Queue):
+    '''
+    Queue of the events matching a subscription. Events which arrive while the
+    queue is full are dropped, and their tags are kept in ``dropped``.
+    '''
+    def __init__(self, maxsize=0):
+        super(EventQueue, self).__init__(maxsize=maxsize)
+        self.dropped = []
+
+    def put_event(self, event):
+        try:
+            self.put_nowait(event)
+        except tornado.queues.QueueFull:
+            self.dropped.append(event['tag'])
+
+
+class TagIndex(object):
+    '''
+    Index of the (tag, matcher) pairs which events are waited for, used to find
+    the pairs matching an event tag without running the matcher of every pair.
+    Exact tags are looked up in a set and prefix tags in a trie, only pairs
+    using other matchers are checked one by one.
+    '''
+    def __init__(self):
+        self.exact = set()
+        # char -> node, the None key of a node holds the pair ending there
+        self.trie = {}
+        self.other = set()
+
+    def add(self, tag, matcher):
+        if matcher is EventListener.exact_matcher:
+            self.exact.add(tag)
+        elif matcher is EventListener.prefix_matcher:
+            node = self.trie
+            for char in tag:
+                node = node.setdefault(char, {})
+            node[None] = (tag, matcher)
+        else:
+            self.other.add((tag, matcher))
+
+    def remove(self, tag, matcher):
+        if matcher is EventListener.exact_matcher:
+            self.exact.discard(tag)
+        elif matcher is EventListener.prefix_matcher:
+            path = []
+            node = self.trie
+            for char in tag:
+                path.append((node, char))
+                node = node.get(char)
+                if node is None:
+                    return
+            node.pop(None, None)
+            # prune the nodes which no longer lead to a pair
+            for parent, char in reversed(path):
+                if parent[char]:
+                    break
+                del parent[char]
+        else:
+            self.other.discard((tag, matcher))
+
+    def match(self, mtag):
+        '''
+        Return the list of (tag, matcher) pairs matching the event tag
+        '''
+        matches = []
+        if mtag is not None:
+            node = self.trie
+            if None in node:
+                matches.append(node[None])
+            for char in mtag:
+                node = node.get(char)
+                if node is None:
+                    break
+                if None in node:
+                    matches.append(node[None])
+            if mtag in self.exact:
+                matches.append((mtag, EventListener.exact_matcher))
+        for tag, matcher in self.other:
+            try:
+                is_matched = matcher(mtag, tag)
+            except Exception:
+                log.error('Failed to run a matcher.', exc_info=True)
+                is_matched = False
+            if is_matched:
+                matches.append((tag, matcher))
+        return matches
+
+
 class EventListener(object):
     '''
     Class responsible for listening to the salt master event bus and updating
@@ -290,28 +386,48 @@ class EventListener(object):
 
         # tag -> list of futures
         self.tag_map = defaultdict(list)
+        self.tag_index = TagIndex()
 
         # request_obj -> list of (tag, future)
         self.request_map = defaultdict(list)
 
-        # map of future -> timeout_callback
+        # map of future -> timeout deadline
         self.timeout_map = {}
 
+        # heap of (deadline, seq, tag, matcher, future) for the futures with a
+        # timeout, which are timed out by a single IOLoop timeout. Entries for
+        # futures which are already done are removed lazily.
+        self.timeout_heap = []
+        self._timeout_seq = itertools.count()
+        self._timeout_handle = None
+        self._timeout_deadline = None
+
+        # (tag, matcher) -> list of queues
+        self.subscriptions = defaultdict(list)
+        self.subscription_index = TagIndex()
+
+        # request_obj -> list of (tag, matcher, queue)
+        self.subscription_map = defaultdict(list)
+
         self.event.set_event_handler(self._handle_event_socket_recv)
 
     def clean_by_request(self, request):
         '''
         Remove all futures that were waiting for request `request` since it is done waiting
         '''
+        for tag, matcher, queue in self.subscription_map.pop(request, ()):
+            self.subscriptions[(tag, matcher)].remove(queue)
+            if not self.subscriptions[(tag, matcher)]:
+                del self.subscriptions[(tag, matcher)]
+                self.subscription_index.remove(tag, matcher)
+
         if request not in self.request_map:
             return
         for tag, matcher, future in self.request_map[request]:
             # timeout the future
             self._timeout_future(tag, matcher, future)
             # remove the timeout
-            if future in self.timeout_map:
-                tornado.ioloop.IOLoop.current().remove_timeout(self.timeout_map[future])
-                del self.timeout_map[future]
+            self._discard_timeout(future)
 
         del self.request_map[request]
 
@@ -350,15 +466,79 @@ class EventListener(object):
                 tornado.ioloop.IOLoop.current().add_callback(callback, future)
             future.add_done_callback(handle_future)
         # add this tag and future to the callbacks
+        if (tag, matcher) not in self.tag_map:
+            self.tag_index.add(tag, matcher)
         self.tag_map[(tag, matcher)].append(future)
         self.request_map[request].append((tag, matcher, future))
 
         if timeout:
-            timeout_future = tornado.ioloop.IOLoop.current().call_later(timeout, self._timeout_future, tag, matcher, future)
-            self.timeout_map[future] = timeout_future
+            deadline = tornado.ioloop.IOLoop.current().time() + timeout
+            heapq.heappush(self.timeout_heap,
+                           (deadline, next(self._timeout_seq), tag, matcher, future))
+            self.timeout_map[future] = deadline
+            self._schedule_timeouts()
 
         return future
 
+    def subscribe(self,
+                  request,
+                  tag='',
+                  matcher=prefix_matcher.__func__,
+                  maxsize=0,
+                  queue=None
+                  ):
+        '''
+        Return a queue which gets all the events matching the tag until the
+        request is done. Pass a queue returned by a previous call to subscribe
+        to put the events matching several tags in the same queue.
+        '''
+        if queue is None:
+            queue = EventQueue(maxsize=maxsize)
+        if (tag, matcher) not in self.subscriptions:
+            self.subscription_index.add(tag, matcher)
+        self.subscriptions[(tag, matcher)].append(queue)
+        self.subscription_map[request].append((tag, matcher, queue))
+        return queue
+
+    def _schedule_timeouts(self):
+        '''
+        Make sure the IOLoop timeout fires at the earliest deadline
+        '''
+        if not self.timeout_heap:
+            return
+        deadline = self.timeout_heap[0][0]
+        io_loop = tornado.ioloop.IOLoop.current()
+        if self._timeout_handle is not None:
+            if self._timeout_deadline <= deadline:
+                return
+            io_loop.remove_timeout(self._timeout_handle)
+        self._timeout_deadline = deadline
+        self._timeout_handle = io_loop.call_at(deadline, self._handle_timeouts)
+
+    def _handle_timeouts(self):
+        '''
+        Timeout all the futures whose deadline has passed
+        '''
+        self._timeout_handle = None
+        now = tornado.ioloop.IOLoop.current().time()
+        while self.timeout_heap and self.timeout_heap[0][0] <= now:
+            _, _, tag, matcher, future = heapq.heappop(self.timeout_heap)
+            if self.timeout_map.pop(future, None) is not None:
+                self._timeout_future(tag, matcher, future)
+        self._schedule_timeouts()
+
+    def _discard_timeout(self, future):
+        '''
+        Forget the timeout of a future which is done
+        '''
+        if self.timeout_map.pop(future, None) is None:
+            return
+        # drop the entries of done futures once they make up most of the heap
+        if len(self.timeout_heap) > 2 * len(self.timeout_map) + 64:
+            self.timeout_heap = [entry for entry in self.timeout_heap
+                                 if entry[4] in self.timeout_map]
+            heapq.heapify(self.timeout_heap)
+
     def _timeout_future(self, tag, matcher, future):
         '''
         Timeout a specific future
@@ -370,32 +550,28 @@ class EventListener(object):
             self.tag_map[(tag, matcher)].remove(future)
         if not self.tag_map[(tag, matcher)]:
             del self.tag_map[(tag, matcher)]
+            self.tag_index.remove(tag, matcher)
 
     def _handle_event_socket_recv(self, raw):
         '''
         Callback for events on the event sub socket
         '''
         mtag, data = self.event.unpack(raw, self.event.serial)
+        event = {'data': data, 'tag': mtag}
 
-        # see if we have any futures that need this info:
-        for (tag, matcher), futures in six.iteritems(self.tag_map):
-            try:
-                is_matched = matcher(mtag, tag)
-            except Exception:
-                log.error('Failed to run a matcher.', exc_info=True)
-                is_matched = False
-
-            if not is_matched:
-                continue
+        for key in self.subscription_index.match(mtag):
+            for queue in self.subscriptions.get(key, ()):
+                queue.put_event(event)
 
-            for future in futures:
+        # see if we have any futures that need this info:
+        for key in self.tag_index.match(mtag):
+            futures = self.tag_map.get(key, [])
+            for future in list(futures):
                 if future.done():
                     continue
-                future.set_result({'data': data, 'tag': mtag})
-                self.tag_map[(tag, matcher)].remove(future)
-                if future in self.timeout_map:
-                    tornado.ioloop.IOLoop.current().remove_timeout(self.timeout_map[future])
-                    del self.timeout_map[future]
+                future.set_result(event)
+                futures.remove(future)
+                self._discard_timeout(future)
 
 
 class BaseSaltAPIHandler(tornado.web.RequestHandler):  # pylint: disable=W0223
@@ -1456,6 +1632,259 @@ class RunSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
         self.disbatch()
 
 
+class StreamSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
+    '''
+    Stream the returns of a job as the minions return
+
+    The returns are sent as newline delimited JSON, or as Server Sent Events
+    (SSE) when the :mailheader:`Accept` header is ``text/event-stream``.
+    '''
+    ct_out_map = (
+        ('application/x-ndjson', _json_dumps),
+        ('text/event-stream', _json_dumps),
+        ('application/json', _json_dumps),
+    )
+
+    @tornado.gen.coroutine
+    def post(self):
+        r'''
+        Run a job, and stream the return of each minion as soon as the minion
+        returns
+
+        .. http:post:: /stream
+
+            :reqheader X-Auth-Token: |req_token|
+            :reqheader Accept: ``application/x-ndjson`` or ``text/event-stream``
+            :reqheader Content-Type: |req_ct|
+
+            :status 200: |200|
+            :status 400: |400|
+            :status 401: |401|
+            :status 406: |406|
+
+            A single :term:`lowstate` for the ``local`` client must be sent in
+            the request body.
+
+        **Example request:**
+
+        .. code-block:: bash
+
+            curl -NsS localhost:8000/stream \\
+                -H "X-Auth-Token: d40d1e1e" \\
+                -d client=local \\
+                -d tgt='*' \\
+                -d fun='test.ping'
+
+        **Example response:**
+
+        The first record contains the jid and the minions expected to return,
+        then a record is sent for each minion which returns, and the last
+        record lists the minions which did not return. Minions which returned
+        while the client was not reading the stream fast enough are listed in
+        ``dropped``, and their returns can be fetched from
+        :py:meth:`/stream/(jid) <StreamSaltAPIHandler.get>`.
+
+        .. code-block:: text
+
+            HTTP/1.1 200 OK
+            Content-Type: application/x-ndjson
+
+            {"jid": "20190820122001123456", "minions": ["ms-0", "ms-1"]}
+            {"jid": "20190820122001123456", "id": "ms-1", "return": true}
+            {"jid": "20190820122001123456", "id": "ms-0", "return": true}
+            {"jid": "20190820122001123456", "done": true, "missing": [], "dropped": []}
+        '''
+        if not self._verify_auth():
+            self.redirect('/login')
+            return
+
+        if not self.lowstate or len(self.lowstate) != 1 \
+                or self.lowstate[0].get('client') != 'local':
+            self.send_error(400)
+            return
+        chunk = self.lowstate[0]
+        if self.token is not None and 'token' not in chunk:
+            chunk['token'] = self.token
+        full_return = chunk.pop('full_return', False)
+        chunk['jid'] = chunk.get('jid') or salt.utils.jid.gen_jid(self.application.opts)
+
+        # start listening for the returns before we fire the job to avoid races
+        queue = self._subscribe(chunk['jid'])
+        f_call = self._format_call_run_job_async(chunk)
+        try:
+            pub_data = yield self.saltclients['local'](*f_call.get('args', ()), **f_call.get('kwargs', {}))
+        except (AuthenticationError, AuthorizationError, EauthAuthenticationError):
+            self.send_error(401)
+            return
+        if 'jid' not in pub_data:
+            self.set_status(400)
+            self.write('No minions matched the target. No command was sent, no jid was assigned.')
+            self.finish()
+            return
+
+        self._start_stream(pub_data['jid'], pub_data['minions'])
+        yield self._stream_returns(pub_data['jid'],
+                                   pub_data['minions'],
+                                   queue,
+                                   chunk['tgt'],
+                                   f_call['kwargs']['tgt_type'],
+                                   full_return=full_return)
+
+    @tornado.gen.coroutine
+    def get(self, jid=None):  # pylint: disable=W0221
+        '''
+        Stream the returns of a job which was previously started
+
+        .. http:get:: /stream/(jid)
+
+            :reqheader X-Auth-Token: |req_token|
+            :reqheader Accept: ``application/x-ndjson`` or ``text/event-stream``
+
+            :status 200: |200|
+            :status 401: |401|
+            :status 404: The job was not found in the job cache
+            :status 406: |406|
+
+        The returns which are in the master job cache are sent first, followed
+        by the returns of the minions which return while the job is still
+        running. This can be used to resume a stream which was interrupted.
+        The job cache is read using the ``jobs.list_job`` runner, so the token
+        needs the same permissions as for :py:meth:`/jobs/(jid)
+        <JobsSaltAPIHandler.get>`.
+        '''
+        if not self._verify_auth():
+            self.redirect('/login')
+            return
+        if not jid:
+            self.send_error(400)
+            return
+        full_return = self.get_argument('full_return', '').lower() in ('1', 'true')
+
+        queue = self._subscribe(jid)
+        # Read the job cache using the runner client, so that the permissions
+        # of the token are checked as they are for /jobs/(jid)
+        chunk = {'client': 'runner', 'fun': 'jobs.list_job', 'jid': jid}
+        if self.token is not None:
+            chunk['token'] = self.token
+        try:
+            job = yield self._disbatch_runner(chunk)
+        except (AuthenticationError, AuthorizationError, EauthAuthenticationError):
+            self.send_error(401)
+            return
+        if not isinstance(job, dict) or 'Error' in job:
+            self.send_error(404)
+            return
+        minions = job.get('Minions', [])
+        self._start_stream(jid, minions)
+
+        returned = set()
+        cached = job.get('Result') or {}
+        for minion, data in six.iteritems(cached):
+            returned.add(minion)
+            self._write_return(jid, minion, data, full_return)
+        del cached
+        try:
+            yield self.flush()
+        except tornado.iostream.StreamClosedError:
+            return
+
+        running = set(minions) - returned
+        if not running:
+            self._write_record({'jid': jid, 'done': True, 'missing': [], 'dropped': []}, 'done')
+            self.finish()
+            return
+        yield self._stream_returns(jid,
+                                   minions,
+                                   queue,
+                                   list(running),
+                                   'list',
+                                   full_return=full_return,
+                                   returned=returned)
+
+    def _subscribe(self, jid):
+        '''
+        Subscribe to the returns of the job
+        '''
+        maxsize = self.application.mod_opts.get('stream_queue_size', 1000)
+        queue = self.application.event_listener.subscribe(
+            self, tag='salt/job/{0}/ret/'.format(jid), maxsize=maxsize)
+        if self.application.opts['order_masters']:
+            self.application.event_listener.subscribe(
+                self, tag='syndic/job/{0}/ret/'.format(jid), queue=queue)
+        return queue
+
+    def _start_stream(self, jid, minions):
+        self.set_header('Content-Type', self.content_type)
+        self.set_header('Cache-Control', 'no-cache')
+        if self.content_type == 'text/event-stream':
+            self.set_header('Connection', 'keep-alive')
+        self._write_record({'jid': jid, 'minions': sorted(minions)}, 'new')
+
+    def _write_record(self, record, event):
+        # _json_dumps returns a str, which holds encoded bytes on Python 2
+        data = salt.utils.stringutils.to_unicode(_json_dumps(record))
+        if self.content_type == 'text/event-stream':
+            self.write('event: {0}\n'.format(event))
+            self.write('data: {0}\n\n'.format(data))
+        else:
+            self.write('{0}\n'.format(data))
+
+    def _write_return(self, jid, minion, data, full_return):
+        record = {'jid': jid, 'id': minion, 'return': data.get('return')}
+        if full_return:
+            record['data'] = data
+        self._write_record(record, 'ret')
+
+    @tornado.gen.coroutine
+    def _stream_returns(self, jid, minions, queue, tgt, tgt_type, full_return=False, returned=()):
+        '''
+        Write the returns of the minions to the stream until all minions have
+        returned or the job is no longer running on any minion. The stream is
+        flushed after each set of returns, so that no more returns are read
+        from the event bus while the client is not reading the stream.
+        '''
+        minions = dict((minion, minion in returned) for minion in minions)
+        is_finished = Future()
+        not_running = self.job_not_running(jid, tgt, tgt_type, minions, is_finished)
+
+        def write_event(event):
+            data = event['data']
+            if 'return' not in data or minions.get(data.get('id')) is True:
+                return
+            minions[data['id']] = True
+            self._write_return(jid, data['id'], data, full_return)
+
+        try:
+            while any(x is False for x in six.itervalues(minions)):
+                try:
+                    event = yield queue.get(timeout=timedelta(seconds=1))
+                except tornado.gen.TimeoutError:
+                    if not_running.done():
+                        break
+                    continue
+                if self._finished:
+                    return
+                write_event(event)
+                while queue.qsize():
+                    write_event(queue.get_nowait())
+                yield self.flush()
+        except tornado.iostream.StreamClosedError:
+            return
+        finally:
+            if not is_finished.done():
+                is_finished.set_result(True)
+
+        if self._finished:
+            return
+        dropped = set(tag.rsplit('/', 1)[-1] for tag in queue.dropped)
+        self._write_record({'jid': jid,
+                            'done': True,
+                            'missing': sorted(m for m, ret in six.iteritems(minions) if not ret),
+                            'dropped': sorted(dropped)},
+                           'done')
+        self.finish()
+
+
 class EventsSaltAPIHandler(SaltAPIHandler):  # pylint: disable=W0223
     '''
     Expose the Salt event bus
@@ -26,6 +26,7 @@ import salt.utils.cache
 import salt.utils.crypt
 import salt.utils.data
 import salt.utils.dictupdate
+import salt.utils.topmatch
 import salt.utils.url
 from salt.exceptions import SaltClientError
 from salt.template import compile_template
@@ -684,6 +685,11 @@ class Pillar(object):
         Returns:
         {'saltenv': ['state1', 'state2', ...]}
         '''
+        cache_key = salt.utils.topmatch.cache_key(
+            self.opts, top, 'pillar', self.opts['pillarenv'])
+        matches = salt.utils.topmatch.get(cache_key)
+        if matches is not None:
+            return dict(matches)
         matches = {}
         for saltenv, body in six.iteritems(top):
             if self.opts['pillarenv']:
@@ -702,6 +708,7 @@ class Pillar(object):
                     for item in data:
                         if isinstance(item, six.string_types) and item not in env_matches:
                             env_matches.append(item)
+        salt.utils.topmatch.store(cache_key, matches)
         return matches
 
     def render_pstate(self, sls, saltenv, mods, defaults=None):
@@ -9,14 +9,47 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 # Import salt libs
 import salt.loader
+import salt.payload
 import salt.syspaths
+import salt.utils.atomicfile
+import salt.utils.files
+import salt.utils.json
+import salt.utils.stringutils
 
+import hashlib
 import os
 import logging
+import time
 from salt.ext import six
 
 log = logging.getLogger(__name__)
 
+# The options which influence the targets returned by the roster modules,
+# which are part of the key of all cached roster data
+CACHE_OPTS = (
+    'roster_file',
+    'roster_defaults',
+    'roster_order',
+    'roster_dir',
+    'roster_domain',
+    'renderer',
+    'renderer_blacklist',
+    'renderer_whitelist',
+    'ssh_scan_ports',
+    'ssh_scan_timeout',
+    'ssh_user',
+    'ssh_use_home_key',
+    'ssh_list_nodegroups',
+    'ssh_config_file',
+    'range_server',
+    'conf_file',
+    'pki_dir',
+)
+
+# The targets of these rosters may contain secrets resolved from sdb, so they
+# are not cached. The rosters cache the data the targets are matched against.
+UNCACHED_TARGETS = ('flat',)
+
 
 def get_roster_file(options):
     '''
@@ -59,6 +92,81 @@ def get_roster_file(options):
     return template
 
 
+def _cache_path(opts, key):
+    '''
+    Return the path of the roster cache file for the passed key
+    '''
+    data = [key, dict((name, opts.get(name)) for name in CACHE_OPTS)]
+    digest = hashlib.sha1(
+        salt.utils.stringutils.to_bytes(
+            salt.utils.json.dumps(data, sort_keys=True, default=repr)
+        )
+    ).hexdigest()
+    return os.path.join(opts['cachedir'], 'roster', '{0}.p'.format(digest))
+
+
+def _source_stats(sources):
+    '''
+    Return the modification time and size of each of the passed files, which
+    are used to invalidate cached roster data when its sources change
+    '''
+    stats = {}
+    for source in sources:
+        try:
+            stat = os.stat(source)
+            stats[source] = [stat.st_mtime, stat.st_size]
+        except OSError:
+            stats[source] = None
+    return stats
+
+
+def cache_get(opts, key, sources=()):
+    '''
+    Return the roster data cached under the passed key, or None if it is not
+    cached, is older than ``roster_cache_ttl`` seconds, or one of the files it
+    was generated from has changed since it was cached.
+    '''
+    ttl = opts.get('roster_cache_ttl')
+    if not ttl:
+        return None
+    path = _cache_path(opts, key)
+    try:
+        with salt.utils.files.fopen(path, 'rb') as fp_:
+            entry = salt.payload.Serial(opts).load(fp_)
+    except (IOError, OSError):
+        return None
+    except Exception as exc:
+        log.debug('Unable to read cached roster data %s: %s', path, exc)
+        return None
+    if not isinstance(entry, dict) or time.time() - entry.get('time', 0) > ttl:
+        return None
+    if entry.get('sources') != _source_stats(sources):
+        return None
+    log.trace('Using cached roster data for %s', key)
+    return entry.get('data')
+
+
+def cache_store(opts, key, data, sources=()):
+    '''
+    Cache the passed roster data under the passed key, along with the
+    modification time of the files it was generated from
+    '''
+    if not opts.get('roster_cache_ttl'):
+        return
+    path = _cache_path(opts, key)
+    cachedir = os.path.dirname(path)
+    try:
+        if not os.path.isdir(cachedir):
+            os.makedirs(cachedir, 0o700)
+        entry = {'time': time.time(),
+                 'sources': _source_stats(sources),
+                 'data': data}
+        with salt.utils.atomicfile.atomic_open(path, 'wb') as fp_:
+            salt.payload.Serial(opts).dump(entry, fp_)
+    except (IOError, OSError) as exc:
+        log.warning('Unable to cache roster data in %s: %s', path, exc)
+
+
 class Roster(object):
     '''
     Used to manage a roster of minions allowing the master to become outwardly
@@ -91,6 +199,19 @@ class Roster(object):
             return back
         return sorted(back)
 
+    def _sources(self, back):
+        '''
+        Return the files the targets of a roster backend are generated from,
+        if the backend reports them
+        '''
+        f_str = '{0}.sources'.format(back)
+        if f_str not in self.rosters:
+            return []
+        try:
+            return self.rosters[f_str]()
+        except (IOError, OSError):
+            return []
+
     def targets(self, tgt, tgt_type):
         '''
         Return a dict of {'id': {'ipv4': <ipaddr>}} data sets to be used as
@@ -102,7 +223,16 @@ class Roster(object):
             if f_str not in self.rosters:
                 continue
             try:
-                targets.update(self.rosters[f_str](tgt, tgt_type))
+                if back in UNCACHED_TARGETS:
+                    targets.update(self.rosters[f_str](tgt, tgt_type))
+                    continue
+                sources = self._sources(back)
+                key = ('targets', back, tgt, tgt_type)
+                ret = cache_get(self.opts, key, sources)
+                if ret is None:
+                    ret = self.rosters[f_str](tgt, tgt_type)
+                    cache_store(self.opts, key, ret, sources)
+                targets.update(ret)
             except salt.exceptions.SaltRenderError as exc:
                 log.error('Unable to render roster file: %s', exc)
             except IOError as exc:
@@ -93,6 +93,7 @@ import copy
 import fnmatch
 
 # Import Salt libs
+import salt.roster
 import salt.utils.path
 from salt.roster import get_roster_file
 
@@ -117,8 +118,13 @@ def targets(tgt, tgt_type='glob', **kwargs):
     Return the targets from the ansible inventory_file
     Default: /etc/salt/roster
     '''
-    inventory = __runner__['salt.cmd']('cmd.run', 'ansible-inventory -i {0} --list'.format(get_roster_file(__opts__)))
-    __context__['inventory'] = __utils__['json.loads'](__utils__['stringutils.to_str'](inventory))
+    roster_file = get_roster_file(__opts__)
+    inventory = salt.roster.cache_get(__opts__, ('ansible', roster_file), [roster_file])
+    if inventory is None:
+        inventory = __runner__['salt.cmd']('cmd.run', 'ansible-inventory -i {0} --list'.format(roster_file))
+        inventory = __utils__['json.loads'](__utils__['stringutils.to_str'](inventory))
+        salt.roster.cache_store(__opts__, ('ansible', roster_file), inventory, [roster_file])
+    __context__['inventory'] = inventory
 
     if tgt_type == 'glob':
         hosts = [host for host in _get_hosts_from_group('all') if fnmatch.fnmatch(host, tgt)]
@@ -127,6 +133,13 @@ def targets(tgt, tgt_type='glob', **kwargs):
     return {host: _get_hostvars(host) for host in hosts}
 
 
+def sources():
+    '''
+    Return the files the targets are read from
+    '''
+    return [get_roster_file(__opts__)]
+
+
 def _get_hosts_from_group(group):
     inventory = __context__['inventory']
     hosts = [host for host in inventory[group].get('hosts', [])]
@@ -7,6 +7,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 # Import Salt libs
 import salt.loader
 import salt.config
+import salt.roster
 from salt.ext import six
 from salt.template import compile_template
 from salt.roster import get_roster_file
@@ -22,15 +23,28 @@ def targets(tgt, tgt_type='glob', **kwargs):
     '''
     template = get_roster_file(__opts__)
 
-    rend = salt.loader.render(__opts__, {})
-    raw = compile_template(template,
-                           rend,
-                           __opts__['renderer'],
-                           __opts__['renderer_blacklist'],
-                           __opts__['renderer_whitelist'],
-                           mask_value='passw*',
-                           **kwargs)
+    # The rendered roster is cached, so that targeting different hosts does
+    # not render the roster again. It is cached before the sdb values are
+    # resolved, so that they are not written to the cache.
+    raw = salt.roster.cache_get(__opts__, ('flat', template), [template])
+    if raw is None:
+        rend = salt.loader.render(__opts__, {})
+        raw = compile_template(template,
+                               rend,
+                               __opts__['renderer'],
+                               __opts__['renderer_blacklist'],
+                               __opts__['renderer_whitelist'],
+                               mask_value='passw*',
+                               **kwargs)
+        salt.roster.cache_store(__opts__, ('flat', template), raw, [template])
     conditioned_raw = {}
     for minion in raw:
         conditioned_raw[six.text_type(minion)] = salt.config.apply_sdb(raw[minion])
     return __utils__['roster_matcher.targets'](conditioned_raw, tgt, tgt_type, 'ipv4')
+
+
+def sources():
+    '''
+    Return the files the targets are read from
+    '''
+    return [get_roster_file(__opts__)]
@@ -15,6 +15,7 @@ from salt._compat import ipaddress
 from salt.ext import six
 
 # Import 3rd-party libs
+import concurrent.futures
 from salt.ext.six.moves import map  # pylint: disable=import-error,redefined-builtin
 
 log = logging.getLogger(__name__)
@@ -40,7 +41,8 @@ class RosterMatcher(object):
     def targets(self):
         '''
         Return ip addrs based on netmask, sitting in the "glob" spot because
-        it is the default
+        it is the default. Up to ``ssh_scan_concurrency`` addresses are
+        scanned at a time.
         '''
         addrs = ()
         ret = {}
@@ -55,19 +57,31 @@ class RosterMatcher(object):
                 addrs = ipaddress.ip_network(self.tgt).hosts()
             except ValueError:
                 pass
-        for addr in addrs:
-            addr = six.text_type(addr)
-            ret[addr] = copy.deepcopy(__opts__.get('roster_defaults', {}))
-            log.trace('Scanning host: %s', addr)
-            for port in ports:
-                log.trace('Scanning port: %s', port)
-                try:
-                    sock = salt.utils.network.get_socket(addr, socket.SOCK_STREAM)
-                    sock.settimeout(float(__opts__['ssh_scan_timeout']))
-                    sock.connect((addr, port))
-                    sock.shutdown(socket.SHUT_RDWR)
-                    sock.close()
+        concurrency = max(1, int(__opts__.get('ssh_scan_concurrency', 100)))
+        with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+            for addr, port in executor.map(lambda addr: self._scan(addr, ports), addrs):
+                ret[addr] = copy.deepcopy(__opts__.get('roster_defaults', {}))
+                if port is not None:
                     ret[addr].update({'host': addr, 'port': port})
-                except socket.error:
-                    pass
         return ret
+
+    def _scan(self, addr, ports):
+        '''
+        Scan the ports of an address, returning the address and the last of
+        the ports which is open, or None if none of them are
+        '''
+        addr = six.text_type(addr)
+        open_port = None
+        log.trace('Scanning host: %s', addr)
+        for port in ports:
+            log.trace('Scanning port: %s', port)
+            try:
+                sock = salt.utils.network.get_socket(addr, socket.SOCK_STREAM)
+                sock.settimeout(float(__opts__['ssh_scan_timeout']))
+                sock.connect((addr, port))
+                sock.shutdown(socket.SHUT_RDWR)
+                sock.close()
+                open_port = port
+            except socket.error:
+                pass
+        return addr, open_port
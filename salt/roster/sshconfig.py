@@ -94,6 +94,13 @@ def parse_ssh_config(lines):
     return targets
 
 
+def sources():
+    '''
+    Return the files the targets are read from
+    '''
+    return [_get_ssh_config_file(__opts__)]
+
+
 def targets(tgt, tgt_type='glob', **kwargs):
     '''
     Return the targets from the flat yaml file, checks opts for location but
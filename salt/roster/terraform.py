@@ -159,13 +159,27 @@ def _parse_state_file(state_file_path='terraform.tfstate'):
     return ret
 
 
+def _get_state_file():
+    '''
+    Return the path of the terraform state file
+    '''
+    if __opts__.get('roster_file'):
+        return os.path.abspath(__opts__['roster_file'])
+    return os.path.abspath('terraform.tfstate')
+
+
+def sources():
+    '''
+    Return the files the targets are read from
+    '''
+    return [_get_state_file()]
+
+
 def targets(tgt, tgt_type='glob', **kwargs):  # pylint: disable=W0613
     '''
     Returns the roster from the terraform state file, checks opts for location, but defaults to terraform.tfstate
     '''
-    roster_file = os.path.abspath('terraform.tfstate')
-    if __opts__.get('roster_file'):
-        roster_file = os.path.abspath(__opts__['roster_file'])
+    roster_file = _get_state_file()
 
     if not os.path.isfile(roster_file):
         log.error("Can't find terraform state file '%s'", roster_file)
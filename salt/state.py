@@ -44,6 +44,7 @@ import salt.utils.immutabletypes as immutabletypes
 import salt.utils.msgpack as msgpack
 import salt.utils.platform
 import salt.utils.process
+import salt.utils.topmatch
 import salt.utils.url
 import salt.syspaths as syspaths
 import salt.transport.client
@@ -3480,37 +3481,46 @@ class BaseHighState(object):
         {'saltenv': ['state1', 'state2', ...]}
         '''
         matches = DefaultOrderedDict(OrderedDict)
-        # pylint: disable=cell-var-from-loop
-        for saltenv, body in six.iteritems(top):
-            if self.opts['saltenv']:
-                if saltenv != self.opts['saltenv']:
-                    continue
-            for match, data in six.iteritems(body):
-                def _filter_matches(_match, _data, _opts):
-                    if isinstance(_data, six.string_types):
-                        _data = [_data]
-                    if self.matchers['confirm_top.confirm_top'](
-                            _match,
-                            _data,
-                            _opts
-                            ):
-                        if saltenv not in matches:
-                            matches[saltenv] = []
-                        for item in _data:
-                            if 'subfilter' in item:
-                                _tmpdata = item.pop('subfilter')
-                                for match, data in six.iteritems(_tmpdata):
-                                    _filter_matches(match, data, _opts)
-                            if isinstance(item, six.string_types):
-                                matches[saltenv].append(item)
-                            elif isinstance(item, dict):
-                                env_key, inc_sls = item.popitem()
-                                if env_key not in self.avail:
-                                    continue
-                                if env_key not in matches:
-                                    matches[env_key] = []
-                                matches[env_key].append(inc_sls)
-                _filter_matches(match, data, self.opts['nodegroups'])
+        # Matching modifies the top data, so the cache key must be generated
+        # before matching.
+        cache_key = salt.utils.topmatch.cache_key(
+            self.opts, top, 'state', self.opts['saltenv'], sorted(self.avail))
+        cached_matches = salt.utils.topmatch.get(cache_key)
+        if cached_matches is not None:
+            matches.update(cached_matches)
+        else:
+            # pylint: disable=cell-var-from-loop
+            for saltenv, body in six.iteritems(top):
+                if self.opts['saltenv']:
+                    if saltenv != self.opts['saltenv']:
+                        continue
+                for match, data in six.iteritems(body):
+                    def _filter_matches(_match, _data, _opts):
+                        if isinstance(_data, six.string_types):
+                            _data = [_data]
+                        if self.matchers['confirm_top.confirm_top'](
+                                _match,
+                                _data,
+                                _opts
+                                ):
+                            if saltenv not in matches:
+                                matches[saltenv] = []
+                            for item in _data:
+                                if 'subfilter' in item:
+                                    _tmpdata = item.pop('subfilter')
+                                    for match, data in six.iteritems(_tmpdata):
+                                        _filter_matches(match, data, _opts)
+                                if isinstance(item, six.string_types):
+                                    matches[saltenv].append(item)
+                                elif isinstance(item, dict):
+                                    env_key, inc_sls = item.popitem()
+                                    if env_key not in self.avail:
+                                        continue
+                                    if env_key not in matches:
+                                        matches[env_key] = []
+                                    matches[env_key].append(inc_sls)
+                    _filter_matches(match, data, self.opts['nodegroups'])
+            salt.utils.topmatch.store(cache_key, matches)
         ext_matches = self._master_tops()
         for saltenv in ext_matches:
             top_file_matches = matches.get(saltenv, [])
@@ -3,21 +3,27 @@
 # Import Python Libs
 from __future__ import absolute_import, print_function, unicode_literals
 import multiprocessing
+import collections
 import ctypes
 import logging
+import math
 import os
 import hashlib
+import random
 import shutil
 import binascii
+import time
 
 # Import Salt Libs
 import salt.crypt
 import salt.payload
 import salt.master
 import salt.transport.frame
+import salt.utils.cache
 import salt.utils.event
 import salt.utils.files
 import salt.utils.minions
+import salt.utils.ratelimit
 import salt.utils.stringutils
 import salt.utils.verify
 from salt.utils.cache import CacheCli
@@ -38,6 +44,10 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# The share of the auth rate limit which is reserved for the minions whose keys
+# have already been accepted
+AUTH_ACCEPTED_RESERVE = 0.25
+
 
 # TODO: rename
 class AESPubClientMixin(object):
@@ -107,6 +117,82 @@ class AESReqServerMixin(object):
 
         self.master_key = salt.crypt.MasterKeys(self.opts)
 
+        if self.opts.get('auth_rate_limit', 0) > 0:
+            # Each worker gets an equal share of the rate limit
+            workers = max(self.opts.get('worker_threads', 1), 1)
+            rate = self.opts['auth_rate_limit']
+            burst = self.opts.get('auth_rate_burst') or rate
+            self.auth_bucket = salt.utils.ratelimit.TokenBucket(
+                float(rate) / workers, max(float(burst) / workers, 1))
+        else:
+            self.auth_bucket = None
+        # The times at which auth requests were recently turned away
+        self._auth_rejected = collections.deque()
+
+        # The AES key encrypted for each minion key, and the signature of the
+        # AES key, which are reused until the AES key is rotated
+        salt.crypt.PUB_KEY_CACHE.maxsize = self.opts.get('auth_key_cache_size', 1024)
+        self.aes_payload_cache = salt.utils.cache.LRUCache(
+            self.opts.get('auth_key_cache_size', 1024))
+        self._aes_sig = (None, None)
+
+    def _auth_retry_after(self, load):
+        '''
+        Check whether an auth request can be handled now, given the configured
+        auth_rate_limit. Returns 0 if it can, otherwise the number of seconds
+        after which the minion should try again.
+
+        Part of the capacity is reserved for minions whose keys have already
+        been accepted, so that they are reconnected first after a restart of
+        the master.
+        '''
+        accepted = os.path.isfile(
+            os.path.join(self.opts['pki_dir'], 'minions', load['id']))
+        if accepted:
+            reserve = 0
+        else:
+            reserve = self.auth_bucket.burst * AUTH_ACCEPTED_RESERVE
+        wait = self.auth_bucket.consume(reserve=reserve)
+        if not wait:
+            return 0
+        now = time.time()
+        while self._auth_rejected and self._auth_rejected[0] < now - 10:
+            self._auth_rejected.popleft()
+        self._auth_rejected.append(now)
+        # Spread the retries over the time needed to handle the requests which
+        # were recently turned away, so that the minions do not all come back
+        # at once
+        backlog = len(self._auth_rejected) / self.auth_bucket.rate
+        return max(1, int(math.ceil(wait + random.uniform(0, backlog))))
+
+    def _encrypt_aes(self, pub, load, aes):
+        '''
+        Return the AES key encrypted with the minion's public key. The result is
+        cached for each minion key, so that minions which authenticate again
+        before the AES key is rotated do not need it to be encrypted again.
+        '''
+        cache_key = (load['id'], load['pub'], aes)
+        enc_aes = self.aes_payload_cache.get(cache_key)
+        if enc_aes is None:
+            if HAS_M2:
+                enc_aes = pub.public_encrypt(aes, RSA.pkcs1_oaep_padding)
+            else:
+                enc_aes = PKCS1_OAEP.new(pub).encrypt(aes)
+            self.aes_payload_cache.set(cache_key, enc_aes)
+        return enc_aes
+
+    def _sign_aes(self, aes):
+        '''
+        Return the master's signature of the AES key, which is the same for all
+        of the minions until the AES key is rotated
+        '''
+        signed_aes, sig = self._aes_sig
+        if signed_aes != aes:
+            digest = salt.utils.stringutils.to_bytes(hashlib.sha256(aes).hexdigest())
+            sig = salt.crypt.private_encrypt(self.master_key.key, digest)
+            self._aes_sig = (aes, sig)
+        return sig
+
     def _encrypt_private(self, ret, dictkey, target):
         '''
         The server equivalent of ReqChannel.crypted_transfer_decode_dictentry
@@ -183,6 +269,17 @@ class AESReqServerMixin(object):
                     'load': {'ret': False}}
         log.info('Authentication request from %s', load['id'])
 
+        if self.auth_bucket is not None:
+            retry_after = self._auth_retry_after(load)
+            if retry_after:
+                log.info(
+                    'Too many authentication requests, asking %s to retry in '
+                    '%s seconds', load['id'], retry_after
+                )
+                return {'enc': 'clear',
+                        'load': {'ret': 'retry',
+                                 'retry_after': retry_after}}
+
         # 0 is default which should be 'unlimited'
         if self.opts['max_minions'] > 0:
             # use the ConCache if enabled, else use the minion utils
@@ -488,6 +585,10 @@ class AESReqServerMixin(object):
             else:
                 ret['aes'] = cipher.encrypt(aes)
         else:
+            # The minion sends a new random token with every request and checks
+            # that it is returned, so the token is decrypted with the master's
+            # private key each time; only the AES payload and signature are
+            # reused
             if 'token' in load:
                 try:
                     if HAS_M2:
@@ -503,14 +604,9 @@ class AESReqServerMixin(object):
                     pass
 
             aes = salt.master.SMaster.secrets['aes']['secret'].value
-            if HAS_M2:
-                ret['aes'] = pub.public_encrypt(aes,
-                                                RSA.pkcs1_oaep_padding)
-            else:
-                ret['aes'] = cipher.encrypt(aes)
+            ret['aes'] = self._encrypt_aes(pub, load, aes)
         # Be aggressive about the signature
-        digest = salt.utils.stringutils.to_bytes(hashlib.sha256(aes).hexdigest())
-        ret['sig'] = salt.crypt.private_encrypt(self.master_key.key, digest)
+        ret['sig'] = self._sign_aes(aes)
         eload = {'result': True,
                  'act': 'accept',
                  'id': load['id'],
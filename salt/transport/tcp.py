@@ -8,6 +8,7 @@ Wire protocol: "len(payload) msgpack({'head': SOMEHEADER, 'body': SOMEBODY})"
 
 # Import Python Libs
 from __future__ import absolute_import, print_function, unicode_literals
+import collections
 import errno
 import logging
 import socket
@@ -35,6 +36,7 @@ import salt.transport.server
 import salt.transport.mixins.auth
 from salt.ext import six
 from salt.ext.six.moves import queue  # pylint: disable=import-error
+from salt.defaults import DEFAULT_TARGET_DELIM
 from salt.exceptions import SaltReqTimeoutError, SaltClientError
 from salt.transport import iter_transport_opts
 
@@ -79,6 +81,11 @@ if USE_LOAD_BALANCER:
 
 log = logging.getLogger(__name__)
 
+# The size of the chunks in which published payloads are written to the
+# subscriber streams. Each stream only buffers a single chunk at a time, while
+# the payload itself is shared by all of the subscribers.
+PUB_WRITE_CHUNK_SIZE = 65536
+
 
 def _set_tcp_keepalive(sock, opts):
     '''
@@ -1204,11 +1211,16 @@ class Subscriber(object):
         self._closing = False
         self._read_until_future = None
         self.id_ = None
+        # The payloads waiting to be written to the stream
+        self.write_queue = collections.deque()
+        self.write_queue_bytes = 0
+        self.writing = False
 
     def close(self):
         if self._closing:
             return
         self._closing = True
+        self.write_queue.clear()
         if not self.stream.closed():
             self.stream.close()
             if self._read_until_future is not None and self._read_until_future.done():
@@ -1355,10 +1367,58 @@ class PubServer(tornado.tcpserver.TCPServer, object):
         self.clients.add(client)
         self.io_loop.spawn_callback(self._stream_read, client)
 
+    def _remove_client(self, client):
+        client.close()
+        self._remove_client_present(client)
+        self.clients.discard(client)
+
+    def _queue_payload(self, client, payload):
+        '''
+        Queue a framed payload to be written to the client. Returns False if
+        the client could not keep up with the published payloads and has to be
+        disconnected.
+        '''
+        max_bytes = self.opts.get('tcp_pub_queue_max_bytes', 0)
+        if max_bytes and client.write_queue and \
+                client.write_queue_bytes + len(payload) > max_bytes:
+            log.warning(
+                'Subscriber at %s has %d bytes of publications waiting to be '
+                'sent, which exceeds tcp_pub_queue_max_bytes. Disconnecting '
+                'the slow subscriber.', client.address, client.write_queue_bytes
+            )
+            return False
+        client.write_queue.append(payload)
+        client.write_queue_bytes += len(payload)
+        if not client.writing:
+            client.writing = True
+            self.io_loop.spawn_callback(self._write_queue, client)
+        return True
+
+    @tornado.gen.coroutine
+    def _write_queue(self, client):
+        '''
+        Write the queued payloads to the client's stream, one chunk at a time,
+        so that the payloads are not copied into the stream's buffer in full
+        for every subscriber
+        '''
+        try:
+            while client.write_queue:
+                payload = client.write_queue.popleft()
+                for offset in range(0, len(payload), PUB_WRITE_CHUNK_SIZE):
+                    yield client.stream.write(
+                        payload[offset:offset + PUB_WRITE_CHUNK_SIZE])
+                client.write_queue_bytes -= len(payload)
+        except StreamClosedError:
+            log.debug('Subscriber at %s has disconnected from publisher', client.address)
+            self._remove_client(client)
+        finally:
+            client.writing = False
+
     # TODO: ACK the publish through IPC
     @tornado.gen.coroutine
     def publish_payload(self, package, _):
         log.debug('TCP PubServer sending payload: %s', package)
+        # The framed payload is shared by all of the subscribers
         payload = salt.transport.frame.frame_msg(package['payload'])
 
         to_remove = []
@@ -1372,27 +1432,16 @@ class PubServer(tornado.tcpserver.TCPServer, object):
                     # restarts and the master is yet to detect the disconnect
                     # via TCP keep-alive.
                     for client in self.present[topic]:
-                        try:
-                            # Write the packed str
-                            f = client.stream.write(payload)
-                            self.io_loop.add_future(f, lambda f: True)
-                        except StreamClosedError:
+                        if not self._queue_payload(client, payload):
                             to_remove.append(client)
                 else:
                     log.debug('Publish target %s not connected', topic)
         else:
             for client in self.clients:
-                try:
-                    # Write the packed str
-                    f = client.stream.write(payload)
-                    self.io_loop.add_future(f, lambda f: True)
-                except StreamClosedError:
+                if not self._queue_payload(client, payload):
                     to_remove.append(client)
         for client in to_remove:
-            log.debug('Subscriber at %s has disconnected from publisher', client.address)
-            client.close()
-            self._remove_client_present(client)
-            self.clients.discard(client)
+            self._remove_client(client)
         log.trace('TCP PubServer finished publishing payload')
 
 
@@ -1503,18 +1552,66 @@ class TCPPubServerChannel(salt.transport.server.PubServerChannel):
 
         int_payload = {'payload': self.serial.dumps(payload)}
 
-        # add some targeting stuff for lists only (for now)
-        if load['tgt_type'] == 'list':
-            if isinstance(load['tgt'], six.string_types):
-                # Fetch a list of minions that match
-                _res = self.ckminions.check_minions(load['tgt'],
-                                                    tgt_type=load['tgt_type'])
-                match_ids = _res['minions']
-
-                log.debug("Publish Side Match: %s", match_ids)
-                # Send list of miions thru so zmq can target them
-                int_payload['topic_lst'] = match_ids
-            else:
-                int_payload['topic_lst'] = load['tgt']
+        # Only send the payload to the targeted minions, when they can be
+        # determined on the master
+        match_ids = self._publish_targets(load)
+        if match_ids is not None:
+            int_payload['topic_lst'] = match_ids
         # Send it over IPC!
         pub_sock.send(int_payload)
+
+    def _publish_targets(self, load):
+        '''
+        Return the IDs of the minions targeted by the load, or None if the
+        payload must be sent to all of the minions because its targets cannot
+        be reliably determined on the master.
+
+        Targets which only depend on the minion IDs are always resolved.
+        Targets which depend on grains or pillar data are only resolved when
+        tcp_pub_cache_targeting and minion_data_cache are enabled, since the
+        minion data cache may be out of date.
+
+        On a master of masters the payload is always sent to all of the
+        connections, since the syndics are not found among the targets.
+        '''
+        if self.opts.get('order_masters'):
+            return None
+        tgt, tgt_type = load['tgt'], load['tgt_type']
+        if tgt_type == 'list' and not isinstance(tgt, six.string_types):
+            return tgt
+        cache_targeting = self.opts.get('tcp_pub_cache_targeting', False) \
+            and self.opts.get('minion_data_cache', False)
+        if not cache_targeting:
+            if tgt_type == 'compound':
+                if not self._is_id_compound(tgt):
+                    return None
+            elif tgt_type not in ('list', 'glob', 'pcre'):
+                return None
+        _res = self.ckminions.check_minions(
+            tgt,
+            tgt_type=tgt_type,
+            delimiter=load.get('delimiter', DEFAULT_TARGET_DELIM),
+            greedy=True
+        )
+        match_ids = _res['minions']
+        if not match_ids:
+            # The targets may not have been matched because of an error, in
+            # which case it is safer to let the minions decide
+            return None
+        log.debug('Publish Side Match: %s', match_ids)
+        return match_ids
+
+    @staticmethod
+    def _is_id_compound(tgt):
+        '''
+        Returns True if the compound target only matches on minion IDs
+        '''
+        if not isinstance(tgt, six.string_types):
+            tgt = ' '.join(tgt)
+        for word in tgt.split():
+            word = word.strip('()')
+            if not word or word in ('and', 'or', 'not'):
+                continue
+            if len(word) > 1 and word[1] == '@' and word[0] not in ('L', 'E'):
+                return False
+        return True
@@ -8,6 +8,7 @@ import os
 import re
 import time
 import logging
+import threading
 try:
     import salt.utils.msgpack as msgpack
 except ImportError:
@@ -20,6 +21,8 @@ import salt.utils.data
 import salt.utils.dictupdate
 import salt.utils.files
 
+from salt.utils.odict import OrderedDict
+
 # Import third party libs
 from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
 from salt.utils.zeromq import zmq
@@ -315,6 +318,63 @@ class CacheRegex(object):
         return regex
 
 
+class LRUCache(object):
+    '''
+    Thread-safe in-memory cache which holds at most ``maxsize`` items. When the
+    cache is full, the least recently used item is discarded to make room for
+    the new one. A ``maxsize`` of 0 disables the cache.
+    '''
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        '''
+        Return the value for key, marking it as the most recently used item
+        '''
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        '''
+        Add an item to the cache, discarding the least recently used item(s) if
+        the cache is full
+        '''
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        '''
+        Remove an item from the cache and return it
+        '''
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        '''
+        Clear the cache
+        '''
+        with self._lock:
+            self._data.clear()
+
+
 class ContextCache(object):
     def __init__(self, opts, name):
         '''
@@ -5,6 +5,7 @@ Utility functions for salt.cloud
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import contextlib
 import errno
 import os
 import stat
@@ -114,6 +115,11 @@ NSTATES = {
     3: 'pending',
 }
 
+# The stages VMs go through while being created, which can be limited to a
+# number of VMs at a time when running a map in parallel
+CREATE_STAGES = ('wait_for_running', 'wait_for_ssh', 'deploy')
+_STAGE_LIMITS = {}
+
 SSH_PASSWORD_PROMP_RE = re.compile(r'(?:.*)[Pp]assword(?: for .*)?:\ *$', re.M)
 SSH_PASSWORD_PROMP_SUDO_RE = \
     re.compile(r'(?:.*sudo)(?:.*)[Pp]assword(?: for .*)?:', re.M)
@@ -638,15 +644,36 @@ def bootstrap(vm_, opts=None):
         ret['deployed'] = False
         return ret
     else:
-        if win_installer:
-            deployed = deploy_windows(**deploy_kwargs)
-        else:
-            deployed = deploy_script(**deploy_kwargs)
+        deployed = False
+        port_available = True
+        if 'deploy' in _STAGE_LIMITS:
+            # Wait for the VM outside of the deploy stage, so that VMs which
+            # are still booting do not keep others from being deployed. If the
+            # port does not open, the deploy is skipped rather than holding
+            # its slot while waiting for the port again.
+            port_available = wait_for_port(
+                host=deploy_kwargs['host'],
+                port=deploy_kwargs['port'],
+                timeout=deploy_kwargs.get('port_timeout', 15) * 60,
+                gateway=deploy_kwargs.get('gateway')
+            )
+            if not port_available:
+                log.error(
+                    'Port %s on %s did not become available, not deploying '
+                    'Salt on %s', deploy_kwargs['port'], deploy_kwargs['host'],
+                    vm_['name']
+                )
+        if port_available:
+            with create_stage('deploy'):
+                if win_installer:
+                    deployed = deploy_windows(**deploy_kwargs)
+                else:
+                    deployed = deploy_script(**deploy_kwargs)
 
-        if inline_script_config:
-            inline_script_deployed = run_inline_script(**inline_script_kwargs)
-            if inline_script_deployed is not False:
-                log.info('Inline script(s) ha(s|ve) run on %s', vm_['name'])
+            if inline_script_config:
+                inline_script_deployed = run_inline_script(**inline_script_kwargs)
+                if inline_script_deployed is not False:
+                    log.info('Inline script(s) ha(s|ve) run on %s', vm_['name'])
 
         if deployed is not False:
             ret['deployed'] = True
@@ -696,6 +723,53 @@ def ssh_usernames(vm_, opts, default_users=None):
     return usernames
 
 
+def create_stage_limits(opts):
+    '''
+    Return a dict of semaphores limiting how many VMs may be in each of the
+    stages configured in ``cloud_stage_limits`` at the same time. The
+    semaphores are shared by the processes creating VMs in parallel, which
+    must call init_create_stages with them.
+    '''
+    limits = {}
+    for stage, limit in six.iteritems(opts.get('cloud_stage_limits') or {}):
+        if stage not in CREATE_STAGES:
+            log.warning(
+                'Ignoring the limit of unknown VM creation stage \'%s\', '
+                'valid stages are: %s', stage, ', '.join(CREATE_STAGES)
+            )
+            continue
+        if limit:
+            limits[stage] = multiprocessing.BoundedSemaphore(int(limit))
+    return limits
+
+
+def init_create_stages(limits):
+    '''
+    Set the stage limits to be used by this process
+    '''
+    _STAGE_LIMITS.clear()
+    _STAGE_LIMITS.update(limits)
+
+
+@contextlib.contextmanager
+def create_stage(stage):
+    '''
+    Wait until this VM may enter the passed creation stage, and leave it when
+    the context exits. Waits hold the stage only while polling, not while
+    sleeping between polls, so VMs which are slow to boot do not keep others
+    out of the stage.
+    '''
+    limit = _STAGE_LIMITS.get(stage)
+    if limit is None:
+        yield
+        return
+    limit.acquire()
+    try:
+        yield
+    finally:
+        limit.release()
+
+
 def wait_for_fun(fun, timeout=900, **kwargs):
     '''
     Wait until a function finishes, or times out
@@ -759,7 +833,8 @@ def wait_for_port(host, port=22, timeout=900, gateway=None):
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             sock.settimeout(5)
-            sock.connect((test_ssh_host, int(test_ssh_port)))
+            with create_stage('wait_for_ssh'):
+                sock.connect((test_ssh_host, int(test_ssh_port)))
             # Stop any remaining reads/writes on the socket
             sock.shutdown(socket.SHUT_RDWR)
             # Close it!
@@ -2506,7 +2581,8 @@ def wait_for_ip(update_callback,
             'Waiting for VM IP. Giving up in 00:%02d:%02d.',
             int(timeout // 60), int(timeout % 60)
         )
-        data = update_callback(*update_args, **update_kwargs)
+        with create_stage('wait_for_running'):
+            data = update_callback(*update_args, **update_kwargs)
         if data is False:
             log.debug(
                 '\'update_callback\' has returned \'False\', which is '
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+'''
+Compression of the data sent between Salt daemons
+'''
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+import zlib
+
+# Import Salt libs
+from salt.exceptions import SaltInvocationError
+
+# Import 3rd-party libs
+try:
+    import lz4.frame
+    HAS_LZ4 = True
+except ImportError:
+    HAS_LZ4 = False
+
+log = logging.getLogger(__name__)
+
+
+def compress(data, method='zlib'):
+    '''
+    Compress the passed bytes. Returns a tuple of the compression method used
+    and the compressed data. If the lz4 method is requested but the lz4 library
+    is not available, zlib is used instead.
+    '''
+    if method == 'lz4':
+        if HAS_LZ4:
+            return 'lz4', lz4.frame.compress(data)
+        log.warning('The lz4 library is not available, falling back to zlib')
+        method = 'zlib'
+    if method == 'zlib':
+        return 'zlib', zlib.compress(data)
+    raise SaltInvocationError(
+        'Unsupported compression method \'{0}\''.format(method))
+
+
+def decompress(data, method):
+    '''
+    Decompress data compressed using the passed method
+    '''
+    if method == 'zlib':
+        return zlib.decompress(data)
+    if method == 'lz4':
+        if not HAS_LZ4:
+            raise SaltInvocationError(
+                'Unable to decompress lz4 data, the lz4 library is not '
+                'available')
+        return lz4.frame.decompress(data)
+    raise SaltInvocationError(
+        'Unsupported compression method \'{0}\''.format(method))
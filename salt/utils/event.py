@@ -55,6 +55,7 @@ from __future__ import absolute_import, unicode_literals, print_function
 # Import python libs
 import os
 import time
+import errno
 import fnmatch
 import hashlib
 import logging
@@ -71,6 +72,7 @@ from salt.ext.six.moves import range
 
 # Import third party libs
 from salt.ext import six
+import concurrent.futures
 import tornado.ioloop
 import tornado.iostream
 
@@ -1203,10 +1205,26 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
 
         self.opts = opts
         self.event_return_queue = self.opts['event_return_queue']
+        self.event_return_queue_max_seconds = self.opts.get(
+            'event_return_queue_max_seconds', 0)
         local_minion_opts = self.opts.copy()
         local_minion_opts['file_client'] = 'local'
         self.minion = salt.minion.MasterMinion(local_minion_opts)
         self.event_queue = []
+        # The time at which the oldest event in the queue was queued
+        self.event_queue_time = None
+        if self.opts.get('event_return_spool', False):
+            self.spool_dir = os.path.join(
+                self.opts['cachedir'], 'event_return_spool')
+        else:
+            self.spool_dir = None
+        self.serial = salt.payload.Serial(self.opts)
+        # The number of events flushed, and the time taken by the last flush to
+        # each returner
+        self.stats = {'flushed': 0, 'flush_time': {}}
+        # The pool of threads sending the events to multiple returners, which
+        # is started by run()
+        self.executor = None
         self.stop = False
 
     # __setstate__ and __getstate__ are only used on Windows.
@@ -1236,11 +1254,17 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
 
     def flush_events(self):
         if isinstance(self.opts['event_return'], list):
-            # Multiple event returners
+            # Multiple event returners, which are sent the events concurrently
+            # so that a slow returner does not hold up the others
+            event_returns = []
             for r in self.opts['event_return']:
                 log.debug('Calling event returner %s, one of many.', r)
-                event_return = '{0}.event_return'.format(r)
-                self._flush_event_single(event_return)
+                event_returns.append('{0}.event_return'.format(r))
+            if self.executor is not None:
+                list(self.executor.map(self._flush_event_single, event_returns))
+            else:
+                for event_return in event_returns:
+                    self._flush_event_single(event_return)
         else:
             # Only a single event returner
             log.debug('Calling event returner %s, only one configured.',
@@ -1249,10 +1273,18 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
                 self.opts['event_return']
                 )
             self._flush_event_single(event_return)
+        self.stats['flushed'] += len(self.event_queue)
         del self.event_queue[:]
+        self.event_queue_time = None
 
     def _flush_event_single(self, event_return):
         if event_return in self.minion.returners:
+            start = time.time()
+            if self.spool_dir and not self._replay_spool(event_return):
+                # The returner is still failing, spool these events after the
+                # ones already spooled so that they are stored in order
+                self._spool_events(event_return, self.event_queue)
+                return
             try:
                 self.minion.returners[event_return](self.event_queue)
             except Exception as exc:
@@ -1263,31 +1295,145 @@ class EventReturn(salt.utils.process.SignalHandlingMultiprocessingProcess):
                 if log.level <= logging.DEBUG:
                     log.debug('Event data that caused an exception: %s',
                               self.event_queue)
+                if self.spool_dir:
+                    self._spool_events(event_return, self.event_queue)
+            finally:
+                self.stats['flush_time'][event_return] = time.time() - start
+                log.debug(
+                    'Flushed %d event(s) to %s in %.3f seconds',
+                    len(self.event_queue), event_return,
+                    self.stats['flush_time'][event_return]
+                )
         else:
             log.error('Could not store return for event(s) - returner '
                       '\'%s\' not found.', event_return)
 
+    def _spool_events(self, event_return, events):
+        '''
+        Write events which could not be stored by the returner to the spool,
+        to be replayed once the returner is working again. When the spool is
+        full, the oldest events are dropped.
+        '''
+        spool = os.path.join(self.spool_dir, event_return)
+        # The returners are flushed in threads, so the spool is made private
+        # through the modes it is created with rather than the process umask
+        try:
+            for dirname in (self.spool_dir, spool):
+                if not os.path.isdir(dirname):
+                    try:
+                        os.makedirs(dirname, 0o700)
+                    except OSError as exc:
+                        # Another returner's thread created it meanwhile
+                        if exc.errno != errno.EEXIST:
+                            raise
+            batches = sorted(os.listdir(spool))
+            max_batches = self.opts.get('event_return_spool_max_batches', 1000)
+            while batches and len(batches) >= max_batches:
+                log.warning(
+                    'Event return spool for %s is full, dropping the '
+                    'oldest spooled events', event_return
+                )
+                os.remove(os.path.join(spool, batches.pop(0)))
+            # Name the batches so that they sort in the order spooled
+            path = os.path.join(
+                spool,
+                '{0:.6f}-{1:06d}.p'.format(time.time(), len(batches))
+            )
+            fd_ = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd_, 'wb') as fp_:
+                self.serial.dump(events, fp_)
+        except (IOError, OSError) as exc:
+            log.error('Unable to spool events for %s: %s', event_return, exc)
+            return
+        log.debug(
+            'Spooled %d event(s) for %s, %d batch(es) now spooled',
+            len(events), event_return, len(batches) + 1
+        )
+
+    def _replay_spool(self, event_return):
+        '''
+        Send the events spooled for the returner to it, oldest first. Returns
+        False if the returner failed again, otherwise True.
+        '''
+        spool = os.path.join(self.spool_dir, event_return)
+        try:
+            batches = sorted(os.listdir(spool))
+        except (IOError, OSError):
+            return True
+        for batch in batches:
+            path = os.path.join(spool, batch)
+            try:
+                with salt.utils.files.fopen(path, 'rb') as fp_:
+                    events = self.serial.load(fp_)
+            except Exception as exc:
+                log.error('Unable to read spooled events %s: %s', path, exc)
+                os.remove(path)
+                continue
+            try:
+                self.minion.returners[event_return](events)
+            except Exception as exc:
+                log.error('Could not replay spooled events - returner \'%s\' '
+                          'raised exception: %s', event_return, exc)
+                return False
+            os.remove(path)
+            log.debug(
+                'Replayed %d spooled event(s) to %s', len(events), event_return)
+        return True
+
+    def _flush_due(self):
+        '''
+        Returns True if the queued events should be flushed, either because
+        there are enough of them or because the oldest has been queued for
+        longer than event_return_queue_max_seconds.
+        '''
+        if not self.event_queue:
+            return False
+        if len(self.event_queue) >= self.event_return_queue:
+            return True
+        return bool(self.event_return_queue_max_seconds) and \
+            time.time() - self.event_queue_time >= \
+            self.event_return_queue_max_seconds
+
     def run(self):
         '''
         Spin up the multiprocess event returner
         '''
         salt.utils.process.appendproctitle(self.__class__.__name__)
         self.event = get_event('master', opts=self.opts, listen=True)
-        events = self.event.iter_events(full=True)
         self.event.fire_event({}, 'salt/event_listen/start')
+        if isinstance(self.opts['event_return'], list):
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max(len(self.opts['event_return']), 1))
         try:
-            for event in events:
-                if event['tag'] == 'salt/event/exit':
-                    self.stop = True
-                if self._filter(event):
-                    self.event_queue.append(event)
-                if len(self.event_queue) >= self.event_return_queue:
+            while True:
+                wait = 5
+                if self.event_queue and self.event_return_queue_max_seconds:
+                    # Wake up in time to flush the queue, even if no more
+                    # events arrive
+                    wait = min(
+                        wait,
+                        max(self.event_queue_time +
+                            self.event_return_queue_max_seconds -
+                            time.time(), 0.01)
+                    )
+                event = self.event.get_event(wait=wait, full=True)
+                if event is not None:
+                    if event['tag'] == 'salt/event/exit':
+                        self.stop = True
+                    if self._filter(event):
+                        if not self.event_queue:
+                            self.event_queue_time = time.time()
+                        self.event_queue.append(event)
+                if self._flush_due():
                     self.flush_events()
                 if self.stop:
                     break
         finally:  # flush all we have at this moment
             if self.event_queue:
                 self.flush_events()
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
 
     def _filter(self, event):
         '''
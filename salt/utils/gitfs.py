@@ -5,6 +5,7 @@ Classes which provide the shared base for GitFS, git_pillar, and winrepo
 
 # Import python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import binascii
 import copy
 import contextlib
 import errno
@@ -17,6 +18,7 @@ import shlex
 import shutil
 import stat
 import subprocess
+import sys
 import time
 import tornado.ioloop
 import weakref
@@ -24,6 +26,7 @@ from datetime import datetime
 
 # Import salt libs
 import salt.utils.configparser
+import salt.utils.cache
 import salt.utils.data
 import salt.utils.files
 import salt.utils.gzip_util
@@ -49,6 +52,7 @@ from salt.utils.versions import LooseVersion as _LooseVersion
 
 # Import third party libs
 from salt.ext import six
+import concurrent.futures
 
 VALID_REF_TYPES = _DEFAULT_MASTER_OPTS['gitfs_ref_types']
 
@@ -60,6 +64,9 @@ GLOBAL_ONLY = ()
 
 SYMLINK_RECURSE_DEPTH = 100
 
+# The number of blob hashes kept in memory when gitfs_memory_index is enabled
+BLOB_HASH_CACHE_SIZE = 4096
+
 # Auth support (auth params can be global or per-remote, too)
 AUTH_PROVIDERS = ('pygit2',)
 AUTH_PARAMS = ('user', 'password', 'pubkey', 'privkey', 'passphrase',
@@ -1096,6 +1103,12 @@ class GitProvider(object):
                     pass
             return self._linkdir_walk
 
+    def read_blob(self, blob_hexsha):
+        '''
+        This function must be overridden in a sub-class
+        '''
+        raise NotImplementedError()
+
     def setup_callbacks(self):
         '''
         Only needed in pygit2, included in the base class for simplicty of use
@@ -1399,6 +1412,20 @@ class GitPython(GitProvider):
         except (gitdb.exc.ODBError, AttributeError):
             return None
 
+    def read_blob(self, blob_hexsha):
+        '''
+        Return the contents of the blob with the specified SHA straight from
+        the object database, or None if no such blob exists in this repo.
+        '''
+        try:
+            ostream = self.repo.odb.stream(
+                binascii.unhexlify(salt.utils.stringutils.to_bytes(blob_hexsha)))
+        except (gitdb.exc.ODBError, TypeError, ValueError):
+            return None
+        if ostream.type != b'blob':
+            return None
+        return ostream.read()
+
     def write_file(self, blob, dest):
         '''
         Using the blob object, write the file to the destination path
@@ -1418,6 +1445,9 @@ class Pygit2(GitProvider):
             opts, remote, per_remote_defaults, per_remote_only,
             override_params, cache_root, role
         )
+        self.memory_index = self.opts.get(
+            '{0}_memory_index'.format(self.role), False)
+        self._tree_index = {}
 
     def peel(self, obj):
         '''
@@ -1691,6 +1721,16 @@ class Pygit2(GitProvider):
                     )
 
         ret = set()
+        if self.memory_index:
+            index = self.get_tree_index(tgt_env)
+            if index is None:
+                return ret
+            if self.root(tgt_env) and self.root(tgt_env) not in index['dirs']:
+                return ret
+            ret.update(x[1] for x in self._index_paths(index['dirs'], tgt_env))
+            if self.mountpoint(tgt_env):
+                ret.add(self.mountpoint(tgt_env))
+            return ret
         tree = self.get_tree(tgt_env)
         if not tree:
             return ret
@@ -1818,6 +1858,16 @@ class Pygit2(GitProvider):
 
         files = set()
         symlinks = {}
+        if self.memory_index:
+            index = self.get_tree_index(tgt_env)
+            if index is None:
+                # Not found, return empty objects
+                return files, symlinks
+            for repo_path, path in self._index_paths(index['files'], tgt_env):
+                files.add(path)
+                if repo_path in index['symlinks']:
+                    symlinks[path] = index['symlinks'][repo_path]
+            return files, symlinks
         tree = self.get_tree(tgt_env)
         if not tree:
             # Not found, return empty objects
@@ -1850,6 +1900,8 @@ class Pygit2(GitProvider):
         '''
         Find the specified file in the specified environment
         '''
+        if self.memory_index:
+            return self._find_file_in_index(path, tgt_env)
         tree = self.get_tree(tgt_env)
         if not tree:
             # Branch/tag/SHA not found in repo
@@ -1916,6 +1968,108 @@ class Pygit2(GitProvider):
         except (KeyError, TypeError, ValueError, AttributeError):
             return None
 
+    def get_tree_index(self, tgt_env):
+        '''
+        Return an in-memory index of the tree for the specified environment.
+        The index is a dict containing a mapping of every file path in the
+        tree to a (blob hexsha, filemode) tuple, the set of directories in the
+        tree, and a mapping of symlink paths to their targets.
+
+        The index is cached per environment and is only rebuilt when the tree
+        that the environment's ref points to has changed, so repeated calls to
+        file_list, dir_list and find_file do not need to traverse the tree.
+        '''
+        tree = self.get_tree(tgt_env)
+        if not tree:
+            self._tree_index.pop(tgt_env, None)
+            return None
+        try:
+            tree_hexsha = tree.hex
+        except AttributeError:
+            tree_hexsha = six.text_type(tree.id)
+        cached = self._tree_index.get(tgt_env)
+        if cached is not None and cached['tree'] == tree_hexsha:
+            return cached
+
+        log.trace(
+            'Building %s tree index for environment \'%s\' of remote \'%s\'',
+            self.role, tgt_env, self.id
+        )
+        index = {'tree': tree_hexsha, 'files': {}, 'dirs': set(), 'symlinks': {}}
+        trees = [(tree, '')]
+        while trees:
+            cur_tree, prefix = trees.pop()
+            for entry in iter(cur_tree):
+                if entry.oid not in self.repo:
+                    # Entry is a submodule, skip it
+                    continue
+                obj = self.repo[entry.oid]
+                repo_path = salt.utils.path.join(
+                    prefix, entry.name, use_posixpath=True)
+                if isinstance(obj, pygit2.Blob):
+                    index['files'][repo_path] = (obj.hex, entry.filemode)
+                    if stat.S_ISLNK(entry.filemode):
+                        index['symlinks'][repo_path] = obj.data
+                elif isinstance(obj, pygit2.Tree):
+                    index['dirs'].add(repo_path)
+                    trees.append((obj, repo_path))
+        self._tree_index[tgt_env] = index
+        return index
+
+    def _index_paths(self, repo_paths, tgt_env):
+        '''
+        Filter the paths from a tree index to those under the root for the
+        specified environment, yielding tuples of the path within the repo and
+        the path relative to the fileserver (i.e. with the mountpoint applied).
+        '''
+        root = self.root(tgt_env)
+        prefix = root + '/' if root else ''
+        mountpoint = self.mountpoint(tgt_env)
+        for repo_path in repo_paths:
+            if not repo_path.startswith(prefix):
+                continue
+            yield repo_path, salt.utils.path.join(
+                mountpoint, repo_path[len(prefix):], use_posixpath=True)
+
+    def _find_file_in_index(self, path, tgt_env):
+        '''
+        Find the specified file using the in-memory tree index
+        '''
+        index = self.get_tree_index(tgt_env)
+        if index is None:
+            # Branch/tag/SHA not found in repo
+            return None, None, None
+        depth = 0
+        while depth < SYMLINK_RECURSE_DEPTH:
+            depth += 1
+            try:
+                blob_hexsha, mode = index['files'][path]
+            except KeyError:
+                # File not found or path points to a directory
+                break
+            if not stat.S_ISLNK(mode):
+                return self.repo[blob_hexsha], blob_hexsha, mode
+            # Path is a symlink, follow it to the location indicated in the
+            # blob data.
+            path = salt.utils.path.join(
+                os.path.dirname(path),
+                index['symlinks'][path],
+                use_posixpath=True)
+        return None, None, None
+
+    def read_blob(self, blob_hexsha):
+        '''
+        Return the contents of the blob with the specified SHA straight from
+        the object database, or None if no such blob exists in this repo.
+        '''
+        try:
+            blob = self.repo[blob_hexsha]
+        except (KeyError, ValueError, TypeError):
+            return None
+        if not isinstance(blob, pygit2.Blob):
+            return None
+        return blob.data
+
     def setup_callbacks(self):
         '''
         Assign attributes for pygit2 callbacks
@@ -2360,27 +2514,58 @@ class GitBase(object):
             )
             remotes = []
 
+        to_fetch = [
+            repo for repo in self.remotes
+            if not remotes or (repo.id, getattr(repo, 'name', None)) in remotes
+        ]
+        try:
+            concurrency = int(
+                self.opts.get('{0}_fetch_concurrency'.format(self.role), 1))
+        except (TypeError, ValueError):
+            concurrency = 1
+        concurrency = min(concurrency, len(to_fetch))
+
+        if concurrency > 1:
+            log.debug(
+                'Fetching %d %s remotes using %d threads',
+                len(to_fetch), self.role, concurrency
+            )
+            # Each remote has its own repo object and its own update lock, so
+            # the remotes can safely be fetched alongside one another.
+            # executor.map() returns the results in the same order as the
+            # remotes were configured, so errors are reported in that order.
+            with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+                results = list(executor.map(self._fetch_remote, to_fetch))
+        else:
+            results = [self._fetch_remote(repo) for repo in to_fetch]
+
         changed = False
-        for repo in self.remotes:
-            name = getattr(repo, 'name', None)
-            if not remotes or (repo.id, name) in remotes:
-                try:
-                    if repo.fetch():
-                        # We can't just use the return value from repo.fetch()
-                        # because the data could still have changed if old
-                        # remotes were cleared above. Additionally, we're
-                        # running this in a loop and later remotes without
-                        # changes would override this value and make it
-                        # incorrect.
-                        changed = True
-                except Exception as exc:
-                    log.error(
-                        'Exception caught while fetching %s remote \'%s\': %s',
-                        self.role, repo.id, exc,
-                        exc_info=True
-                    )
+        for repo, (fetched, exc_info) in zip(to_fetch, results):
+            if exc_info is not None:
+                log.error(
+                    'Exception caught while fetching %s remote \'%s\': %s',
+                    self.role, repo.id, exc_info[1],
+                    exc_info=exc_info
+                )
+            elif fetched:
+                # We can't just use the return value from repo.fetch()
+                # because the data could still have changed if old remotes
+                # were cleared above. Additionally, later remotes without
+                # changes would override this value and make it incorrect.
+                changed = True
         return changed
 
+    @staticmethod
+    def _fetch_remote(repo):
+        '''
+        Fetch a single remote, returning a tuple of the result of the fetch and
+        the exception info for any exception raised while fetching.
+        '''
+        try:
+            return repo.fetch(), None
+        except Exception:
+            return False, sys.exc_info()
+
     def lock(self, remote=None):
         '''
         Place an update.lk
@@ -2710,6 +2895,9 @@ class GitFS(GitBase):
                     else GIT_PROVIDERS,
                 cache_root=cache_root,
                 init_remotes=init_remotes)
+            # In-memory caches used when gitfs_memory_index is enabled
+            obj._last_blob = (None, None)
+            obj._blob_hashes = salt.utils.cache.LRUCache(BLOB_HASH_CACHE_SIZE)
             if not init_remotes:
                 log.debug('Created gitfs object with uninitialized remotes')
             else:
@@ -2763,6 +2951,9 @@ class GitFS(GitBase):
             return fnd
 
         dest = salt.utils.path.join(self.cache_root, 'refs', tgt_env, path)
+        if self.opts.get('gitfs_memory_index', False):
+            return self._find_blob(path, tgt_env, dest, fnd)
+
         hashes_glob = salt.utils.path.join(self.hash_cachedir,
                                            tgt_env,
                                            '{0}.hash.*'.format(path))
@@ -2851,6 +3042,50 @@ class GitFS(GitBase):
         # so the calling function knows the file could not be found.
         return fnd
 
+    def _find_blob(self, path, tgt_env, dest, fnd):
+        '''
+        Find the first file to match the path and ref without writing it to
+        the fileserver cache. The blob SHA is added to the return dict so that
+        serve_file and file_hash can read the file contents straight from the
+        object database. The 'path' key is still populated with the location
+        the file would be cached to, since the fileserver uses this to
+        determine whether or not the file was found.
+        '''
+        for repo in self.remotes:
+            if repo.mountpoint(tgt_env) \
+                    and not path.startswith(repo.mountpoint(tgt_env) + os.sep):
+                continue
+            repo_path = path[len(repo.mountpoint(tgt_env)):].lstrip(os.sep)
+            if repo.root(tgt_env):
+                repo_path = salt.utils.path.join(repo.root(tgt_env), repo_path)
+
+            blob, blob_hexsha, blob_mode = repo.find_file(repo_path, tgt_env)
+            if blob is None:
+                continue
+            fnd['rel'] = path
+            fnd['path'] = dest
+            fnd['blob'] = blob_hexsha
+            if blob_mode is not None:
+                fnd['stat'] = [blob_mode]
+            return fnd
+        return fnd
+
+    def _read_blob(self, blob_hexsha):
+        '''
+        Return the contents of a blob from the first remote which contains it.
+        The most recently read blob is kept in memory, as files larger than
+        the file_buffer_size are served in several consecutive chunks.
+        '''
+        cached_hexsha, data = self._last_blob
+        if cached_hexsha == blob_hexsha:
+            return data
+        for repo in self.remotes:
+            data = repo.read_blob(blob_hexsha)
+            if data is not None:
+                self._last_blob = (blob_hexsha, data)
+                return data
+        return None
+
     def serve_file(self, load, fnd):
         '''
         Return a chunk from a file based on the data received
@@ -2872,6 +3107,19 @@ class GitFS(GitBase):
             return ret
         ret['dest'] = fnd['rel']
         gzip = load.get('gzip', None)
+        if fnd.get('blob'):
+            blob_data = self._read_blob(fnd['blob'])
+            if blob_data is None:
+                return ret
+            data = blob_data[load['loc']:load['loc'] + self.opts['file_buffer_size']]
+            if data and six.PY3 \
+                    and not salt.utils.stringutils.is_binary(blob_data[:2048]):
+                data = data.decode(__salt_system_encoding__)
+            if gzip and data:
+                data = salt.utils.gzip_util.compress(data, gzip)
+                ret['gzip'] = gzip
+            ret['data'] = data
+            return ret
         fpath = os.path.normpath(fnd['path'])
         with salt.utils.files.fopen(fpath, 'rb') as fp_:
             fp_.seek(load['loc'])
@@ -2895,6 +3143,21 @@ class GitFS(GitBase):
         if not all(x in load for x in ('path', 'saltenv')):
             return '', None
         ret = {'hash_type': self.opts['hash_type']}
+        if fnd.get('blob'):
+            # The blob SHA uniquely identifies the file contents, so the hash
+            # only needs to be computed once per blob and can be kept in memory
+            # rather than in the hash cachedir.
+            hash_key = (fnd['blob'], self.opts['hash_type'])
+            hsum = self._blob_hashes.get(hash_key)
+            if hsum is None:
+                blob_data = self._read_blob(fnd['blob'])
+                if blob_data is None:
+                    return ''
+                hsum = getattr(
+                    hashlib, self.opts['hash_type'])(blob_data).hexdigest()
+                self._blob_hashes.set(hash_key, hsum)
+            ret['hsum'] = hsum
+            return ret
         relpath = fnd['rel']
         path = fnd['path']
         hashdest = salt.utils.path.join(self.hash_cachedir,
@@ -10,6 +10,7 @@ import os
 import fnmatch
 import re
 import logging
+import time
 
 # Import salt libs
 import salt.payload
@@ -689,6 +690,71 @@ class CkMinions(object):
                 mlist.append(fn_)
         return {'minions': mlist, 'missing': []}
 
+    def _syndic_summaries(self):
+        '''
+        Return a dict mapping each syndic of this master to the list of minion
+        IDs it last sent, or None if any registered syndic has not sent its
+        minion IDs recently
+        '''
+        interval = self.opts.get('syndic_summary_interval', 0)
+        if not interval:
+            return None
+        syndic_dir = self.opts.get(
+            'syndic_dir', os.path.join(self.opts['cachedir'], 'syndics'))
+        try:
+            syndics = os.listdir(syndic_dir)
+        except OSError:
+            return {}
+        summaries = {}
+        for syndic in syndics:
+            try:
+                with salt.utils.files.fopen(os.path.join(syndic_dir, syndic), 'rb') as fn_:
+                    summary = self.serial.load(fn_)
+            except Exception as exc:
+                log.debug('Unable to read the summary of syndic %s: %s', syndic, exc)
+                return None
+            if not isinstance(summary, dict) \
+                    or time.time() - summary.get('time', 0) > 3 * interval:
+                log.debug('The summary of syndic %s is out of date', syndic)
+                return None
+            summaries[syndic] = summary.get('minions', [])
+        return summaries
+
+    def summary_minions(self):
+        '''
+        Return the IDs of the minions accepted by this master and of the
+        minions below its own syndics, which a syndic running next to this
+        master sends to its masters
+        '''
+        minions = set(self._pki_minions())
+        for ids in six.itervalues(self._syndic_summaries() or {}):
+            minions.update(ids)
+        return sorted(minions)
+
+    def check_syndic_minions(self, expr, tgt_type='glob'):
+        '''
+        Return the minions below the syndics of this master which match the
+        passed target, using the minion IDs sent by the syndics. Returns None if
+        the target cannot be resolved using the minion IDs, or if any of the
+        syndics has not sent its minion IDs recently.
+        '''
+        if tgt_type not in ('glob', 'pcre', 'list'):
+            return None
+        summaries = self._syndic_summaries()
+        if summaries is None:
+            return None
+        ids = set()
+        for minions in six.itervalues(summaries):
+            ids.update(minions)
+        if tgt_type == 'glob':
+            return fnmatch.filter(ids, expr)
+        if tgt_type == 'pcre':
+            reg = re.compile(expr)
+            return [m for m in ids if reg.match(m)]
+        if isinstance(expr, six.string_types):
+            expr = [m for m in expr.split(',') if m]
+        return [x for x in expr if x in ids]
+
     def check_minions(self,
                       expr,
                       tgt_type='glob',
@@ -2086,6 +2086,24 @@ class SaltCMDOptionParser(six.with_metaclass(OptionParserMeta,
             help=('Wait the specified time in seconds after each job is done '
                   'before freeing the slot in the batch for the next one.')
         )
+        self.add_option(
+            '--batch-adaptive',
+            default=False,
+            dest='batch_adaptive',
+            action='store_true',
+            help=('Adjust the batch size while the job runs, growing it while '
+                  'minions complete the job quickly and successfully, and '
+                  'halving it when minions fail, time out or slow down. The '
+                  'batch size passed with --batch-size is the initial size.')
+        )
+        self.add_option(
+            '--batch-max',
+            default=0,
+            dest='batch_max',
+            type=int,
+            help=('The maximum batch size used with --batch-adaptive. '
+                  'Default: the number of targeted minions.')
+        )
         self.add_option(
             '--batch-safe-limit',
             default=0,
@@ -2996,6 +3014,26 @@ class SaltSSHOptionParser(six.with_metaclass(OptionParserMeta,
                  'time to manage connections, the more running processes the '
                  'faster communication should be. Default: %default.'
         )
+        self.add_option(
+            '--event-loop',
+            dest='ssh_async',
+            default=False,
+            action='store_true',
+            help='Run the ssh sessions from a single process using an event '
+                 'loop instead of starting a process for each target. This '
+                 'allows many more targets to be contacted at a time. '
+                 'Targets using password authentication, a tty or wrapper '
+                 'functions are run in a pool of processes, sized by '
+                 '--max-procs.'
+        )
+        self.add_option(
+            '--max-sessions',
+            dest='ssh_max_sessions',
+            default=250,
+            type=int,
+            help='Set the number of concurrent ssh sessions when --event-loop '
+                 'is used. Default: %default.'
+        )
         self.add_option(
             '--extra-filerefs',
             dest='extra_filerefs',
@@ -3191,6 +3229,14 @@ class SaltSSHOptionParser(six.with_metaclass(OptionParserMeta,
             dest='ssh_scan_timeout',
             help='Scanning socket timeout for the scan roster.',
         )
+        scan_group.add_option(
+            '--scan-concurrency',
+            default=100,
+            type=int,
+            dest='ssh_scan_concurrency',
+            help='The number of addresses scanned at a time by the scan '
+                 'roster.',
+        )
         self.add_option_group(scan_group)
 
     def _mixin_after_parsed(self):
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+'''
+Rate limiting utilities
+'''
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import threading
+import time
+
+
+class TokenBucket(object):
+    '''
+    A token bucket, which allows up to ``rate`` operations per second on
+    average, and bursts of up to ``burst`` operations.
+
+    .. code-block:: python
+
+        bucket = TokenBucket(100, 200)
+        wait = bucket.consume()
+        if wait:
+            # Rate limited, try again in ``wait`` seconds
+            ...
+    '''
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.tokens = self.burst
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.time()
+        self.tokens = min(
+            self.burst,
+            self.tokens + (now - self._last) * self.rate
+        )
+        self._last = now
+
+    def consume(self, tokens=1, reserve=0):
+        '''
+        Take tokens from the bucket. Returns 0 if the tokens were taken,
+        otherwise the number of seconds until enough tokens will be available.
+
+        reserve
+            The number of tokens which must be left in the bucket, which can be
+            used to keep some capacity for more important operations.
+        '''
+        with self._lock:
+            self._refill()
+            if self.tokens - tokens >= reserve:
+                self.tokens -= tokens
+                return 0
+            return (tokens + reserve - self.tokens) / self.rate
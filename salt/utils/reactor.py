@@ -9,7 +9,9 @@ from __future__ import absolute_import, print_function, unicode_literals
 import collections
 import fnmatch
 import glob
+import hashlib
 import logging
+import os
 import time
 
 # Import salt libs
@@ -21,8 +23,12 @@ import salt.utils.cache
 import salt.utils.data
 import salt.utils.event
 import salt.utils.files
+import salt.utils.json
 import salt.utils.master
 import salt.utils.process
+import salt.utils.ratelimit
+import salt.utils.stringutils
+import salt.utils.templates
 import salt.utils.yaml
 import salt.wheel
 import salt.defaults.exitcodes
@@ -43,6 +49,77 @@ REACTOR_INTERNAL_KEYWORDS = frozenset([
     'state',
 ])
 
+# The reaction types which run on the master in a pool of worker threads
+POOLED_REACTION_TYPES = ('runner', 'wheel')
+
+
+class ReactorIndex(object):
+    '''
+    Index of the tag globs of a reactor map, used to find the reactors for an
+    event tag without running fnmatch against every glob. Globs without any
+    wildcards are looked up in a dict, the others are stored in a trie under
+    the literal prefix before their first wildcard, so only the globs whose
+    prefix matches the tag are run through fnmatch. Tags which no glob can
+    match are rejected after walking at most the length of the tag.
+    '''
+    wildcards = frozenset('*?[')
+
+    def __init__(self, react_map):
+        self.exact = {}
+        # char -> node, the None key of a node holds the globs whose literal
+        # prefix ends there
+        self.trie = {}
+        for order, ropt in enumerate(react_map or ()):
+            if not isinstance(ropt, dict) or len(ropt) != 1:
+                continue
+            key = next(six.iterkeys(ropt))
+            val = ropt[key]
+            if isinstance(val, six.string_types):
+                val = [val]
+            elif not isinstance(val, list):
+                continue
+            if not isinstance(key, six.string_types):
+                continue
+            entry = (order, key, val)
+            # fnmatch normalizes the case on case-insensitive platforms
+            pattern = os.path.normcase(key)
+            prefix = []
+            for char in pattern:
+                if char in self.wildcards:
+                    break
+                prefix.append(char)
+            if len(prefix) == len(pattern):
+                self.exact.setdefault(pattern, []).append(entry)
+                continue
+            node = self.trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node.setdefault(None, []).append(entry)
+
+    def match(self, tag):
+        '''
+        Return the list of reactors for the event tag, in the order in which
+        they are configured
+        '''
+        ntag = os.path.normcase(tag)
+        entries = list(self.exact.get(ntag, ()))
+        node = self.trie
+        for char in ntag:
+            for entry in node.get(None, ()):
+                if fnmatch.fnmatch(tag, entry[1]):
+                    entries.append(entry)
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            for entry in node.get(None, ()):
+                if fnmatch.fnmatch(tag, entry[1]):
+                    entries.append(entry)
+        reactors = []
+        for _, _, val in sorted(entries, key=lambda entry: entry[0]):
+            reactors.extend(val)
+        return reactors
+
 
 class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.state.Compiler):
     '''
@@ -65,6 +142,10 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
         self.stats = collections.defaultdict(lambda: {'mean': 0, 'latency': 0, 'runs': 0})
         self.stat_clock = time.time()
         self.is_leader = True
+        self.rate_limits = self._rate_limits()
+        self._index = None
+        # The last time each recently seen event was reacted to
+        self.recent_events = salt.utils.cache.LRUCache(10000)
 
     # We need __setstate__ and __getstate__ to avoid pickling errors since
     # 'self.rend' (from salt.state.Compiler) contains a function reference
@@ -97,6 +178,62 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
             self.stats = collections.defaultdict(lambda: {'mean': 0, 'latency': 0, 'runs': 0})
             self.stat_clock = end_time
 
+    def _rate_limits(self):
+        '''
+        Return the token buckets limiting the rate of the reactions to the tags
+        configured in ``reactor_rate_limit``
+        '''
+        buckets = []
+        for tag, limit in six.iteritems(self.opts.get('reactor_rate_limit') or {}):
+            if isinstance(limit, dict):
+                rate, burst = limit.get('rate'), limit.get('burst')
+            else:
+                rate, burst = limit, None
+            try:
+                buckets.append(
+                    (tag, salt.utils.ratelimit.TokenBucket(float(rate), burst))
+                )
+            except (TypeError, ValueError):
+                log.error(
+                    'Invalid reactor_rate_limit for tag %s: %s', tag, limit
+                )
+        return buckets
+
+    def skip_event(self, tag, data):
+        '''
+        Return True if the reactions to an event should be skipped, because an
+        identical event was reacted to less than ``reactor_dedup_window``
+        seconds ago, or because the events matching one of the tags in
+        ``reactor_rate_limit`` are arriving faster than allowed
+        '''
+        window = self.opts.get('reactor_dedup_window')
+        if window:
+            # The timestamp differs for every event, even identical ones
+            key = hashlib.sha1(
+                salt.utils.stringutils.to_bytes(
+                    salt.utils.json.dumps(
+                        [tag, dict((k, v) for k, v in six.iteritems(data)
+                                   if k != '_stamp')],
+                        sort_keys=True,
+                        default=repr
+                    )
+                )
+            ).hexdigest()
+            now = time.time()
+            last = self.recent_events.get(key)
+            if last is not None and now - last < window:
+                log.debug('Skipping reactions to duplicate event %s', tag)
+                return True
+            self.recent_events.set(key, now)
+        for pattern, bucket in self.rate_limits:
+            if fnmatch.fnmatch(tag, pattern) and bucket.consume():
+                log.debug(
+                    'Skipping reactions to event %s, the rate limit of %s '
+                    'was exceeded', tag, pattern
+                )
+                return True
+        return False
+
     def render_reaction(self, glob_ref, tag, data):
         '''
         Execute the render system against a single reaction file and return
@@ -126,36 +263,42 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
                 log.exception('Failed to render "%s": ', fn_)
         return react
 
+    def _reactor_index(self):
+        '''
+        Return the index of the reactor map, which is built again when the
+        reactor map file changes or reactors are added or deleted
+        '''
+        reactor = self.opts['reactor']
+        if isinstance(reactor, six.string_types):
+            try:
+                stat = os.stat(reactor)
+                key = (reactor, stat.st_mtime, stat.st_size)
+            except OSError:
+                key = (reactor, None, None)
+        else:
+            key = id(reactor)
+        if self._index is None or self._index[0] != key:
+            react_map = []
+            if isinstance(reactor, six.string_types):
+                try:
+                    with salt.utils.files.fopen(reactor) as fp_:
+                        react_map = salt.utils.yaml.safe_load(fp_)
+                except (OSError, IOError):
+                    log.error('Failed to read reactor map: "%s"', reactor)
+                except Exception:
+                    log.error('Failed to parse YAML in reactor map: "%s"', reactor)
+            else:
+                react_map = reactor
+            self._index = (key, ReactorIndex(react_map))
+        return self._index[1]
+
     def list_reactors(self, tag):
         '''
         Take in the tag from an event and return a list of the reactors to
         process
         '''
         log.debug('Gathering reactors for tag %s', tag)
-        reactors = []
-        if isinstance(self.opts['reactor'], six.string_types):
-            try:
-                with salt.utils.files.fopen(self.opts['reactor']) as fp_:
-                    react_map = salt.utils.yaml.safe_load(fp_)
-            except (OSError, IOError):
-                log.error('Failed to read reactor map: "%s"', self.opts['reactor'])
-            except Exception:
-                log.error('Failed to parse YAML in reactor map: "%s"', self.opts['reactor'])
-        else:
-            react_map = self.opts['reactor']
-        for ropt in react_map:
-            if not isinstance(ropt, dict):
-                continue
-            if len(ropt) != 1:
-                continue
-            key = next(six.iterkeys(ropt))
-            val = ropt[key]
-            if fnmatch.fnmatch(tag, key):
-                if isinstance(val, six.string_types):
-                    reactors.append(val)
-                elif isinstance(val, list):
-                    reactors.extend(val)
-        return reactors
+        return self._reactor_index().match(tag)
 
     def list_all(self):
         '''
@@ -189,6 +332,7 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
                 return {'status': False, 'comment': 'Reactor already exists.'}
 
         self.minion.opts['reactor'].append({tag: reaction})
+        self._index = None
         return {'status': True, 'comment': 'Reactor added.'}
 
     def delete_reactor(self, tag):
@@ -200,6 +344,7 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
             _tag = next(six.iterkeys(reactor))
             if _tag == tag:
                 self.minion.opts['reactor'].remove(reactor)
+                self._index = None
                 return {'status': True, 'comment': 'Reactor deleted.'}
 
         return {'status': False, 'comment': 'Reactor does not exists.'}
@@ -261,6 +406,8 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
                 opts=self.opts,
                 listen=True)
         self.wrap = ReactWrap(self.opts)
+        salt.utils.templates.JINJA_CODE_CACHE.maxsize = \
+            self.opts.get('reactor_template_cache_size', 0)
 
         for data in self.event.iter_events(full=True):
             # skip all events fired by ourselves
@@ -310,6 +457,8 @@ class Reactor(salt.utils.process.SignalHandlingMultiprocessingProcess, salt.stat
                 reactors = self.list_reactors(data['tag'])
                 if not reactors:
                     continue
+                if self.skip_event(data['tag'], data['data']):
+                    continue
                 chunks = self.reactions(data['tag'], data['data'], reactors)
                 if chunks:
                     if self.opts['master_stats']:
@@ -345,10 +494,24 @@ class ReactWrap(object):
         if ReactWrap.client_cache is None:
             ReactWrap.client_cache = salt.utils.cache.CacheDict(opts['reactor_refresh_interval'])
 
-        self.pool = salt.utils.process.ThreadPool(
-            self.opts['reactor_worker_threads'],  # number of workers for runner/wheel
-            queue_size=self.opts['reactor_worker_hwm']  # queue size for those workers
-        )
+        # Each pooled reaction type gets its own workers, so that slow runners
+        # do not hold up wheel reactions, and the other way around
+        self.pools = {}
+        for reaction_type in POOLED_REACTION_TYPES:
+            self.pools[reaction_type] = salt.utils.process.ThreadPool(
+                self._worker_threads(reaction_type),
+                queue_size=self.opts['reactor_worker_hwm']  # queue size for those workers
+            )
+
+    def _worker_threads(self, reaction_type):
+        '''
+        Return the number of workers for the passed reaction type, which is
+        either set for all types or for each type in ``reactor_worker_threads``
+        '''
+        threads = self.opts['reactor_worker_threads']
+        if isinstance(threads, dict):
+            return threads.get(reaction_type, 10)
+        return threads
 
     def populate_client_cache(self, low):
         '''
@@ -493,13 +656,13 @@ class ReactWrap(object):
         '''
         Wrap RunnerClient for executing :ref:`runner modules <all-salt.runners>`
         '''
-        return self.pool.fire_async(self.client_cache['runner'].low, args=(fun, kwargs))
+        return self.pools['runner'].fire_async(self.client_cache['runner'].low, args=(fun, kwargs))
 
     def wheel(self, fun, **kwargs):
         '''
         Wrap Wheel to enable executing :ref:`wheel modules <all-salt.wheel>`
         '''
-        return self.pool.fire_async(self.client_cache['wheel'].low, args=(fun, kwargs))
+        return self.pools['wheel'].fire_async(self.client_cache['wheel'].low, args=(fun, kwargs))
 
     def local(self, fun, tgt, **kwargs):
         '''
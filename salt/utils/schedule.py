@@ -22,6 +22,7 @@ import itertools
 import threading
 import logging
 import errno
+import heapq
 import random
 import weakref
 
@@ -153,6 +154,14 @@ class Schedule(object):
         self.schedule_returner = self.option('schedule_returner')
         # Keep track of the lowest loop interval needed in this variable
         self.loop_interval = six.MAXSIZE
+        # Jobs which do not need to be looked at again before their next fire
+        # time, mapped to their data and that time, and a heap of those times
+        self._deadlines = {}
+        self._deadline_heap = []
+        # When every job is indexed, the schedule does not need to be
+        # evaluated again before the earliest deadline
+        self._wakeup = None
+        self._wakeup_key = None
         if not self.standalone:
             clean_proc_dir(opts)
         if cleanup:
@@ -284,6 +293,7 @@ class Schedule(object):
         '''
         Deletes a job from the scheduler. Ignore jobs from pillar
         '''
+        self._wakeup = None
         # ensure job exists, then delete it
         if name in self.opts['schedule']:
             del self.opts['schedule'][name]
@@ -307,6 +317,7 @@ class Schedule(object):
         '''
         Reset the scheduler to defaults
         '''
+        self._wakeup = None
         self.skip_function = None
         self.skip_during_range = None
         self.enabled = True
@@ -317,6 +328,7 @@ class Schedule(object):
         '''
         Deletes a job from the scheduler. Ignores jobs from pillar
         '''
+        self._wakeup = None
         # ensure job exists, then delete it
         for job in list(self.opts['schedule'].keys()):
             if job.startswith(name):
@@ -345,7 +357,7 @@ class Schedule(object):
         the configuration file. See the docs on how YAML is interpreted into
         python data-structures to make sure, you pass correct dictionaries.
         '''
-
+        self._wakeup = None
         # we don't do any checking here besides making sure its a dict.
         # eval() already does for us and raises errors accordingly
         if not isinstance(data, dict):
@@ -385,6 +397,7 @@ class Schedule(object):
         '''
         Enable a job in the scheduler. Ignores jobs from pillar
         '''
+        self._wakeup = None
         # ensure job exists, then enable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = True
@@ -405,6 +418,7 @@ class Schedule(object):
         '''
         Disable a job in the scheduler. Ignores jobs from pillar
         '''
+        self._wakeup = None
         # ensure job exists, then disable it
         if name in self.opts['schedule']:
             self.opts['schedule'][name]['enabled'] = False
@@ -425,6 +439,7 @@ class Schedule(object):
         '''
         Modify a job in the scheduler. Ignores jobs from pillar
         '''
+        self._wakeup = None
         # ensure job exists, then replace it
         if name in self.opts['schedule']:
             self.delete_job(name, persist)
@@ -473,6 +488,7 @@ class Schedule(object):
         '''
         Enable the scheduler.
         '''
+        self._wakeup = None
         self.opts['schedule']['enabled'] = True
 
         # Fire the complete event back along with updated list of schedule
@@ -484,6 +500,7 @@ class Schedule(object):
         '''
         Disable the scheduler.
         '''
+        self._wakeup = None
         self.opts['schedule']['enabled'] = False
 
         # Fire the complete event back along with updated list of schedule
@@ -495,6 +512,7 @@ class Schedule(object):
         '''
         Reload the schedule from saved schedule file.
         '''
+        self._wakeup = None
         # Remove all jobs from self.intervals
         self.intervals = {}
 
@@ -534,6 +552,7 @@ class Schedule(object):
         Postpone a job in the scheduler.
         Ignores jobs from pillar
         '''
+        self._wakeup = None
         time = data['time']
         new_time = data['new_time']
         time_fmt = data.get('time_fmt', '%Y-%m-%dT%H:%M:%S')
@@ -564,6 +583,7 @@ class Schedule(object):
         Skip a job at a specific time in the scheduler.
         Ignores jobs from pillar
         '''
+        self._wakeup = None
         time = data['time']
         time_fmt = data.get('time_fmt', '%Y-%m-%dT%H:%M:%S')
 
@@ -850,6 +870,51 @@ class Schedule(object):
                         # Let's make sure we exit the process!
                         sys.exit(salt.defaults.exitcodes.EX_GENERIC)
 
+    def _job_deadline(self, data):
+        '''
+        Return the time before which an evaluated job cannot fire, or None if
+        the job has to be evaluated on every pass of the scheduler
+        '''
+        if self.standalone or not self.enabled:
+            return None
+        if not data.get('enabled', True) or data.get('splay'):
+            return None
+        if data.get('_run_on_start') or 'run_explicit' in data:
+            return None
+        if '_seconds' not in data and 'cron' not in data:
+            return None
+        next_fire_time = data.get('_next_fire_time')
+        if not isinstance(next_fire_time, datetime.datetime):
+            return None
+        return next_fire_time - datetime.timedelta(
+            microseconds=next_fire_time.microsecond)
+
+    def _index_job(self, job, data):
+        '''
+        Record when an evaluated job has to be looked at next
+        '''
+        deadline = self._job_deadline(data)
+        if deadline is None:
+            self._deadlines.pop(job, None)
+            return False
+        current = self._deadlines.get(job)
+        if current is None or current[0] is not data or current[1] != deadline:
+            self._deadlines[job] = (data, deadline)
+            heapq.heappush(self._deadline_heap, (deadline, job))
+        return True
+
+    def _next_deadline(self):
+        '''
+        Return the earliest deadline of the indexed jobs
+        '''
+        while self._deadline_heap:
+            deadline, job = self._deadline_heap[0]
+            indexed = self._deadlines.get(job)
+            if indexed is not None and indexed[1] == deadline:
+                return deadline
+            heapq.heappop(self._deadline_heap)
+        return None
+
     def eval(self, now=None):
         '''
         Evaluate and execute the schedule
@@ -860,6 +925,15 @@ class Schedule(object):
 
         log.trace('==== evaluating schedule now %s =====', now)
 
+        wakeup_key = (self.opts.get('schedule'), self.opts.get('pillar'))
+        if now is None and self._wakeup is not None:
+            # Nothing can fire before the earliest deadline unless the
+            # schedule itself has changed since it was computed
+            if all(a is b for a, b in zip(wakeup_key, self._wakeup_key)) \
+                    and datetime.datetime.now() < self._wakeup:
+                return
+        self._wakeup = None
+
         loop_interval = self.opts['loop_interval']
         if not isinstance(loop_interval, datetime.timedelta):
             loop_interval = datetime.timedelta(seconds=loop_interval)
@@ -1320,6 +1394,12 @@ class Schedule(object):
                    'skip_function',
                    'skip_during_range',
                    'splay']
+
+        if not now:
+            now = datetime.datetime.now()
+
+        evaluated = []
+        indexed = True
         for job, data in six.iteritems(schedule):
 
             # Skip anything that is a global setting
@@ -1337,6 +1417,14 @@ class Schedule(object):
                     del data[item]
             run = False
 
+            # Jobs which were indexed when they were last evaluated only
+            # need to be looked at again once their deadline has passed
+            if job in self._deadlines and self._deadlines[job][0] is data:
+                deadline = self._job_deadline(data)
+                if deadline is not None and _chop_ms(now) < deadline:
+                    continue
+            evaluated.append((job, data))
+
             if 'name' in data:
                 job_name = data['name']
             else:
@@ -1376,9 +1464,6 @@ class Schedule(object):
                     '_run_on_start' not in data:
                 data['_run_on_start'] = True
 
-            if not now:
-                now = datetime.datetime.now()
-
             # Used for quick lookups when detecting invalid option
             # combinations.
             schedule_keys = set(data.keys())
@@ -1636,6 +1721,22 @@ class Schedule(object):
                     elif run:
                         data['_next_fire_time'] = now + datetime.timedelta(seconds=data['_seconds'])
 
+        for job, data in evaluated:
+            if not isinstance(data, dict) or not self._index_job(job, data):
+                indexed = False
+
+        # Forget about jobs which have been removed from the schedule
+        for job in list(self._deadlines):
+            if job not in schedule:
+                del self._deadlines[job]
+
+        # Always look at the heap, so entries of jobs which have fired since
+        # they were pushed are dropped
+        wakeup = self._next_deadline()
+        if indexed:
+            self._wakeup = wakeup
+            self._wakeup_key = wakeup_key
+
     def _run_job(self, func, data):
         job_dry_run = data.get('dry_run', False)
         if job_dry_run:
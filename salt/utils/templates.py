@@ -27,6 +27,7 @@ else:
     USE_IMPORTLIB = False
 
 # Import Salt libs
+import salt.utils.cache
 import salt.utils.data
 import salt.utils.dateutils
 import salt.utils.http
@@ -53,6 +54,10 @@ TEMPLATE_DIRNAME = os.path.join(saltpath[0], 'templates')
 SLS_ENCODING = 'utf-8'  # this one has no BOM.
 SLS_ENCODER = codecs.getencoder(SLS_ENCODING)
 
+# Code compiled from Jinja templates. The cache is disabled unless a process
+# sets its maxsize, as the reactor does using reactor_template_cache_size.
+JINJA_CODE_CACHE = salt.utils.cache.LRUCache(0)
+
 
 class AliasedLoader(object):
     '''
@@ -287,6 +292,29 @@ def _get_jinja_error(trace, context=None):
     return line, out
 
 
+def _jinja_from_string(jinja_env, tmplstr, env_args):
+    '''
+    Return a template for the passed string. When the compiled template cache
+    is enabled, the code compiled from templates rendered before using the same
+    environment settings is reused.
+    '''
+    if JINJA_CODE_CACHE.maxsize <= 0:
+        return jinja_env.from_string(tmplstr)
+    key = (
+        salt.utils.hashutils.sha1_digest(tmplstr),
+        repr(sorted(
+            (name, value) for name, value in six.iteritems(env_args)
+            if name != 'loader'
+        )),
+    )
+    code = JINJA_CODE_CACHE.get(key)
+    if code is None:
+        code = jinja_env.compile(tmplstr)
+        JINJA_CODE_CACHE.set(key, code)
+    return jinja_env.template_class.from_code(
+        jinja_env, code, jinja_env.make_globals(None))
+
+
 def render_jinja_tmpl(tmplstr, context, tmplpath=None):
     opts = context['opts']
     saltenv = context['saltenv']
@@ -387,7 +415,7 @@ def render_jinja_tmpl(tmplstr, context, tmplpath=None):
             decoded_context[key] = salt.utils.data.decode(value)
 
     try:
-        template = jinja_env.from_string(tmplstr)
+        template = _jinja_from_string(jinja_env, tmplstr, env_args)
         template.globals.update(decoded_context)
         output = template.render(**decoded_context)
     except jinja2.exceptions.UndefinedError as exc:
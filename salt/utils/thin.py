@@ -7,8 +7,10 @@ Generate the salt thin tarball from the installed python files
 from __future__ import absolute_import, print_function, unicode_literals
 
 import copy
+import gzip
 import logging
 import os
+import re
 import shutil
 import subprocess
 import sys
@@ -578,6 +580,119 @@ def thin_sum(cachedir, form='sha1'):
     return code_checksum, salt.utils.hashutils.get_hash(thintar, form)
 
 
+def _thin_layer_name(arcname):
+    '''
+    Return the name of the layer of the salt-thin tarball a file belongs to,
+    which is the package (or single file module) the file is part of, or an
+    empty string for the files at the root of the tarball
+    '''
+    parts = arcname.split('/')
+    site_pkg_re = re.compile(r'^py(?:all|\d+)$')
+    if len(parts) == 1:
+        return ''
+    if site_pkg_re.match(parts[0]):
+        return '/'.join(parts[:2])
+    if len(parts) > 2 and site_pkg_re.match(parts[1]):
+        # A package of an alternative Salt version namespace
+        return '/'.join(parts[:3])
+    return parts[0]
+
+
+def _write_thin_layer(thin, members, path):
+    '''
+    Write the passed members of the thin tarball to a new tarball. The output
+    only depends on the members, so that unchanged layers have the same digest
+    each time the thin tarball is generated.
+    '''
+    with salt.utils.files.fopen(path, 'wb') as fp_:
+        gzfp = gzip.GzipFile(filename='', mode='wb', fileobj=fp_, mtime=0)
+        try:
+            tfp = tarfile.open(fileobj=gzfp, mode='w')
+            try:
+                for member in sorted(members, key=lambda member: member.name):
+                    if member.isfile():
+                        tfp.addfile(member, thin.extractfile(member))
+                    else:
+                        tfp.addfile(member)
+            finally:
+                tfp.close()
+        finally:
+            gzfp.close()
+
+
+def thin_layers(thintar, form='sha1'):
+    '''
+    Split the passed salt-thin tarball into content addressed layers, one for
+    each package it contains and one for the files at its root. Returns a
+    list of ``(digest, path)`` tuples, where the digest is the checksum of the
+    layer's tarball, allowing targets to only be sent the layers they do not
+    already have.
+
+    The layers are kept in the ``layers`` directory next to the thin tarball,
+    and are only split again when the thin tarball changes. A layer which has
+    not changed keeps its digest, and is not written again.
+    '''
+    if not tarfile.is_tarfile(thintar):
+        log.warning('Unable to split %s into layers, it is not a tarball', thintar)
+        return []
+    layerdir = os.path.join(os.path.dirname(thintar), 'layers')
+    manifest = os.path.join(layerdir, 'manifest.json')
+    thin_digest = salt.utils.hashutils.get_hash(thintar, form)
+    if os.path.isfile(manifest):
+        try:
+            with salt.utils.files.fopen(manifest, 'r') as fp_:
+                data = salt.utils.json.load(fp_)
+            if data.get('thin') == thin_digest and data.get('form') == form:
+                layers = [(digest, os.path.join(layerdir, '{0}.tgz'.format(digest)))
+                          for digest in data.get('layers', [])]
+                if all(os.path.isfile(path) for _, path in layers):
+                    return layers
+        except (IOError, OSError, ValueError) as exc:
+            log.debug('Unable to read the thin layer manifest: %s', exc)
+    if not os.path.isdir(layerdir):
+        os.makedirs(layerdir)
+
+    log.debug('Splitting %s into layers', thintar)
+    groups = {}
+    with tarfile.open(thintar, 'r:gz') as thin:
+        for member in thin.getmembers():
+            groups.setdefault(_thin_layer_name(member.name), []).append(member)
+        layers = []
+        for name in sorted(groups):
+            fd_, tmp_layer = tempfile.mkstemp(dir=layerdir, suffix='.tmp')
+            os.close(fd_)
+            try:
+                _write_thin_layer(thin, groups[name], tmp_layer)
+                digest = salt.utils.hashutils.get_hash(tmp_layer, form)
+                path = os.path.join(layerdir, '{0}.tgz'.format(digest))
+                if os.path.isfile(path):
+                    os.remove(tmp_layer)
+                else:
+                    shutil.move(tmp_layer, path)
+            except Exception:
+                if os.path.isfile(tmp_layer):
+                    os.remove(tmp_layer)
+                raise
+            log.trace('Thin layer %s: %s', name or '<root>', digest)
+            layers.append((digest, path))
+
+    # Remove the layers of previous thin tarballs
+    current = set(os.path.basename(path) for _, path in layers)
+    for fname in os.listdir(layerdir):
+        if fname.endswith('.tgz') and fname not in current:
+            try:
+                os.remove(os.path.join(layerdir, fname))
+            except OSError as exc:
+                log.debug('Unable to remove old thin layer %s: %s', fname, exc)
+
+    with salt.utils.files.fopen(manifest, 'w') as fp_:
+        salt.utils.json.dump({'thin': thin_digest,
+                              'form': form,
+                              'layers': [digest for digest, _ in layers]},
+                             fp_)
+    return layers
+
+
 def gen_min(cachedir, extra_mods='', overwrite=False, so_mods='',
             python2_bin='python2', python3_bin='python3'):
     '''
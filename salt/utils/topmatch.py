@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+'''
+In-process cache of top file match results
+
+Matching each target in a top file against a minion means running every target
+expression through the matcher subsystem, which for top files with thousands of
+entries is a significant part of compiling a highstate or pillar. The result of
+this matching only depends on the top file data, the minion's ID, grains and
+pillar data, and the configured nodegroups, so it can be cached using a digest
+of these as the key. When any of them changes, the key changes and the matches
+are computed again.
+
+The cache is disabled by default, and is enabled by setting
+``top_match_cache_size`` to the number of results to keep in memory. Matchers
+which depend on external data (such as the ``range`` and ``data`` matchers)
+will not see changes to that data while a result is cached.
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import hashlib
+import logging
+
+# Import Salt libs
+import salt.utils.cache
+import salt.utils.json
+import salt.utils.stringutils
+from salt.utils.odict import OrderedDict
+
+# Import 3rd-party libs
+from salt.ext import six
+
+log = logging.getLogger(__name__)
+
+MATCH_CACHE = salt.utils.cache.LRUCache(0)
+
+
+def _digest(data, sort_keys=False):
+    '''
+    Return a digest of the passed data structure. Dictionary ordering is
+    significant unless sort_keys is True.
+    '''
+    return hashlib.sha1(
+        salt.utils.stringutils.to_bytes(
+            salt.utils.json.dumps(data, sort_keys=sort_keys, default=repr)
+        )
+    ).hexdigest()
+
+
+def cache_key(opts, top, *extra):
+    '''
+    Return the key under which the matches for the passed top data will be
+    cached, or None if caching is disabled or a key could not be generated.
+    Any additional arguments which influence the matches (such as the saltenv
+    being targeted) must be passed as extra positional arguments.
+
+    The key must be generated before matching, as matching may modify the top
+    data.
+    '''
+    maxsize = opts.get('top_match_cache_size', 0)
+    if not maxsize:
+        return None
+    MATCH_CACHE.maxsize = maxsize
+    try:
+        return (
+            opts.get('id'),
+            _digest(top),
+            _digest(opts.get('grains', {}), sort_keys=True),
+            _digest(opts.get('pillar', {}), sort_keys=True),
+            _digest(opts.get('nodegroups', {}), sort_keys=True),
+            _digest(extra, sort_keys=True),
+        )
+    except (TypeError, ValueError) as exc:
+        log.debug('Unable to generate top match cache key: %s', exc)
+        return None
+
+
+def get(key):
+    '''
+    Return a copy of the cached matches for the passed key, or None if there
+    are no cached matches.
+    '''
+    if key is None:
+        return None
+    matches = MATCH_CACHE.get(key)
+    if matches is None:
+        return None
+    log.trace('Using cached top file matches for %s', key[0])
+    return OrderedDict(
+        (saltenv, list(sls)) for saltenv, sls in six.iteritems(matches)
+    )
+
+
+def store(key, matches):
+    '''
+    Cache a copy of the passed matches
+    '''
+    if key is None:
+        return
+    MATCH_CACHE.set(
+        key,
+        OrderedDict(
+            (saltenv, list(sls)) for saltenv, sls in six.iteritems(matches)
+        )
+    )
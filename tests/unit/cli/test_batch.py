@@ -7,7 +7,7 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 # Import Salt Libs
-from salt.cli.batch import Batch
+from salt.cli.batch import Batch, AdaptiveBatchSize
 
 # Import Salt Testing Libs
 from tests.support.unit import skipIf, TestCase
@@ -65,3 +65,51 @@ class BatchTestCase(TestCase):
         '''
         ret = Batch.get_bnum(self.batch)
         self.assertEqual(ret, None)
+
+
+class AdaptiveBatchSizeTestCase(TestCase):
+    '''
+    Unit Tests for the salt.cli.batch.AdaptiveBatchSize class
+    '''
+    def test_increase(self):
+        '''
+        Tests that the batch size grows by about one per batch of successful
+        minions
+        '''
+        adaptive = AdaptiveBatchSize(2, 10)
+        adaptive.update(1, True)
+        self.assertEqual(adaptive.batch_size, 2)
+        for _ in range(2):
+            adaptive.update(1, True)
+        self.assertEqual(adaptive.batch_size, 3)
+
+    def test_maximum(self):
+        '''
+        Tests that the batch size does not grow past the maximum
+        '''
+        adaptive = AdaptiveBatchSize(4, 5)
+        for _ in range(50):
+            adaptive.update(1, True)
+        self.assertEqual(adaptive.batch_size, 5)
+
+    def test_failure(self):
+        '''
+        Tests that failures halve the batch size once per batch of minions
+        '''
+        adaptive = AdaptiveBatchSize(8, 10)
+        self.assertEqual(adaptive.update(1, False), 4)
+        self.assertEqual(adaptive.update(1, False), 4)
+        for _ in range(3):
+            adaptive.update(1, False)
+        self.assertEqual(adaptive.batch_size, 2)
+        for _ in range(10):
+            adaptive.update(1, False)
+        self.assertEqual(adaptive.batch_size, 1)
+
+    def test_slow_down(self):
+        '''
+        Tests that the batch size is halved when the minions slow down
+        '''
+        adaptive = AdaptiveBatchSize(8, 10)
+        adaptive.update(1, True)
+        self.assertEqual(adaptive.update(20, True), 4)
@@ -17,8 +17,11 @@ from tests.support.mock import NO_MOCK, NO_MOCK_REASON, patch, MagicMock
 
 # Import Salt libs
 import salt.config
+import salt.defaults.exitcodes
+import salt.client.ssh.state
 import salt.roster
 import salt.utils.files
+import salt.utils.json
 import salt.utils.path
 import salt.utils.thin
 import salt.utils.yaml
@@ -150,3 +153,154 @@ class SSHSingleTests(TestCase):
                          'PasswordAuthentication=yes -o ConnectTimeout=65 -o Port=22 '
                          '-o IdentityFile=/etc/salt/pki/master/ssh/salt-ssh.rsa '
                          '-o User=root  date +%s')
+
+    def test_cmd_block_deploy(self):
+        '''
+        Test that cmd_block deploys the thin and runs the shim again when the
+        shim requests a deploy, and that only key authenticated targets can
+        run asynchronously
+        '''
+        opts = {
+            'argv': ['test.ping'],
+            '__role': 'master',
+            'cachedir': self.tmp_cachedir,
+            'extension_modules': os.path.join(self.tmp_cachedir, 'extmods'),
+        }
+        target = {
+            'host': 'login1',
+            'user': 'root',
+            'port': '22',
+            'priv': '/etc/salt/pki/master/ssh/salt-ssh.rsa',
+        }
+        single = ssh.Single(
+                opts,
+                opts['argv'],
+                'localhost',
+                mods={},
+                fsclient=None,
+                thin=salt.utils.thin.thin_path(opts['cachedir']),
+                **target)
+        shim_rets = [
+            ('{0}\ndeploy\n'.format(ssh.RSTR), '',
+             salt.defaults.exitcodes.EX_THIN_DEPLOY),
+            ('{0}\n{{"local": true}}'.format(ssh.RSTR), '{0}\n'.format(ssh.RSTR), 0),
+        ]
+        deploy = MagicMock(return_value=True)
+        with patch.object(single, '_cmd_str', MagicMock(return_value='shim')), \
+                patch.object(single, 'shim_cmd', MagicMock(side_effect=shim_rets)), \
+                patch.object(single, 'deploy', deploy):
+            self.assertEqual(single.cmd_block(), ('{"local": true}', '', 0))
+        deploy.assert_called_once_with()
+        self.assertTrue(single.can_run_async())
+        single.target['passwd'] = 'abc123'
+        self.assertFalse(single.can_run_async())
+
+    def test_control_opts(self):
+        '''
+        Test that a persistent master connection is used when
+        ssh_control_persist is set
+        '''
+        opts = {
+            'argv': ['test.ping'],
+            '__role': 'master',
+            'cachedir': self.tmp_cachedir,
+            'extension_modules': os.path.join(self.tmp_cachedir, 'extmods'),
+            'ssh_control_persist': '10m',
+        }
+        single = ssh.Single(
+                opts,
+                opts['argv'],
+                'localhost',
+                host='login1',
+                user='root',
+                port='22',
+                mods={},
+                fsclient=None,
+                thin=salt.utils.thin.thin_path(opts['cachedir']))
+        control_dir = os.path.join(self.tmp_cachedir, 'ssh_control')
+        cmd = single.shell._cmd_str('date +%s')
+        self.assertIn('-o ControlMaster=auto', cmd)
+        self.assertIn('-o ControlPersist=10m', cmd)
+        self.assertIn('-o ControlPath={0}'.format(control_dir), cmd)
+        self.assertTrue(os.path.isdir(control_dir))
+
+
+class SSHStateCacheTests(TestCase):
+    def setUp(self):
+        self.tmp_cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.opts = {
+            'cachedir': self.tmp_cachedir,
+            'hash_type': 'sha256',
+            'ssh_state_cache_ttl': 300,
+            'grains': {'id': 'web1', 'os': 'CentOS'},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_cachedir, ignore_errors=True)
+
+    def test_state_cache_key(self):
+        '''
+        Test that only the configured grains are part of the cache key
+        '''
+        key = salt.client.ssh.state.state_cache_key(self.opts, {}, 'sls', 'web')
+        self.opts['grains']['id'] = 'web2'
+        self.assertNotEqual(
+            salt.client.ssh.state.state_cache_key(self.opts, {}, 'sls', 'web'),
+            key)
+        self.opts['ssh_state_cache_grains'] = ['os']
+        key = salt.client.ssh.state.state_cache_key(self.opts, {}, 'sls', 'web')
+        self.opts['grains']['id'] = 'web3'
+        self.assertEqual(
+            salt.client.ssh.state.state_cache_key(self.opts, {}, 'sls', 'web'),
+            key)
+        self.assertNotEqual(
+            salt.client.ssh.state.state_cache_key(self.opts, {'a': 1}, 'sls', 'web'),
+            key)
+        self.opts['ssh_state_cache_ttl'] = 0
+        self.assertIsNone(
+            salt.client.ssh.state.state_cache_key(self.opts, {}, 'sls', 'web'))
+
+    def test_state_cache(self):
+        '''
+        Test that a cached trans tar is used until a file it was compiled from
+        changes
+        '''
+        file_client = MagicMock()
+        file_client.hash_file.return_value = {'hsum': 'abc', 'hash_type': 'sha256'}
+        chunks = [{'__sls__': 'web', '__env__': 'base'}]
+        key = salt.client.ssh.state.state_cache_key(self.opts, {}, 'sls', 'web')
+        self.assertIsNone(
+            salt.client.ssh.state.state_cache_get(self.opts, key, file_client))
+
+        trans_tar = salt.utils.files.mkstemp()
+        with salt.utils.files.fopen(trans_tar, 'w') as fp_:
+            fp_.write('state')
+        cached = salt.client.ssh.state.state_cache_store(
+            self.opts, key, file_client, chunks, {}, trans_tar)
+        self.assertFalse(os.path.exists(trans_tar))
+        self.assertTrue(os.path.isfile(cached[0]))
+        self.assertEqual(
+            salt.client.ssh.state.state_cache_get(self.opts, key, file_client),
+            cached)
+
+        file_client.hash_file.return_value = {'hsum': 'def', 'hash_type': 'sha256'}
+        self.assertIsNone(
+            salt.client.ssh.state.state_cache_get(self.opts, key, file_client))
+
+    def test_send_roster_grains(self):
+        '''
+        Test that the grains of a target are sent apart from a shared tar
+        '''
+        sent = {}
+
+        def send(local, remote):
+            with salt.utils.files.fopen(local, 'r') as fp_:
+                sent[remote] = salt.utils.json.load(fp_)
+            sent['local'] = local
+
+        shell = MagicMock()
+        shell.send.side_effect = send
+        salt.client.ssh.state.send_roster_grains(
+            shell, self.opts['grains'], '/tmp/.salt/salt_state_grains.json')
+        self.assertEqual(sent['/tmp/.salt/salt_state_grains.json'], self.opts['grains'])
+        self.assertFalse(os.path.exists(sent['local']))
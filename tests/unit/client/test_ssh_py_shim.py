@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+'''
+Tests for the salt-ssh shim's handling of salt-thin layers
+'''
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+
+# Import Salt Testing libs
+from tests.support.runtests import RUNTIME_VARS
+from tests.support.unit import TestCase
+from tests.support.mock import patch
+
+# Import Salt libs
+import salt.utils.files
+import salt.utils.stringutils
+import salt.utils.thin
+from salt.client.ssh import ssh_py_shim as shim
+
+
+class SSHShimLayersTestCase(TestCase):
+    '''
+    Test unpacking the layers of salt-thin on the target
+    '''
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.saltdir = os.path.join(self.tmpdir, 'salt-thin')
+        os.makedirs(self.saltdir)
+        for name, value in (('saltdir', self.saltdir), ('hashfunc', 'sha1')):
+            patcher = patch.object(shim.OPTIONS, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.root_layer = self._layer({'salt-call': 'salt-call'})
+
+    def _layer(self, files):
+        '''
+        Write a layer containing the passed files to the salt thin directory,
+        and return its digest
+        '''
+        path = os.path.join(self.tmpdir, 'layer.tgz')
+        with tarfile.open(path, 'w:gz') as tfp:
+            for name, data in sorted(files.items()):
+                data = salt.utils.stringutils.to_bytes(data)
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tfp.addfile(info, io.BytesIO(data))
+        digest = shim.get_hash(path, 'sha1')
+        shutil.move(path, os.path.join(self.saltdir, shim.LAYER_ARCHIVE.format(digest)))
+        return digest
+
+    def _unpack(self, *digests):
+        with patch.object(shim.OPTIONS, 'layers', list(digests), create=True):
+            shim.unpack_layers()
+
+    def _exists(self, *paths):
+        return os.path.exists(os.path.join(self.saltdir, *paths))
+
+    def test_layer_paths(self):
+        '''
+        Test that the paths owned by a layer are those of the package the
+        master put its files in, or the files themselves for the root layer
+        '''
+        names = [
+            'pyall/salt/utils/files.py',
+            'pyall/salt/__init__.py',
+            'pyall/six.py',
+            'py3/tornado/gen.py',
+            'py2/jinja2/__init__.py',
+            'ns/py2/salt/minion.py',
+            'ns/py3/msgpack/__init__.py',
+            'ns/supported-versions',
+            'salt-call',
+        ]
+        for name in names:
+            self.assertEqual(
+                shim.layer_paths([name]),
+                set([salt.utils.thin._thin_layer_name(name) or name]))
+        self.assertEqual(
+            shim.layer_paths(['pyall/salt/__init__.py', 'pyall/salt/minion.py']),
+            set(['pyall/salt']))
+
+    def test_changed_layer(self):
+        '''
+        Test that the files dropped from a package are removed when its layer
+        is replaced
+        '''
+        old = self._layer({'py3/pkg/__init__.py': '', 'py3/pkg/old.py': 'old'})
+        self._unpack(old, self.root_layer)
+        self.assertTrue(self._exists('py3', 'pkg', 'old.py'))
+
+        new = self._layer({'py3/pkg/__init__.py': '', 'py3/pkg/new.py': 'new'})
+        self._unpack(new, self.root_layer)
+        self.assertFalse(self._exists('py3', 'pkg', 'old.py'))
+        self.assertTrue(self._exists('py3', 'pkg', 'new.py'))
+        self.assertTrue(self._exists('salt-call'))
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.saltdir, '.layers'))),
+            sorted([new, self.root_layer]))
+
+    def test_pruned_layer(self):
+        '''
+        Test that pruning a layer which is no longer deployed only removes the
+        paths it owns
+        '''
+        pkg = self._layer({'py3/pkg/__init__.py': ''})
+        other = self._layer({'py3/other/__init__.py': '', 'py3/single.py': ''})
+        self._unpack(pkg, other, self.root_layer)
+
+        self._unpack(other, self.root_layer)
+        self.assertFalse(self._exists('py3', 'pkg'))
+        self.assertTrue(self._exists('py3', 'other', '__init__.py'))
+        self.assertTrue(self._exists('py3', 'single.py'))
+        self.assertTrue(self._exists('salt-call'))
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.saltdir, '.layers'))),
+            sorted([other, self.root_layer]))
+
+    def test_unsafe_paths(self):
+        '''
+        Test that paths outside of the salt thin directory are never removed,
+        even if a marker lists them
+        '''
+        outside = os.path.join(self.tmpdir, 'outside')
+        with salt.utils.files.fopen(outside, 'w') as fp_:
+            fp_.write('keep')
+        shim.remove_layer_paths([outside, '../outside', 'py3/../../outside'])
+        self.assertTrue(os.path.isfile(outside))
+
+        layer_dir = os.path.join(self.saltdir, '.layers')
+        os.makedirs(layer_dir)
+        with salt.utils.files.fopen(os.path.join(layer_dir, 'stale'), 'w') as fp_:
+            fp_.write('\n'.join([outside, '../outside', '..']))
+        self._unpack(self.root_layer)
+        self.assertTrue(os.path.isfile(outside))
+        self.assertTrue(os.path.isdir(self.saltdir))
+        self.assertFalse(os.path.exists(os.path.join(layer_dir, 'stale')))
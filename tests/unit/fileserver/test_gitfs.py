@@ -6,6 +6,7 @@
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import errno
+import hashlib
 import os
 import shutil
 import tempfile
@@ -29,6 +30,7 @@ from tests.support.helpers import patched_environ
 import salt.fileserver.gitfs as gitfs
 import salt.utils.files
 import salt.utils.platform
+import salt.utils.stringutils
 import salt.utils.win_functions
 import salt.utils.yaml
 import salt.ext.six
@@ -564,3 +566,34 @@ class Pygit2Test(GitFSTestBase, GitFSTestFuncs, TestCase, LoaderModuleMockMixin)
                 '__opts__': opts,
             }
         }
+
+    def test_memory_index(self):
+        '''
+        Test that files are found, served and hashed from the object database
+        without being written to the gitfs cache when gitfs_memory_index is
+        enabled.
+        '''
+        with patch.dict(gitfs.__opts__, {'gitfs_memory_index': True,
+                                         'file_buffer_size': 262144,
+                                         'hash_type': 'sha256'}):
+            gitfs.update()
+            ret = gitfs.file_list(LOAD)
+            self.assertIn('testfile', ret)
+            self.assertIn('/'.join((UNICODE_DIRNAME, 'foo.txt')), ret)
+            self.assertIn('grail', gitfs.dir_list(LOAD))
+
+            fnd = gitfs.find_file('testfile', tgt_env='base')
+            self.assertEqual(fnd['rel'], 'testfile')
+            self.assertIn('blob', fnd)
+            self.assertFalse(os.path.exists(fnd['path']))
+
+            load = {'saltenv': 'base', 'path': 'testfile', 'loc': 0}
+            with salt.utils.files.fopen(
+                    os.path.join(self.tmp_repo_dir, 'testfile'), 'rb') as fp_:
+                contents = fp_.read()
+            served = gitfs.serve_file(load, fnd)
+            self.assertEqual(
+                salt.utils.stringutils.to_bytes(served['data']), contents)
+            self.assertEqual(
+                gitfs.file_hash(load, fnd)['hsum'],
+                hashlib.sha256(contents).hexdigest())
@@ -3,6 +3,7 @@
 # Import Python libs
 from __future__ import absolute_import
 import os
+import fnmatch
 import copy
 import shutil
 import hashlib
@@ -19,6 +20,7 @@ import salt.auth
 import salt.utils.event
 import salt.utils.json
 import salt.utils.yaml
+from salt.exceptions import EauthAuthenticationError
 from salt.ext.six.moves import map, range  # pylint: disable=import-error
 try:
     HAS_TORNADO = True
@@ -656,6 +658,58 @@ class TestSaltRunHandler(SaltnadoTestCase):
             self.assertEqual(valid_response, salt.utils.json.loads(response.body))
 
 
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+@skipIf(not HAS_TORNADO, 'The tornado package needs to be installed')  # pylint: disable=W0223
+class TestStreamSaltAPIHandler(SaltnadoTestCase):
+
+    def get_app(self):
+        urls = [(r'/stream/(.*)', saltnado.StreamSaltAPIHandler)]
+        return self.build_tornado_app(urls)
+
+    def _list_job(self, result=None, exc=None):
+        future = tornado.concurrent.Future()
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+        return patch.object(saltnado.StreamSaltAPIHandler,
+                            '_disbatch_runner',
+                            MagicMock(return_value=future))
+
+    def test_get_permissions(self):
+        '''
+        Test the job cache is read using the runner client and the token of
+        the request
+        '''
+        token = self.token['token']
+        with self._list_job(exc=EauthAuthenticationError('denied')) as runner:
+            response = self.fetch('/stream/20190101000000000000',
+                                  headers={saltnado.AUTH_TOKEN_HEADER: token})
+        self.assertEqual(response.code, 401)
+        chunk = runner.call_args[0][0]
+        self.assertEqual(chunk['fun'], 'jobs.list_job')
+        self.assertEqual(chunk['token'], token)
+
+    def test_get_cached_returns(self):
+        '''
+        Test the returns in the job cache are streamed
+        '''
+        job = {'Minions': ['ms-0'], 'Result': {'ms-0': {'return': True}}}
+        with self._list_job(result=job):
+            response = self.fetch('/stream/20190101000000000000',
+                                  headers={saltnado.AUTH_TOKEN_HEADER: self.token['token'],
+                                           'Accept': 'application/x-ndjson'})
+        records = [salt.utils.json.loads(line) for line in response.body.splitlines()]
+        self.assertEqual(records[0]['minions'], ['ms-0'])
+        self.assertEqual(records[1]['return'], True)
+        self.assertTrue(records[2]['done'])
+
+        with self._list_job(result={'Error': 'Cannot contact returner or no job with this jid'}):
+            response = self.fetch('/stream/20190101000000000000',
+                                  headers={saltnado.AUTH_TOKEN_HEADER: self.token['token']})
+        self.assertEqual(response.code, 404)
+
+
 @skipIf(not HAS_TORNADO, 'The tornado package needs to be installed')  # pylint: disable=W0223
 class TestWebsocketSaltAPIHandler(SaltnadoTestCase):
 
@@ -801,6 +855,38 @@ class TestSaltnadoUtils(AsyncTestCase):
         self.assertIs(futures[0].done(), True)
         self.assertIs(futures[1].done(), False)
 
+    def test_tag_index(self):
+        '''
+        Test that the TagIndex finds the same tags as the matchers
+        '''
+        prefix = saltnado.EventListener.prefix_matcher
+        exact = saltnado.EventListener.exact_matcher
+        index = saltnado.TagIndex()
+        index.add('', prefix)
+        index.add('salt/job/', prefix)
+        index.add('salt/job/1234/ret/', prefix)
+        index.add('salt/job/1234/ret/minion', exact)
+        index.add('salt/job/1234/ret/other', exact)
+        index.add('*/ret/*', fnmatch.fnmatch)
+
+        self.assertEqual(
+            sorted(tag for tag, _ in index.match('salt/job/1234/ret/minion')),
+            ['', '*/ret/*', 'salt/job/', 'salt/job/1234/ret/',
+             'salt/job/1234/ret/minion'])
+        self.assertEqual(
+            sorted(tag for tag, _ in index.match('salt/auth')), [''])
+
+        index.remove('salt/job/', prefix)
+        index.remove('salt/job/1234/ret/minion', exact)
+        index.remove('*/ret/*', fnmatch.fnmatch)
+        self.assertEqual(
+            sorted(tag for tag, _ in index.match('salt/job/1234/ret/minion')),
+            ['', 'salt/job/1234/ret/'])
+
+        index.remove('salt/job/1234/ret/', prefix)
+        index.remove('', prefix)
+        self.assertEqual(index.trie, {})
+
 
 @skipIf(not HAS_TORNADO, 'The tornado package needs to be installed')
 class TestEventListener(AsyncTestCase):
@@ -951,3 +1037,33 @@ class TestEventListener(AsyncTestCase):
 
             self.assertEqual(0, len(event_listener.tag_map))
             self.assertEqual(0, len(event_listener.request_map))
+
+    def test_subscribe(self):
+        '''
+        Test subscribing to events using a queue
+        '''
+        with eventpublisher_process(self.sock_dir):
+            me = salt.utils.event.MasterEvent(self.sock_dir)
+            event_listener = saltnado.EventListener({},  # we don't use mod_opts, don't save?
+                                                    {'sock_dir': self.sock_dir,
+                                                     'transport': 'zeromq'})
+            self._finished = False  # fit to event_listener's behavior
+            queue = event_listener.subscribe(self, tag='evt', maxsize=2)
+            event_future = event_listener.get_event(self, tag='done', callback=self.stop)
+            me.fire_event({'data': 'foo1'}, 'evt1')
+            me.fire_event({'data': 'bar'}, 'other')
+            me.fire_event({'data': 'foo2'}, 'evt2')
+            me.fire_event({'data': 'foo3'}, 'evt3')
+            me.fire_event({}, 'done')
+            self.wait()
+
+            self.assertTrue(event_future.done())
+            self.assertEqual(queue.qsize(), 2)
+            self.assertEqual(queue.get_nowait()['tag'], 'evt1')
+            self.assertEqual(queue.get_nowait()['data']['data'], 'foo2')
+            # the queue was full when the last event arrived
+            self.assertEqual(queue.dropped, ['evt3'])
+
+            event_listener.clean_by_request(self)
+            self.assertEqual(0, len(event_listener.subscriptions))
+            self.assertEqual(0, len(event_listener.subscription_map))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test the caching of roster data.
+"""
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+import os
+import shutil
+import tempfile
+
+# Import Salt Testing Libs
+from tests.support.unit import TestCase
+from tests.support.runtests import RUNTIME_VARS
+
+# Import Salt Libs
+import salt.roster
+import salt.utils.files
+
+
+class RosterCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.cachedir, ignore_errors=True)
+        self.source = salt.utils.files.mkstemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(os.remove, self.source)
+        with salt.utils.files.fopen(self.source, 'w') as fp_:
+            fp_.write('host1: 127.0.0.1\n')
+        self.opts = {'cachedir': self.cachedir, 'roster_cache_ttl': 60}
+
+    def test_cache_disabled(self):
+        opts = {'cachedir': self.cachedir}
+        salt.roster.cache_store(opts, 'key', {'host1': {}})
+        self.assertIsNone(salt.roster.cache_get(opts, 'key'))
+
+    def test_cache_source_changed(self):
+        data = {'host1': {'host': '127.0.0.1'}}
+        salt.roster.cache_store(self.opts, 'key', data, [self.source])
+        self.assertEqual(
+            salt.roster.cache_get(self.opts, 'key', [self.source]), data)
+        with salt.utils.files.fopen(self.source, 'a') as fp_:
+            fp_.write('host2: 127.0.0.2\n')
+        self.assertIsNone(
+            salt.roster.cache_get(self.opts, 'key', [self.source]))
+
+    def test_cache_opts_changed(self):
+        data = {'10.0.0.1': {'host': '10.0.0.1', 'port': 22}}
+        self.opts['ssh_scan_ports'] = '22'
+        salt.roster.cache_store(self.opts, 'key', data)
+        self.assertEqual(salt.roster.cache_get(self.opts, 'key'), data)
+        self.opts['ssh_scan_ports'] = '22,2222'
+        self.assertIsNone(salt.roster.cache_get(self.opts, 'key'))
@@ -208,3 +208,40 @@ class MapConfTest(TestCase):
             # ie, the provider->profile->map inheritance works as expected
             map_data = cloud_map.map_data()
             self.assertEqual(map_data, merged_profile)
+
+
+class ProviderQueryTest(TestCase):
+    '''
+    Validate the querying of cloud providers
+    '''
+
+    def setUp(self):
+        salt.cloud.forget_provider_queries()
+        self.addCleanup(salt.cloud.forget_provider_queries)
+
+    def test_map_providers_parallel_cache(self):
+        '''
+        Ensure that query results are cached until a VM is created or destroyed
+        '''
+        calls = []
+
+        def list_nodes():
+            calls.append(True)
+            return {'vm1': {'id': 'vm1'}}
+
+        clouds = {'dummy.get_configured_provider': lambda: True,
+                  'dummy.list_nodes': list_nodes}
+        opts = {'providers': {'prov': {'dummy': {'driver': 'dummy'}}},
+                'cloud_query_cache_ttl': 60}
+        with patch('salt.loader.clouds', MagicMock(return_value=clouds)), \
+                patch('salt.cloud.CloudClient', MagicMock()):
+            cloud = salt.cloud.Cloud(opts)
+
+        expected = {'prov': {'dummy': {'vm1': {'id': 'vm1'}}}}
+        self.assertEqual(cloud.map_providers_parallel(), expected)
+        self.assertEqual(cloud.map_providers_parallel(), expected)
+        self.assertEqual(len(calls), 1)
+
+        salt.cloud.forget_provider_queries('prov', 'dummy')
+        self.assertEqual(cloud.map_providers_parallel(), expected)
+        self.assertEqual(len(calls), 2)
@@ -268,6 +268,32 @@ class TestBadCryptodomePubKey(TestCase):
         key = salt.crypt.get_rsa_pub_key(self.key_path)
         assert key.can_encrypt()
 
+    def test_pub_key_cache(self):
+        '''
+        Test that parsed public keys are cached until the key file changes
+        '''
+        self.addCleanup(salt.crypt.PUB_KEY_CACHE.clear)
+        key = salt.crypt.get_rsa_pub_key(self.key_path)
+        with patch('salt.utils.files.fopen') as fopen:
+            self.assertIs(salt.crypt.get_rsa_pub_key(self.key_path), key)
+            fopen.assert_not_called()
+        os.utime(self.key_path, (0, 0))
+        self.assertIsNot(salt.crypt.get_rsa_pub_key(self.key_path), key)
+
+    def test_pub_key_cache_replaced(self):
+        '''
+        Test that a key file replaced by one with the same size and
+        modification time is read again
+        '''
+        self.addCleanup(salt.crypt.PUB_KEY_CACHE.clear)
+        os.utime(self.key_path, (0, 0))
+        key = salt.crypt.get_rsa_pub_key(self.key_path)
+        new_path = os.path.join(self.test_dir, 'new.pub')
+        shutil.copyfile(self.key_path, new_path)
+        os.utime(new_path, (0, 0))
+        os.rename(new_path, self.key_path)
+        self.assertIsNot(salt.crypt.get_rsa_pub_key(self.key_path), key)
+
 
 class TestM2CryptoRegression47124(TestCase):
 
@@ -19,12 +19,14 @@ import shutil
 import sys
 import tempfile
 import textwrap
+import threading
+import time
 
 # Import Salt Testing libs
 from tests.support.runtests import RUNTIME_VARS
 from tests.support.case import ModuleCase
 from tests.support.unit import TestCase
-from tests.support.mock import patch
+from tests.support.mock import MagicMock, patch
 
 # Import Salt libs
 import salt.config
@@ -308,6 +310,127 @@ class LazyLoaderGrainsBlacklistTest(TestCase):
         self.assertNotIn('ipv6', grains)
 
 
+class LazyLoaderGrainsParallelTest(TestCase):
+    '''
+    Test running grain functions in parallel
+    '''
+    def test_independent_grain(self):
+        func = lambda: {}  # pylint: disable=unnecessary-lambda
+        with patch.dict(func.__globals__, {'__independent_grains__': ['foo']}):
+            self.assertTrue(salt.loader._is_independent_grain('core.foo', func))
+            self.assertFalse(salt.loader._is_independent_grain('core.bar', func))
+        with patch.dict(func.__globals__, {'__independent_grains__': True}):
+            self.assertTrue(salt.loader._is_independent_grain('core.bar', func))
+
+    def test_parallel_grains(self):
+        funcs = {
+            'core.foo': lambda: {'foo': 'bar'},
+            'core.fail': lambda: 1 / 0,
+        }
+        with patch.dict(funcs['core.foo'].__globals__,
+                        {'__independent_grains__': True}):
+            grain_threads = salt.loader._start_independent_grains(funcs)
+        self.assertEqual(set(grain_threads), set(funcs))
+        deadline = time.time() + 5
+        self.assertEqual(
+            salt.loader._join_grain_thread(
+                'core.foo', grain_threads['core.foo'], deadline),
+            {'foo': 'bar'})
+        self.assertRaises(
+            ZeroDivisionError,
+            salt.loader._join_grain_thread,
+            'core.fail', grain_threads['core.fail'], deadline)
+        self.assertIn('core.foo', salt.loader.GRAINS_PROFILE)
+
+    def test_parallel_grains_timeout(self):
+        event = threading.Event()
+        funcs = {'core.slow': lambda: event.wait(5)}
+        try:
+            with patch.dict(funcs['core.slow'].__globals__,
+                            {'__independent_grains__': True}):
+                grain_threads = salt.loader._start_independent_grains(funcs)
+            self.assertIsNone(
+                salt.loader._join_grain_thread(
+                    'core.slow', grain_threads['core.slow'], time.time()))
+        finally:
+            event.set()
+
+
+class LazyLoaderGrainsTTLTest(TestCase):
+    '''
+    Test reusing the cached results of grain functions
+    '''
+    def setUp(self):
+        self.opts = {'id': 'minion', 'grains_refresh_incremental': True}
+        self.funcs = {
+            'core.static': lambda: {'static': True},
+            'core.event': lambda: {'event': True},
+            'core.interval': lambda: {'interval': True},
+            'core.always': lambda: {'always': True},
+        }
+        self.ttl = {
+            'static': 'static',
+            'event': 'event',
+            'interval': 60,
+        }
+        self.addCleanup(salt.loader.GRAINS_TTL_CACHE.clear)
+
+    def test_grain_func_ttl(self):
+        func = self.funcs['core.static']
+        with patch.dict(func.__globals__, {'__grains_ttl__': self.ttl}):
+            self.assertEqual(
+                salt.loader._grain_func_ttl('core.interval', func), 60)
+            self.assertIsNone(salt.loader._grain_func_ttl('core.always', func))
+        with patch.dict(func.__globals__, {'__grains_ttl__': 'boot'}):
+            self.assertEqual(
+                salt.loader._grain_func_ttl('core.always', func), 'boot')
+
+    def test_load_ttl_cached_grains(self):
+        with patch.dict(self.funcs['core.static'].__globals__,
+                        {'__grains_ttl__': self.ttl}):
+            for key, func in six.iteritems(self.funcs):
+                salt.loader._cache_grain_func(self.opts, key, func, func())
+            self.assertNotIn(
+                ('minion', 'core.always'), salt.loader.GRAINS_TTL_CACHE)
+
+            cached = salt.loader._load_ttl_cached_grains(self.opts, self.funcs)
+            self.assertEqual(
+                sorted(cached), ['core.interval', 'core.static'])
+            cached = salt.loader._load_ttl_cached_grains(
+                self.opts, self.funcs, incremental=True)
+            self.assertEqual(
+                sorted(cached), ['core.event', 'core.interval', 'core.static'])
+
+            # Expire the cached result of the interval function
+            salt.loader.GRAINS_TTL_CACHE[('minion', 'core.interval')]['time'] -= 61
+            cached = salt.loader._load_ttl_cached_grains(
+                self.opts, self.funcs, incremental=True)
+            self.assertEqual(
+                sorted(cached), ['core.event', 'core.static'])
+
+    def test_grains_force_refresh(self):
+        '''
+        Test that a forced refresh runs grain functions with cached results
+        again, so that changes to the grain modules are picked up
+        '''
+        class GrainFuncs(dict):
+            def clear(self):
+                pass
+
+        opts = dict(self.opts, cachedir=RUNTIME_VARS.TMP)
+        funcs = GrainFuncs({'custom.static': lambda: {'version': 1}})
+        with patch.dict(self.funcs['core.static'].__globals__,
+                        {'__grains_ttl__': 'static'}), \
+                patch('salt.loader.grain_funcs', MagicMock(return_value=funcs)):
+            self.assertEqual(salt.loader.grains(opts)['version'], 1)
+            # The module is updated
+            funcs['custom.static'] = lambda: {'version': 2}
+            self.assertEqual(salt.loader.grains(opts)['version'], 1)
+            self.assertEqual(
+                salt.loader.grains(opts, force_refresh=True)['version'], 2)
+            self.assertEqual(salt.loader.grains(opts)['version'], 2)
+
+
 class LazyLoaderSingleItem(TestCase):
     '''
     Test loading a single item via the _load() function
@@ -7,6 +7,8 @@
 from __future__ import absolute_import
 import copy
 import os
+import shutil
+import tempfile
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase, skipIf
@@ -16,6 +18,7 @@ from tests.support.helpers import skip_if_not_root
 # Import salt libs
 import salt.minion
 import salt.utils.event as event
+import salt.utils.files
 from salt.exceptions import SaltSystemExit, SaltMasterUnresolvableError
 import salt.syspaths
 import tornado
@@ -383,6 +386,47 @@ class MinionTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
             self.assertIn('ps', minion.opts['beacons'])
             self.assertEqual(minion.opts['beacons']['ps'], bdata)
 
+    def test_syndic_cmd_summary_uses_master_pki(self):
+        '''
+        Tests that a syndic with syndic_summary_interval set resolves targets
+        against the keys accepted by its local master, not against the pki_dir
+        of its own minion side
+        '''
+        root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root_dir, ignore_errors=True)
+        master_opts = self.get_config('master', from_scratch=True)
+        master_opts.update({
+            'pki_dir': os.path.join(root_dir, 'master', 'pki'),
+            'cachedir': os.path.join(root_dir, 'master', 'cache'),
+            'syndic_dir': os.path.join(root_dir, 'master', 'cache', 'syndics'),
+            'key_cache': '',
+            'order_masters': False,
+        })
+        os.makedirs(os.path.join(master_opts['pki_dir'], 'minions'))
+        for minion_id in ('web1', 'web2'):
+            path = os.path.join(master_opts['pki_dir'], 'minions', minion_id)
+            with salt.utils.files.fopen(path, 'w') as fp_:
+                fp_.write('key')
+
+        syndic = salt.minion.Syndic.__new__(salt.minion.Syndic)
+        syndic.opts = {'syndic_summary_interval': 60,
+                       'timeout': 5,
+                       'pki_dir': os.path.join(root_dir, 'syndic', 'pki')}
+        syndic._ckminions = None
+        syndic.local = MagicMock(opts=master_opts)
+        syndic.io_loop = MagicMock()
+
+        self.assertEqual(syndic.ckminions.summary_minions(), ['web1', 'web2'])
+
+        load = {'tgt_type': 'glob', 'fun': 'test.ping', 'arg': [], 'ret': '',
+                'jid': '20190101000000000000', 'to': 5}
+        syndic.syndic_cmd(dict(load, tgt='web*'))
+        self.assertTrue(syndic.local.pub_async.called)
+
+        syndic.local.pub_async.reset_mock()
+        syndic.syndic_cmd(dict(load, tgt='db*'))
+        self.assertFalse(syndic.local.pub_async.called)
+
 
 @skipIf(NO_MOCK, NO_MOCK_REASON)
 class MinionAsyncTestCase(TestCase, AdaptedConfigurationTestCaseMixin, tornado.testing.AsyncTestCase):
@@ -5,6 +5,7 @@
 
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import copy
 import os
 import shutil
 import tempfile
@@ -23,6 +24,7 @@ from tests.support.runtests import RUNTIME_VARS
 # Import Salt libs
 import salt.exceptions
 import salt.state
+import salt.utils.topmatch
 from salt.utils.odict import OrderedDict
 from salt.utils.decorators import state as statedecorators
 
@@ -166,6 +168,25 @@ class HighStateTestCase(TestCase, AdaptedConfigurationTestCaseMixin):
         matches = self.highstate.top_matches(top)
         self.assertEqual(matches, {'env': ['state1']})
 
+    def test_top_matches_cached(self):
+        top = {'env': {'match': ['state1', 'state2'], 'nomatch': ['state3']}}
+        confirm_top = self.highstate.matchers['confirm_top.confirm_top']
+        confirm_top_mock = MagicMock(side_effect=confirm_top)
+        self.highstate.matchers = {'confirm_top.confirm_top': confirm_top_mock}
+        self.addCleanup(salt.utils.topmatch.MATCH_CACHE.clear)
+        with patch.dict(self.highstate.opts, {'top_match_cache_size': 10}):
+            for _ in range(2):
+                matches = self.highstate.top_matches(copy.deepcopy(top))
+                self.assertEqual(matches, {'env': ['state1', 'state2']})
+            # The second call should have used the cached matches
+            self.assertEqual(confirm_top_mock.call_count, 2)
+
+            # A change to the grains should invalidate the cached matches
+            with patch.dict(self.highstate.opts, {'grains': {'foo': 'bar'}}):
+                matches = self.highstate.top_matches(copy.deepcopy(top))
+            self.assertEqual(matches, {'env': ['state1', 'state2']})
+            self.assertEqual(confirm_top_mock.call_count, 4)
+
     def test_matches_whitelist(self):
         matches = {'env': ['state1', 'state2', 'state3']}
         matches = self.highstate.matches_whitelist(matches, ['state2'])
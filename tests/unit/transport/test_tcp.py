@@ -18,9 +18,11 @@ import salt.utils.platform
 import salt.utils.process
 import salt.transport.server
 import salt.transport.client
+import salt.transport.frame
 import salt.exceptions
 from salt.ext.six.moves import range
-from salt.transport.tcp import SaltMessageClientPool
+from salt.transport.tcp import SaltMessageClientPool, TCPPubServerChannel
+from salt.transport.tcp import PubServer, Subscriber
 
 # Import Salt Testing libs
 from tests.support.unit import TestCase, skipIf
@@ -310,3 +312,79 @@ class SaltMessageClientPoolTest(AsyncTestCase):
 
         with self.assertRaises(tornado.ioloop.TimeoutError):
             test_connect(self)
+
+
+class TCPPubServerChannelTargetsTest(TestCase):
+    def setUp(self):
+        self.opts = {'tcp_pub_cache_targeting': False, 'minion_data_cache': True}
+        self.minions = ['web1', 'web2']
+        with patch('salt.utils.minions.CkMinions') as ckminions:
+            ckminions.return_value.check_minions.side_effect = \
+                lambda *args, **kwargs: {'minions': self.minions, 'missing': []}
+            self.channel = TCPPubServerChannel(self.opts)
+
+    def _targets(self, tgt, tgt_type):
+        return self.channel._publish_targets({'tgt': tgt, 'tgt_type': tgt_type})
+
+    def test_list_targets(self):
+        self.assertEqual(self._targets(['web3'], 'list'), ['web3'])
+        self.assertEqual(self._targets('web1,web2', 'list'), self.minions)
+
+    def test_id_targets(self):
+        self.assertEqual(self._targets('web*', 'glob'), self.minions)
+        self.assertEqual(self._targets(r'web\d', 'pcre'), self.minions)
+        self.assertEqual(
+            self._targets('web* and not L@web3', 'compound'), self.minions)
+        self.minions = []
+        self.assertIsNone(self._targets('db*', 'glob'))
+
+    def test_data_targets(self):
+        self.assertIsNone(self._targets('os:Debian', 'grain'))
+        self.assertIsNone(self._targets('web* and G@os:Debian', 'compound'))
+        self.opts['tcp_pub_cache_targeting'] = True
+        self.assertEqual(self._targets('os:Debian', 'grain'), self.minions)
+        self.assertEqual(
+            self._targets('web* and G@os:Debian', 'compound'), self.minions)
+        self.opts['minion_data_cache'] = False
+        self.assertIsNone(self._targets('os:Debian', 'grain'))
+
+    def test_order_masters(self):
+        self.opts['order_masters'] = True
+        self.assertIsNone(self._targets(['web1'], 'list'))
+        self.assertIsNone(self._targets('web*', 'glob'))
+        self.assertIsNone(self._targets('web* and not L@web3', 'compound'))
+
+
+class PubServerWriteQueueTest(AsyncTestCase):
+    def setUp(self):
+        super(PubServerWriteQueueTest, self).setUp()
+        self.payload = b'x' * 64
+        self.framed_size = len(salt.transport.frame.frame_msg(self.payload))
+        opts = {'tcp_pub_queue_max_bytes': self.framed_size * 2}
+        with patch('salt.master.AESFuncs'):
+            self.pub_server = PubServer(opts, io_loop=self.io_loop)
+
+    def _subscriber(self, done=True):
+        future = tornado.concurrent.Future()
+        if done:
+            future.set_result(None)
+        stream = MagicMock()
+        stream.closed.return_value = False
+        stream.write.return_value = future
+        client = Subscriber(stream, ('127.0.0.1', 4505))
+        self.pub_server.clients.add(client)
+        return client
+
+    @gen_test
+    def test_slow_subscriber(self):
+        fast, slow = self._subscriber(), self._subscriber(done=False)
+        for _ in range(4):
+            yield self.pub_server.publish_payload({'payload': self.payload}, None)
+            yield tornado.gen.moment
+        self.assertEqual(fast.stream.write.call_count, 4)
+        self.assertEqual(fast.write_queue_bytes, 0)
+        self.assertIn(fast, self.pub_server.clients)
+        # The slow subscriber never finished writing the first payload
+        self.assertEqual(slow.stream.write.call_count, 1)
+        self.assertNotIn(slow, self.pub_server.clients)
+        slow.stream.close.assert_called_once_with()
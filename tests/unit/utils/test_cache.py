@@ -54,6 +54,34 @@ class CacheDictTestCase(TestCase):
         self.assertRaises(KeyError, cd.__getitem__, 'foo')
 
 
+class LRUCacheTestCase(TestCase):
+
+    def test_lru(self):
+        '''
+        Make sure that the least recently used item is discarded when the
+        cache is full
+        '''
+        lru = cache.LRUCache(2)
+        lru.set('foo', 1)
+        lru.set('bar', 2)
+        self.assertEqual(lru.get('foo'), 1)
+        lru.set('baz', 3)
+        self.assertEqual(len(lru), 2)
+        self.assertIn('foo', lru)
+        self.assertNotIn('bar', lru)
+        self.assertIsNone(lru.get('bar'))
+        self.assertEqual(lru.pop('baz'), 3)
+        self.assertNotIn('baz', lru)
+
+    def test_disabled(self):
+        '''
+        A maxsize of 0 disables the cache
+        '''
+        lru = cache.LRUCache(0)
+        lru.set('foo', 1)
+        self.assertNotIn('foo', lru)
+
+
 class CacheContextTestCase(TestCase):
 
     def setUp(self):
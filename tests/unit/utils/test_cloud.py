@@ -139,3 +139,18 @@ class CloudUtilsTestCase(TestCase):
 
         # tmp file removed
         self.assertFalse(cloud.check_key_path_and_mode('foo', key_file))
+
+    def test_create_stage_limits(self):
+        limits = cloud.create_stage_limits(
+            {'cloud_stage_limits': {'deploy': 1, 'wait_for_ssh': 0, 'bogus': 3}}
+        )
+        self.assertEqual(list(limits), ['deploy'])
+        self.addCleanup(cloud.init_create_stages, {})
+        cloud.init_create_stages(limits)
+        with cloud.create_stage('deploy'):
+            self.assertFalse(limits['deploy'].acquire(False))
+        self.assertTrue(limits['deploy'].acquire(False))
+        limits['deploy'].release()
+        # Stages without a limit are not limited
+        with cloud.create_stage('wait_for_ssh'):
+            pass
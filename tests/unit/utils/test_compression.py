@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+'''
+Tests for salt.utils.compression
+'''
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase, skipIf
+from tests.support.mock import patch
+
+# Import Salt libs
+import salt.utils.compression
+from salt.exceptions import SaltInvocationError
+
+
+class CompressionTestCase(TestCase):
+    '''
+    TestCase for salt.utils.compression
+    '''
+    data = b'salt' * 1000
+
+    def test_zlib(self):
+        method, compressed = salt.utils.compression.compress(self.data)
+        self.assertEqual(method, 'zlib')
+        self.assertLess(len(compressed), len(self.data))
+        self.assertEqual(
+            salt.utils.compression.decompress(compressed, method), self.data)
+
+    @skipIf(not salt.utils.compression.HAS_LZ4, 'lz4 is not installed')
+    def test_lz4(self):
+        method, compressed = salt.utils.compression.compress(self.data, 'lz4')
+        self.assertEqual(method, 'lz4')
+        self.assertEqual(
+            salt.utils.compression.decompress(compressed, method), self.data)
+
+    def test_lz4_fallback(self):
+        with patch.object(salt.utils.compression, 'HAS_LZ4', False):
+            method, compressed = salt.utils.compression.compress(self.data, 'lz4')
+            self.assertEqual(method, 'zlib')
+            self.assertRaises(
+                SaltInvocationError,
+                salt.utils.compression.decompress, compressed, 'lz4')
+
+    def test_unsupported(self):
+        self.assertRaises(
+            SaltInvocationError,
+            salt.utils.compression.compress, self.data, 'rar')
@@ -13,14 +13,18 @@ import os
 import hashlib
 import time
 import shutil
+import tempfile
+import concurrent.futures
 
 # Import Salt Testing libs
 from tests.support.unit import expectedFailure, skipIf, TestCase
 from tests.support.runtests import RUNTIME_VARS
 from tests.support.events import eventpublisher_process, eventsender_process
+from tests.support.mock import MagicMock, patch
 
 # Import salt libs
 import salt.utils.event
+import salt.utils.platform
 import salt.utils.stringutils
 
 # Import 3rd-+arty libs
@@ -325,3 +329,104 @@ class TestAsyncEventPublisher(AsyncTestCase):
         self.assertEqual(self.tag, 'evt1')
         self.data.pop('_stamp')  # drop the stamp
         self.assertEqual(self.data, {'data': 'foo1'})
+
+
+class TestEventReturn(TestCase):
+    def setUp(self):
+        self.cachedir = tempfile.mkdtemp(dir=RUNTIME_VARS.TMP)
+        self.addCleanup(shutil.rmtree, self.cachedir, ignore_errors=True)
+        self.opts = {
+            'cachedir': self.cachedir,
+            'event_return': ['good', 'bad'],
+            'event_return_queue': 10,
+            'event_return_queue_max_seconds': 5,
+            'event_return_spool': True,
+            'event_return_spool_max_batches': 2,
+        }
+        self.returners = {
+            'good.event_return': MagicMock(),
+            'bad.event_return': MagicMock(side_effect=Exception('down')),
+        }
+        with patch('salt.minion.MasterMinion') as master_minion:
+            master_minion.return_value.returners = self.returners
+            self.event_return = salt.utils.event.EventReturn(self.opts)
+
+    def _queue(self, tag):
+        if not self.event_return.event_queue:
+            self.event_return.event_queue_time = time.time()
+        self.event_return.event_queue.append({'tag': tag, 'data': {}})
+
+    def _spooled(self, event_return):
+        return os.listdir(os.path.join(
+            self.cachedir, 'event_return_spool', event_return))
+
+    def test_flush_due(self):
+        self.assertFalse(self.event_return._flush_due())
+        self._queue('foo')
+        self.assertFalse(self.event_return._flush_due())
+        self.event_return.event_queue_time -= 5
+        self.assertTrue(self.event_return._flush_due())
+
+    def test_spool(self):
+        self._queue('foo')
+        self.event_return.flush_events()
+        self.returners['good.event_return'].assert_called_once_with(
+            [{'tag': 'foo', 'data': {}}])
+        self.assertEqual(len(self._spooled('bad.event_return')), 1)
+        self.assertEqual(self.event_return.event_queue, [])
+
+        # The spool is capped at event_return_spool_max_batches
+        for tag in ('bar', 'baz'):
+            self._queue(tag)
+            self.event_return.flush_events()
+        self.assertEqual(len(self._spooled('bad.event_return')), 2)
+
+        # Once the returner works again, the spooled events are replayed in
+        # order before the new ones
+        self.returners['bad.event_return'].side_effect = None
+        self.returners['bad.event_return'].reset_mock()
+        self._queue('qux')
+        self.event_return.flush_events()
+        self.assertEqual(
+            [call[0][0][0]['tag']
+             for call in self.returners['bad.event_return'].call_args_list],
+            ['bar', 'baz', 'qux'])
+        self.assertEqual(self._spooled('bad.event_return'), [])
+
+    def test_spool_threads(self):
+        '''
+        Test that returners spooling events from several threads at once leave
+        the umask of the process alone, and only create private spool files
+        '''
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        events = [{'tag': 'foo', 'data': {}}]
+        event_returns = ['ret{0}.event_return'.format(idx) for idx in range(8)]
+        executor = concurrent.futures.ThreadPoolExecutor(len(event_returns))
+        self.addCleanup(executor.shutdown)
+        list(executor.map(
+            lambda event_return: self.event_return._spool_events(event_return, events),
+            event_returns))
+        self.assertEqual(os.umask(0o022), 0o022)
+        for event_return in event_returns:
+            spooled = self._spooled(event_return)
+            self.assertEqual(len(spooled), 1)
+            if not salt.utils.platform.is_windows():
+                spool = os.path.join(
+                    self.cachedir, 'event_return_spool', event_return)
+                self.assertEqual(os.stat(spool).st_mode & 0o777, 0o700)
+                self.assertEqual(
+                    os.stat(os.path.join(spool, spooled[0])).st_mode & 0o777,
+                    0o600)
+
+    def test_flush_executor(self):
+        executor = concurrent.futures.ThreadPoolExecutor(2)
+        self.addCleanup(executor.shutdown)
+        self.event_return.executor = executor
+        with patch('concurrent.futures.ThreadPoolExecutor') as pool:
+            for tag in ('foo', 'bar'):
+                self._queue(tag)
+                self.event_return.flush_events()
+        # The executor started by run() is used for every flush
+        self.assertFalse(pool.called)
+        self.assertEqual(self.returners['good.event_return'].call_count, 2)
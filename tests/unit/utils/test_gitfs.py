@@ -90,3 +90,53 @@ class TestGitFSProvider(TestCase):
                                 role_class,
                                 *args,
                                 **kwargs)
+
+
+@skipIf(NO_MOCK, NO_MOCK_REASON)
+class TestGitBaseFetchRemotes(TestCase):
+
+    def _get_gitfs(self, concurrency):
+        opts = dict(OPTS, gitfs_provider='pygit2',
+                    gitfs_fetch_concurrency=concurrency)
+        with patch.object(salt.utils.gitfs.GitFS, 'verify_pygit2',
+                          MagicMock(return_value=True)):
+            return salt.utils.gitfs.GitFS(opts, [], init_remotes=False)
+
+    def _get_remotes(self):
+        remotes = []
+        for idx, fetch in enumerate((MagicMock(return_value=None),
+                                     MagicMock(side_effect=Exception('foo')),
+                                     MagicMock(return_value=True),
+                                     MagicMock(side_effect=Exception('bar')))):
+            repo = MagicMock(id='remote{0}'.format(idx), fetch=fetch)
+            remotes.append(repo)
+        return remotes
+
+    def test_fetch_remotes(self):
+        '''
+        Ensure that remotes are all fetched and that errors are reported in
+        the order in which the remotes are configured, regardless of the
+        fetch concurrency.
+        '''
+        for concurrency in (1, 4):
+            gitfs = self._get_gitfs(concurrency)
+            gitfs.remotes = self._get_remotes()
+            with patch.object(salt.utils.gitfs, 'log') as log_mock:
+                self.assertTrue(gitfs.fetch_remotes())
+            for repo in gitfs.remotes:
+                repo.fetch.assert_called_once_with()
+            self.assertEqual(
+                [x[0][2] for x in log_mock.error.call_args_list],
+                ['remote1', 'remote3'])
+
+    def test_fetch_remotes_filtered(self):
+        '''
+        Ensure that only the requested remotes are fetched
+        '''
+        gitfs = self._get_gitfs(4)
+        gitfs.remotes = self._get_remotes()
+        for repo in gitfs.remotes:
+            repo.name = None
+        self.assertTrue(gitfs.fetch_remotes(remotes=[('remote2', None)]))
+        self.assertEqual(
+            [x.id for x in gitfs.remotes if x.fetch.called], ['remote2'])
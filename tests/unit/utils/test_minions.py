@@ -2,9 +2,15 @@
 
 # Import python libs
 from __future__ import absolute_import, unicode_literals
+import os
+import shutil
 import sys
+import tempfile
+import time
 
 # Import Salt Libs
+import salt.payload
+import salt.utils.files
 import salt.utils.minions
 
 # Import Salt Testing Libs
@@ -368,6 +374,66 @@ class CkMinionsTestCase(TestCase):
         ret = self.ckminions.auth_check(auth_list, 'test.arg', args, 'runner')
         self.assertTrue(ret)
 
+    def test_check_syndic_minions(self):
+        '''
+        Test resolving the minions below syndics using their summaries
+        '''
+        syndic_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, syndic_dir)
+        opts = {'syndic_dir': syndic_dir, 'syndic_summary_interval': 60}
+        ckminions = salt.utils.minions.CkMinions(opts)
+        serial = salt.payload.Serial(opts)
+
+        def write_summary(syndic, minions, age=0):
+            path = os.path.join(syndic_dir, syndic)
+            with salt.utils.files.fopen(path, 'wb') as fp_:
+                serial.dump({'minions': minions, 'time': time.time() - age}, fp_)
+
+        write_summary('syndic1', ['web1', 'web2'])
+        write_summary('syndic2', ['db1'])
+        self.assertEqual(
+            sorted(ckminions.check_syndic_minions('web*')), ['web1', 'web2'])
+        self.assertEqual(ckminions.check_syndic_minions('db.*', 'pcre'), ['db1'])
+        self.assertEqual(
+            ckminions.check_syndic_minions('db1,app1', 'list'), ['db1'])
+        self.assertEqual(ckminions.check_syndic_minions('app*'), [])
+        # Data targets can't be resolved using the minion IDs
+        self.assertIsNone(ckminions.check_syndic_minions('os:Linux', 'grain'))
+
+        # A syndic which has not sent a summary recently
+        write_summary('syndic2', ['db1'], age=600)
+        self.assertIsNone(ckminions.check_syndic_minions('web*'))
+
+        # A registered syndic which has never sent a summary
+        write_summary('syndic2', ['db1'])
+        with salt.utils.files.fopen(os.path.join(syndic_dir, 'syndic3'), 'w') as fp_:
+            fp_.write('')
+        self.assertIsNone(ckminions.check_syndic_minions('web*'))
+
+    def test_summary_minions(self):
+        '''
+        Test the minion IDs sent by a syndic include the minions of syndics
+        below its master
+        '''
+        root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root_dir)
+        opts = {'pki_dir': os.path.join(root_dir, 'pki'),
+                'syndic_dir': os.path.join(root_dir, 'syndics'),
+                'syndic_summary_interval': 60,
+                'key_cache': ''}
+        os.makedirs(os.path.join(opts['pki_dir'], 'minions'))
+        os.makedirs(opts['syndic_dir'])
+        for minion_id in ('web1', 'syndic2'):
+            path = os.path.join(opts['pki_dir'], 'minions', minion_id)
+            with salt.utils.files.fopen(path, 'w') as fp_:
+                fp_.write('key')
+        serial = salt.payload.Serial(opts)
+        with salt.utils.files.fopen(os.path.join(opts['syndic_dir'], 'syndic2'), 'wb') as fp_:
+            serial.dump({'minions': ['db1'], 'time': time.time()}, fp_)
+
+        ckminions = salt.utils.minions.CkMinions(opts)
+        self.assertEqual(ckminions.summary_minions(), ['db1', 'syndic2', 'web1'])
+
 
 @skipIf(sys.version_info < (2, 7), 'Python 2.7 needed for dictionary equality assertions')
 class TargetParseTestCase(TestCase):
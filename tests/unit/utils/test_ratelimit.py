@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+'''
+Tests for salt.utils.ratelimit
+'''
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Salt Testing libs
+from tests.support.unit import TestCase
+from tests.support.mock import patch
+
+# Import Salt libs
+import salt.utils.ratelimit
+
+
+class TokenBucketTestCase(TestCase):
+    '''
+    TestCase for salt.utils.ratelimit.TokenBucket
+    '''
+    def test_consume(self):
+        with patch('time.time', return_value=1000):
+            bucket = salt.utils.ratelimit.TokenBucket(2, 4)
+            for _ in range(4):
+                self.assertEqual(bucket.consume(), 0)
+            self.assertEqual(bucket.consume(), 0.5)
+        with patch('time.time', return_value=1001):
+            # Refilled with two tokens
+            self.assertEqual(bucket.consume(), 0)
+            self.assertEqual(bucket.consume(), 0)
+            self.assertEqual(bucket.consume(), 0.5)
+        with patch('time.time', return_value=1100):
+            # The bucket does not refill past the burst size
+            self.assertEqual(bucket.consume(4), 0)
+            self.assertEqual(bucket.consume(), 0.5)
+
+    def test_consume_reserve(self):
+        with patch('time.time', return_value=1000):
+            bucket = salt.utils.ratelimit.TokenBucket(1, 4)
+            self.assertEqual(bucket.consume(reserve=2), 0)
+            self.assertEqual(bucket.consume(reserve=2), 0)
+            self.assertEqual(bucket.consume(reserve=2), 1)
+            # The reserved tokens can still be used without a reserve
+            self.assertEqual(bucket.consume(), 0)
+            self.assertEqual(bucket.consume(), 0)
+            self.assertEqual(bucket.consume(), 1)
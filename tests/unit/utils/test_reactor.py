@@ -417,6 +417,29 @@ class TestReactor(TestCase, AdaptedConfigurationTestCaseMixin):
                     self.reaction_map[tag]
                 )
 
+    def test_reactor_index(self):
+        '''
+        Ensure that the reactor index returns the same reactors, in the same
+        order, as matching the tag against every glob
+        '''
+        index = reactor.ReactorIndex([
+            {'salt/minion/*/start': '/srv/reactor/start.sls'},
+            {'salt/job/*': ['/srv/reactor/job1.sls', '/srv/reactor/job2.sls']},
+            {'*/start': '/srv/reactor/any_start.sls'},
+            {'salt/minion/web1/start': '/srv/reactor/web1.sls'},
+            {'salt/minion/web[0-9]/*': '/srv/reactor/web.sls'},
+        ])
+        self.assertEqual(
+            index.match('salt/minion/web1/start'),
+            ['/srv/reactor/start.sls', '/srv/reactor/any_start.sls',
+             '/srv/reactor/web1.sls', '/srv/reactor/web.sls']
+        )
+        self.assertEqual(
+            index.match('salt/job/20190101/ret/web1'),
+            ['/srv/reactor/job1.sls', '/srv/reactor/job2.sls']
+        )
+        self.assertEqual(index.match('salt/auth'), [])
+
     def test_reactions(self):
         '''
         Ensure that the correct reactions are built from the configured SLS
@@ -461,6 +484,27 @@ class TestReactor(TestCase, AdaptedConfigurationTestCaseMixin):
                                     )
                                     self.assertEqual(reactions, LOW_CHUNKS[tag])
 
+    def test_skip_event(self):
+        '''
+        Ensure that duplicate events and events over the rate limit of their
+        tag are skipped
+        '''
+        opts = {'reactor_dedup_window': 60,
+                'reactor_rate_limit': {'salt/minion/*/start': {'rate': 0.001,
+                                                               'burst': 2}}}
+        with patch.dict(self.reactor.opts, opts):
+            self.reactor.rate_limits = self.reactor._rate_limits()
+            self.reactor.recent_events.clear()
+            self.assertFalse(self.reactor.skip_event('foo', {'a': 1, '_stamp': 1}))
+            self.assertTrue(self.reactor.skip_event('foo', {'a': 1, '_stamp': 2}))
+            self.assertFalse(self.reactor.skip_event('foo', {'a': 2, '_stamp': 3}))
+            for minion in ('m1', 'm2'):
+                self.assertFalse(self.reactor.skip_event(
+                    'salt/minion/{0}/start'.format(minion), {'id': minion}))
+            self.assertTrue(self.reactor.skip_event(
+                'salt/minion/m3/start', {'id': 'm3'}))
+        self.reactor.rate_limits = self.reactor._rate_limits()
+
 
 @skipIf(NO_MOCK, NO_MOCK_REASON)
 class TestReactWrap(TestCase, AdaptedConfigurationTestCaseMixin):
@@ -484,7 +528,7 @@ class TestReactWrap(TestCase, AdaptedConfigurationTestCaseMixin):
             chunk = LOW_CHUNKS[tag][0]
             thread_pool = Mock()
             thread_pool.fire_async = Mock()
-            with patch.object(self.wrap, 'pool', thread_pool):
+            with patch.dict(self.wrap.pools, {'runner': thread_pool}):
                 self.wrap.run(chunk)
             thread_pool.fire_async.assert_called_with(
                 self.wrap.client_cache['runner'].low,
@@ -500,7 +544,7 @@ class TestReactWrap(TestCase, AdaptedConfigurationTestCaseMixin):
             chunk = LOW_CHUNKS[tag][0]
             thread_pool = Mock()
             thread_pool.fire_async = Mock()
-            with patch.object(self.wrap, 'pool', thread_pool):
+            with patch.dict(self.wrap.pools, {'wheel': thread_pool}):
                 self.wrap.run(chunk)
             thread_pool.fire_async.assert_called_with(
                 self.wrap.client_cache['wheel'].low,
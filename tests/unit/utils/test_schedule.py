@@ -311,6 +311,25 @@ class ScheduleTestCase(TestCase):
         self.schedule.eval()
         self.assertTrue(self.schedule.opts['schedule']['testjob']['_next_fire_time'] > now)
 
+    def test_eval_schedule_deadline(self):
+        '''
+        Tests eval does not look at the schedule again before the next job is
+        due, unless the schedule has changed
+        '''
+        self.schedule.opts.update({'pillar': {'schedule': {}}})
+        self.schedule.opts.update({'schedule': {'testjob': {'function': 'test.true', 'seconds': 60}}})
+        self.schedule.eval()
+        _next_fire_time = self.schedule.opts['schedule']['testjob']['_next_fire_time']
+        self.assertEqual(self.schedule._wakeup, _next_fire_time.replace(microsecond=0))
+
+        with patch.object(self.schedule, '_get_schedule') as get_schedule:
+            self.schedule.eval()
+            self.assertFalse(get_schedule.called)
+
+        self.schedule.opts.update({'schedule': {'testjob': {'function': 'test.true', 'seconds': 30}}})
+        self.schedule.eval()
+        self.assertIn('_next_fire_time', self.schedule.opts['schedule']['testjob'])
+
     def test_eval_schedule_time_eval(self):
         '''
         Tests eval if the schedule setting time is in the future plus splay
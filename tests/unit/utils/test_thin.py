@@ -4,8 +4,12 @@
 '''
 from __future__ import absolute_import, print_function, unicode_literals
 
+import io
 import os
+import shutil
 import sys
+import tarfile
+import tempfile
 from tests.support.unit import TestCase, skipIf
 from tests.support.mock import (
     NO_MOCK,
@@ -393,6 +397,52 @@ class SSHThinTestCase(TestCase):
         assert path == '/path/to/thin/thin.tgz'
         assert form == 'sha256'
 
+    def test_thin_layer_name(self):
+        '''
+        Test that the files of the thin tarball are split into layers by
+        package.
+
+        :return:
+        '''
+        assert thin._thin_layer_name('version') == ''
+        assert thin._thin_layer_name('pyall/salt/utils/files.py') == 'pyall/salt'
+        assert thin._thin_layer_name('py3/tornado/gen.py') == 'py3/tornado'
+        assert thin._thin_layer_name('pyall/six.py') == 'pyall/six.py'
+        assert thin._thin_layer_name('ns/py2/salt/minion.py') == 'ns/py2/salt'
+
+    def test_thin_layers(self):
+        '''
+        Test that only the layers with changed content get a new digest.
+
+        :return:
+        '''
+        tmpdir = tempfile.mkdtemp()
+        try:
+            def _gen(files):
+                thintar = os.path.join(tmpdir, 'thin', 'thin.tgz')
+                if not os.path.isdir(os.path.dirname(thintar)):
+                    os.makedirs(os.path.dirname(thintar))
+                with tarfile.open(thintar, 'w:gz') as tfp:
+                    for name, data in sorted(files.items()):
+                        info = tarfile.TarInfo(name)
+                        info.size = len(data)
+                        tfp.addfile(info, io.BytesIO(data))
+                return thintar
+
+            files = {'version': b'1',
+                     'pyall/salt/__init__.py': b'salt',
+                     'py3/tornado/__init__.py': b'tornado'}
+            layers = thin.thin_layers(_gen(files))
+            assert len(layers) == 3
+            assert thin.thin_layers(_gen(files)) == layers
+
+            files['pyall/salt/__init__.py'] = b'changed'
+            new_layers = thin.thin_layers(_gen(files))
+            assert len(set(new_layers) - set(layers)) == 1
+            assert all(os.path.isfile(path) for _, path in new_layers)
+        finally:
+            shutil.rmtree(tmpdir)
+
     @patch('salt.utils.thin.gen_min', MagicMock(return_value='/path/to/thin/min.tgz'))
     @patch('salt.utils.hashutils.get_hash', MagicMock(return_value=12345))
     def test_min_sum(self):